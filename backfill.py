@@ -0,0 +1,196 @@
+import os
+import json
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import tracing
+from http_client import fetch
+from update_archive import UpdateArchive
+
+# Historical backfill into the update archive. A date range is split into
+# units of work — one HN Algolia query per time window (numericFilters on
+# created_at_i) and one archive walk per feed (`?paged=N`, as WordPress and
+# most blog engines support) — which run in a thread pool. Every request goes
+# through http_client's per-host slots, so adding workers never pushes a source
+# past its limit. Results are written to SQLite in batches from the main thread,
+# and each finished unit is recorded in a checkpoint under data/backfill/, so an
+# interrupted job picks up where it stopped.
+
+BACKFILL_DIR = os.getenv("BRIEF_BACKFILL_DIR", "data/backfill")
+WINDOW_DAYS = 1
+WORKERS = 8
+HN_PAGE_SIZE = 1000
+HN_MAX_RESULTS = 1000   # Algolia returns at most this many hits per query
+MIN_WINDOW = 3600       # seconds; busier windows are still split down to an hour
+MAX_FEED_PAGES = 50
+SOURCES = ("hn", "feeds")
+
+def parse_date(value: str) -> datetime:
+    return datetime.strptime(value, "%Y-%m-%d")
+
+def date_windows(start: str, end: str, days: int = WINDOW_DAYS) -> List[Tuple[str, str]]:
+    """Split the inclusive range [start, end] into (first, last) day windows of `days` days."""
+    windows = []
+    day, last = parse_date(start), parse_date(end)
+    while day <= last:
+        window_end = min(day + timedelta(days=days - 1), last)
+        windows.append((day.strftime("%Y-%m-%d"), window_end.strftime("%Y-%m-%d")))
+        day = window_end + timedelta(days=1)
+    return windows
+
+def _timestamp(day: datetime) -> int:
+    return int(day.timestamp())
+
+# --- Hacker News --------------------------------------------------------------
+
+def _hn_query(since: int, until: int, page: int) -> Dict:
+    from data_collector import HN_QUERY, HN_SEARCH_URL
+    response = fetch(HN_SEARCH_URL, params={
+        "query": HN_QUERY,
+        "tags": "story",
+        "numericFilters": f"created_at_i>={since},created_at_i<{until}",
+        "hitsPerPage": HN_PAGE_SIZE,
+        "page": page
+    }, conditional=False, polite=True)
+    return response.json()
+
+def fetch_hn_window(since: int, until: int) -> List[Dict]:
+    """Every matching HN story created in [since, until), splitting windows Algolia would truncate."""
+    from feed_parsers import hn_hit_to_update
+    data = _hn_query(since, until, 0)
+    if data.get("nbHits", 0) > HN_MAX_RESULTS and until - since > MIN_WINDOW:
+        middle = since + (until - since) // 2
+        return fetch_hn_window(since, middle) + fetch_hn_window(middle, until)
+
+    hits = list(data.get("hits", []))
+    for page in range(1, data.get("nbPages", 1)):
+        hits += _hn_query(since, until, page).get("hits", [])
+    return [hn_hit_to_update(hit) for hit in hits if hit.get("title")]
+
+# --- Feed archives --------------------------------------------------------------
+
+def _page_url(feed_url: str, page: int) -> str:
+    if page == 1:
+        return feed_url
+    return f"{feed_url}{'&' if '?' in feed_url else '?'}paged={page}"
+
+def walk_feed_archive(name: str, feed_url: str, kind: str, start: str, end: str,
+                      max_pages: int = MAX_FEED_PAGES) -> List[Dict]:
+    """Updates dated within [start, end] from a feed and its older pages, newest page first."""
+    from feed_parsers import parse_one
+
+    updates = []
+    previous_links = None
+    for page in range(1, max_pages + 1):
+        try:
+            result = fetch(_page_url(feed_url, page), conditional=False, polite=True)
+        except Exception:
+            if page == 1:
+                raise
+            break  # No archive pages beyond this one (usually a 404)
+        # parse_one hands each body to the parse process pool, so many feed walks use every core.
+        # Paging goes by the page's raw entries: a page without AI posts isn't the end of the archive
+        entries, error = parse_one(("feed_entries", name, feed_url, None, result.content))
+        if not error:
+            records, error = parse_one((kind, name, feed_url, None, result.content))
+        if error:
+            raise RuntimeError(f"page {page}: {error}")
+        links = [entry["link"] for entry in entries]
+        if not entries or links == previous_links:
+            break  # Feed ran out, or the server ignores `paged` and keeps sending page 1
+        previous_links = links
+
+        updates += [update for update in records if start <= update["date"] <= end]
+        if min(entry["date"] for entry in entries) < start:
+            break  # Walked past the start of the range
+    return updates
+
+def feed_sources() -> List[Tuple[str, str, str]]:
+    """(name, url, parser kind) for every feed the collectors read."""
+    from ai_website_scraper import RSS_FEEDS
+    from data_collector import NEWSLETTER_FEEDS
+    sources = [(name, url, "ai_blog") for name, url in RSS_FEEDS]
+    sources += [(name, url, "newsletter") for name, url in NEWSLETTER_FEEDS]
+    return sources
+
+# --- Checkpoints ----------------------------------------------------------------
+
+class Checkpoint:
+    """Which units of a backfill job have finished, persisted after each one."""
+
+    def __init__(self, start: str, end: str, root: Optional[str] = None):
+        self.path = os.path.join(root or BACKFILL_DIR, f"{start}_{end}.json")
+        self.done: Dict[str, int] = {}
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                self.done = json.load(f).get("done", {})
+        except (OSError, ValueError):
+            pass
+        self.start, self.end = start, end
+
+    def mark(self, unit: str, count: int):
+        self.done[unit] = count
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"start": self.start, "end": self.end, "done": self.done,
+                       "updated_at": datetime.now().isoformat(timespec="seconds")}, f, indent=2)
+        os.replace(tmp_path, self.path)
+
+    def reset(self):
+        self.done = {}
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+# --- Job --------------------------------------------------------------------------
+
+def plan_units(start: str, end: str, window_days: int = WINDOW_DAYS, sources: Iterable[str] = SOURCES):
+    """(unit id, callable) pairs for a backfill job."""
+    units = []
+    if "hn" in sources:
+        for first, last in date_windows(start, end, window_days):
+            since = _timestamp(parse_date(first))
+            until = _timestamp(parse_date(last) + timedelta(days=1))
+            units.append((f"hn:{first}:{last}", lambda since=since, until=until: fetch_hn_window(since, until)))
+    if "feeds" in sources:
+        for name, url, kind in feed_sources():
+            units.append((f"feed:{name}", lambda name=name, url=url, kind=kind:
+                          walk_feed_archive(name, url, kind, start, end)))
+    return units
+
+def backfill(start: str, end: str, window_days: int = WINDOW_DAYS, workers: int = WORKERS,
+             sources: Iterable[str] = SOURCES, fresh: bool = False,
+             archive: Optional[UpdateArchive] = None) -> Dict[str, int]:
+    """Backfill the archive for [start, end]; returns counts of units run, skipped and failed and updates written."""
+    if parse_date(start) > parse_date(end):
+        raise ValueError(f"Backfill start {start} is after end {end}")
+    checkpoint = Checkpoint(start, end)
+    if fresh:
+        checkpoint.reset()
+    units = [(unit, job) for unit, job in plan_units(start, end, window_days, sources) if unit not in checkpoint.done]
+    counts = {"units": len(units), "skipped": len(checkpoint.done), "failed": 0, "written": 0}
+    print(f"🗄 Backfill {start} → {end}: {len(units)} units to fetch, {counts['skipped']} already done")
+
+    own_archive = archive is None
+    archive = archive or UpdateArchive()
+    try:
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            futures = {pool.submit(tracing.propagate(job)): unit for unit, job in units}
+            for future in as_completed(futures):
+                unit = futures[future]
+                try:
+                    updates = future.result()
+                except Exception as e:
+                    counts["failed"] += 1
+                    print(f"  ⚠️ {unit} failed ({e}); it will be retried on the next run")
+                    continue
+                # Upserts are keyed by URL, so re-running a unit after a crash adds no duplicates
+                counts["written"] += archive.add_updates(updates)
+                checkpoint.mark(unit, len(updates))
+                print(f"  ✅ {unit}: {len(updates)} updates")
+    finally:
+        if own_archive:
+            archive.close()
+    print(f"🗄 Backfill wrote {counts['written']} updates ({counts['failed']} units failed)")
+    return counts
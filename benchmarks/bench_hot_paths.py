@@ -0,0 +1,229 @@
+#!/usr/bin/env python3
+"""Benchmark the pure-Python hot paths on synthetic corpora, against stored baselines.
+
+    python benchmarks/bench_hot_paths.py                      # 1k, 10k and 100k updates
+    python benchmarks/bench_hot_paths.py --sizes 1000 --only dedupe filter_recent
+    python benchmarks/bench_hot_paths.py --save-baseline      # record this machine's numbers
+    python benchmarks/bench_hot_paths.py --threshold 0.15     # fail on a >15% regression
+
+Each case is timed (best of --repeat, garbage collector off) and then run once
+more under tracemalloc for its peak allocated memory. Results are compared with
+benchmarks/baselines.json: a case whose throughput drops, or whose peak memory
+grows, by more than the threshold is a regression and the script exits 1.
+Baselines are per machine; record them before starting performance work.
+
+Brief cases parse and compile a synthetic brief with one signal per 100
+updates (at least 5), so they scale with the corpus too.
+"""
+import argparse
+import contextlib
+import gc
+import json
+import os
+import platform
+import random
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench_notion_blocks import synthetic_brief  # noqa: E402
+
+BASELINES_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baselines.json")
+DEFAULT_THRESHOLD = 0.25  # timings on a busy laptop easily move 10-20%
+
+TOPICS = ("multi-agent orchestration", "RAG pipeline", "vector database", "LLM evals", "transformer kernels",
+          "Kubernetes operators", "Rust compiler internals", "design systems", "SQLite tuning", "browser engines")
+KINDS = (("newsletter", "Ben's Bites"), ("news", "Hacker News"), ("repo", "GitHub"),
+         ("ai_blog", "OpenAI Blog"), ("ai_research", "arXiv cs.AI"))
+
+def synthetic_updates(count, seed=7):
+    """`count` collected updates: every source type, dates over 60 days, ~10% repeats of earlier items."""
+    rng = random.Random(seed)
+    today = datetime.now()
+    updates = []
+    for i in range(count):
+        if i and rng.random() < 0.1:
+            # A repeat: the same link with tracking parameters, or the same title elsewhere
+            update = dict(updates[rng.randrange(i)])
+            if rng.random() < 0.5:
+                update["link"] += "?utm_source=newsletter&ref=feed"
+            else:
+                update["link"] = f"https://mirror.example.com/{i}"
+            updates.append(update)
+            continue
+        kind, source = KINDS[i % len(KINDS)]
+        topic = rng.choice(TOPICS)
+        text = (f"A practical write-up on {topic}: what changed this week, benchmarks against the "
+                f"previous release and the migration path for teams already in production. ") * rng.randint(1, 4)
+        update = {"source": source, "type": kind, "link": f"https://example.com/{kind}/{i}",
+                  "date": (today - timedelta(days=rng.randint(0, 60))).strftime("%Y-%m-%d")}
+        if kind == "repo":
+            update.update(name=f"example/{topic.split()[0].lower()}-{i}", description=text[:240],
+                          stars=rng.randint(10, 5000))
+            if rng.random() < 0.3:
+                update.update(star_velocity=round(rng.uniform(5, 900), 1), trending_streak=rng.randint(1, 5))
+        else:
+            update.update(title=f"{topic.title()} in practice, part {i}", summary=text[:480])
+            if kind == "news":
+                update["points"] = rng.randint(1, 900)
+        if rng.random() < 0.05:
+            update["content"] = text * 6
+        if rng.random() < 0.01:
+            update["date"] = rng.choice(("", "last week", None))
+        updates.append(update)
+    return updates
+
+# --- cases: name -> setup(updates) returning (function to time, items it processes) ---
+
+def _filter_recent(updates):
+    from data_collector import filter_recent
+    return lambda: filter_recent(updates), len(updates)
+
+def _keyword_filter(updates):
+    from feed_parsers import is_ai_related
+    texts = [f"{u.get('title') or u.get('name')} {u.get('summary') or u.get('description', '')}".lower()
+             for u in updates]
+    return lambda: [text for text in texts if is_ai_related(text)], len(texts)
+
+def _dedupe(updates):
+    from dedupe import dedupe_updates
+    return lambda: dedupe_updates(updates), len(updates)
+
+def _crew_context(updates):
+    from crew_strategy_brief import format_updates_context
+    return lambda: format_updates_context(updates), len(updates)
+
+def _simple_context(updates):
+    from simple_strategy_brief import format_context
+    return lambda: format_context(updates), len(updates)
+
+def _fast_brief(updates):
+    from fast_brief import analyze_updates
+    return lambda: analyze_updates(updates), len(updates)
+
+def _brief_markdown(updates):
+    from brief_renderer import render_markdown
+    signals = max(5, len(updates) // 100)
+    return render_markdown(synthetic_brief(signals)), signals
+
+def _parse_articles(updates):
+    from notion_integration import parse_articles_from_brief
+    markdown, signals = _brief_markdown(updates)
+    return lambda: parse_articles_from_brief(markdown), signals
+
+def _notion_blocks(updates):
+    from notion_integration import create_notion_blocks, format_grouped_content, parse_articles_from_brief
+    markdown, signals = _brief_markdown(updates)
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        content = format_grouped_content(parse_articles_from_brief(markdown))
+    return lambda: create_notion_blocks(content), signals
+
+CASES = {
+    "filter_recent": _filter_recent,
+    "keyword_filter": _keyword_filter,
+    "dedupe": _dedupe,
+    "crew_context": _crew_context,
+    "simple_context": _simple_context,
+    "fast_brief": _fast_brief,
+    "parse_articles": _parse_articles,
+    "notion_blocks": _notion_blocks
+}
+
+def measure(func, repeat):
+    """(best seconds per call, peak bytes allocated during one call)."""
+    best = float("inf")
+    # Several of these functions log per item; keep that cost but not the terminal's
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        gc_was_enabled = gc.isenabled()
+        gc.collect()
+        gc.disable()
+        try:
+            for _ in range(repeat):
+                start = time.perf_counter()
+                func()
+                best = min(best, time.perf_counter() - start)
+        finally:
+            if gc_was_enabled:
+                gc.enable()
+        tracemalloc.start()
+        try:
+            func()
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+    return best, peak
+
+def load_baselines(path=BASELINES_FILE):
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f).get("cases", {})
+    except (OSError, ValueError):
+        return {}
+
+def save_baselines(results, path=BASELINES_FILE):
+    """Merge these results into the baselines file (cases not run keep their old numbers)."""
+    cases = load_baselines(path)
+    cases.update(results)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"recorded": datetime.now().isoformat(timespec="seconds"),
+                   "python": platform.python_version(), "machine": platform.machine(),
+                   "cases": dict(sorted(cases.items()))}, f, indent=2)
+        f.write("\n")
+
+def compare(result, baseline, threshold):
+    """(change summary, regressed?) for one case against its baseline."""
+    if not baseline:
+        return "no baseline", False
+    speed = result["ops_per_sec"] / baseline["ops_per_sec"] - 1
+    memory = result["peak_kib"] / baseline["peak_kib"] - 1 if baseline["peak_kib"] else 0.0
+    regressed = speed < -threshold or memory > threshold
+    return f"{speed:+.0%} speed, {memory:+.0%} memory" + ("  ❌ REGRESSION" if regressed else ""), regressed
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000, 100_000], help="updates per corpus")
+    parser.add_argument("--only", nargs="+", choices=sorted(CASES), default=None, help="run only these cases")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help=f"allowed fractional slowdown or memory growth (default: {DEFAULT_THRESHOLD})")
+    parser.add_argument("--baselines", default=BASELINES_FILE)
+    parser.add_argument("--save-baseline", action="store_true", help="store these results as the new baselines")
+    args = parser.parse_args(argv)
+
+    baselines = load_baselines(args.baselines)
+    results, regressions = {}, []
+    for size in args.sizes:
+        updates = synthetic_updates(size)
+        print(f"\n{size:,} updates")
+        print(f"  {'case':<16} {'ms/call':>10} {'items/s':>14} {'peak KiB':>10}  vs baseline")
+        for name in args.only or CASES:
+            key = f"{name}[{size}]"
+            try:
+                func, items = CASES[name](updates)
+            except ImportError as e:
+                print(f"  {name:<16} skipped ({e})")
+                continue
+            seconds, peak = measure(func, args.repeat)
+            result = {"ms_per_call": round(seconds * 1000, 3), "ops_per_sec": round(items / seconds, 1),
+                      "peak_kib": round(peak / 1024, 1), "items": items}
+            results[key] = result
+            change, regressed = compare(result, baselines.get(key), args.threshold)
+            if regressed:
+                regressions.append(key)
+            print(f"  {name:<16} {result['ms_per_call']:>10.2f} {result['ops_per_sec']:>14,.0f} "
+                  f"{result['peak_kib']:>10,.0f}  {change}")
+
+    if args.save_baseline:
+        save_baselines(results, args.baselines)
+        print(f"\n💾 Saved {len(results)} baselines to {args.baselines}")
+        return 0
+    if regressions:
+        print(f"\n❌ {len(regressions)} regression(s) over {args.threshold:.0%}: {', '.join(regressions)}")
+        return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
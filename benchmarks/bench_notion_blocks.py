@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""Benchmark the Markdown -> Notion block compiler on large synthetic briefs.
+
+    python benchmarks/bench_notion_blocks.py              # 5, 100 and 1000 signals
+    python benchmarks/bench_notion_blocks.py --signals 5000 --repeat 3
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from brief_renderer import brief_to_articles, build_brief_data, render_markdown  # noqa: E402
+from notion_blocks import compile_articles, compile_markdown  # noqa: E402
+
+def synthetic_brief(signals, text_length=400):
+    """A brief with `signals` entries, inline Markdown and long explanations."""
+    filler = ("Agents coordinate through **shared memory**, call `tools` and cite "
+              "[sources](https://example.com/paper) while *streaming* results. ")
+    long_text = (filler * (text_length // len(filler) + 1))[:text_length]
+    updates = [{"title": f"Update {i}", "link": f"https://example.com/{i}", "source": "Synthetic",
+                "type": ("news", "repo", "newsletter")[i % 3]} for i in range(signals)]
+    found = [{"index": i + 1, "title": f"Signal {i} about **agents**", "source": "Synthetic",
+              "why_matters": long_text} for i in range(signals)]
+    scores = [{"index": i + 1, "relevance_score": 10 - i % 10, "tags": "[#agents] [#rag]",
+               "explanation": long_text[::-1]} for i in range(signals)]
+    actions = [{"index": i + 1, "title": f"Build demo {i}", "time_estimate": "1 hour",
+                "expected_outcome": long_text, "description": long_text} for i in range(signals)]
+    brief = build_brief_data(updates[:5], found[:5], scores[:5], actions[:5], date="2026-01-01")
+    # The renderer keeps the top 5; repeat them to get briefs of any size
+    brief["signals"] = [dict(brief["signals"][i % 5], index=i + 1, title=found[i]["title"], link=updates[i]["link"])
+                        for i in range(signals)]
+    return brief
+
+def bench(label, func, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        blocks = func()
+        best = min(best, time.perf_counter() - start)
+    print(f"  {label:<34} {best * 1000:9.2f} ms  {len(blocks):7d} blocks  {len(blocks) / best:12,.0f} blocks/s")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--signals", type=int, nargs="+", default=[5, 100, 1000])
+    parser.add_argument("--text-length", type=int, default=400, help="characters per long text field")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    for signals in args.signals:
+        brief = synthetic_brief(signals, args.text_length)
+        markdown = render_markdown(brief)
+        print(f"\n{signals} signals ({len(markdown) / 1024:.0f} KiB of Markdown)")
+        bench("compile_markdown(rendered brief)", lambda: compile_markdown(markdown), args.repeat)
+        bench("compile_articles(structured brief)", lambda: compile_articles(brief_to_articles(brief)), args.repeat)
+        huge = "**bold** " + "x" * (args.text_length * signals)
+        bench("single 2,000-char-chunked paragraph", lambda: compile_markdown(huge), args.repeat)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,580 @@
+#!/usr/bin/env python3
+"""Command-line entry point for the AI Strategy Brief pipeline.
+
+    python brief_cli.py collect     # fetch sources -> runs/<date>/updates.json
+    python brief_cli.py analyze     # shortlist + agents -> runs/<date>/brief.json
+    python brief_cli.py render      # brief -> strategy_brief.md
+    python brief_cli.py publish     # queue the brief in the publish outbox and deliver it
+    python brief_cli.py outbox      # show / drain / retry the publish outbox
+    python brief_cli.py search Q    # full-text search over every update ever collected
+    python brief_cli.py run         # all of the above, resuming where the last run stopped
+    python brief_cli.py status      # show which stages are done for a date
+    python brief_cli.py preview     # LLM-free brief from the collected updates, in milliseconds
+    python brief_cli.py profiles    # one collection, a brief per reader profile
+    python brief_cli.py publish-all # bulk-publish every stored brief (or given files) concurrently
+    python brief_cli.py daemon      # warm daemon: background collection + scheduled brief
+    python brief_cli.py trace       # critical path and slowest spans of a --trace run
+    python brief_cli.py queue work  # distributed collection worker (see --distributed)
+
+Every stage checkpoints its artifact under runs/<date>/ (see run_store.py), and
+stages that already have one are skipped, so recovering from a failed Notion
+push or a failed agent costs seconds. Use --fresh or --from-stage to redo work.
+
+Every subcommand imports its heavy dependencies (crewai, feedparser, bs4,
+notion-client) only when it runs, so `--help`, `render` and `publish` don't pay
+for loading the agent stack. Pass --timing to see where startup time goes.
+
+With --profile-run every stage (collection fetch/parse, ranking, enrichment,
+each agent task and its LLM calls, rendering, publishing) is timed and a
+wall/CPU table is appended to runs/<date>/report.md; --profile-dump also writes
+cProfile stats and collapsed stacks for flamegraphs to runs/<date>/profile/.
+With --trace every HTTP fetch, agent task, LLM request and Notion request is
+recorded as a nested span in runs/<date>/trace.jsonl (see tracing.py).
+
+With --profile NAME (see data/profiles.json) the shortlist, agent prompts,
+model routing and Notion database follow that reader profile, and its
+checkpoints live under runs/NAME/<date>/.
+"""
+import time
+
+_CLI_START = time.perf_counter()
+
+import argparse
+import copy
+import importlib
+import json
+import os
+import sys
+from datetime import datetime
+
+import profiling  # stdlib only; stages cost nothing unless --profile-run is on
+import tracing    # likewise for spans without --trace
+
+IMPORT_TIMES = {}
+
+# Mirrors run_store.STAGES; kept here so building the parser imports nothing
+STAGE_NAMES = ("updates", "shortlist", "signals", "scores", "actions", "brief", "markdown", "published")
+
+def _timed_import(module_name):
+    """Import a pipeline module on demand, recording how long it took."""
+    start = time.perf_counter()
+    module = importlib.import_module(module_name)
+    IMPORT_TIMES.setdefault(module_name, time.perf_counter() - start)
+    return module
+
+def _process_age():
+    """Seconds since the Python process started (Linux only), or None."""
+    try:
+        with open("/proc/self/stat") as f:
+            start_ticks = int(f.read().rsplit(")", 1)[1].split()[19])
+        with open("/proc/uptime") as f:
+            uptime = float(f.read().split()[0])
+        return uptime - start_ticks / os.sysconf("SC_CLK_TCK")
+    except (OSError, ValueError, IndexError):
+        return None
+
+def _profile(args):
+    if not args.profile:
+        return None
+    return _timed_import("profiles").get_profile(args.profile)
+
+def _runs_root(args):
+    return os.path.join(args.runs_dir, args.profile) if args.profile else args.runs_dir
+
+def _store(args):
+    run_store = _timed_import("run_store")
+    store = run_store.RunStore(args.date, root=_runs_root(args))
+    if args.fresh:
+        store.invalidate_from(run_store.STAGES[0])
+        args.fresh = False  # Only once when `run` chains the steps
+    elif args.from_stage:
+        store.invalidate_from(args.from_stage)
+        args.from_stage = None
+    return store
+
+def _reuse(store, stage):
+    if store.has(stage):
+        print(f"♻️ {stage} already done for {store.run_date} - reusing {store.artifact_path(stage)}")
+        return True
+    return False
+
+def cmd_collect(args):
+    fresh = args.fresh
+    store = _store(args)
+    if _reuse(store, "updates"):
+        return 0
+    data_collector = _timed_import("data_collector")
+    dedupe = _timed_import("dedupe")
+    if args.distributed:
+        updates = data_collector.get_distributed_updates(store.run_date, args.local_workers, fresh=fresh)
+    else:
+        updates = data_collector.get_real_ai_updates()
+    updates = dedupe.dedupe_updates(updates)
+    store.save("updates", updates)
+    _update_trends(updates)
+    print(f"💾 Saved {len(updates)} updates to {store.artifact_path('updates')}")
+    return 0
+
+def _update_trends(updates):
+    """Feed collected updates to the trend engine (best-effort, never fails a run)."""
+    try:
+        with profiling.stage("trends"), tracing.span("trends", updates=len(updates)):
+            _timed_import("trends").update_trends(updates)
+    except Exception as e:
+        print(f"⚠️ Could not update trends: {e}")
+
+def cmd_analyze(args):
+    store = _store(args)
+    if _reuse(store, "brief"):
+        return 0
+    if not store.has("updates"):
+        print(f"❌ No collected updates for {store.run_date} - run `collect` first")
+        return 1
+
+    profile = _profile(args)
+    if not _reuse(store, "shortlist"):
+        updates = store.load("updates")
+        with profiling.stage("rank"), tracing.span("rank", updates=len(updates)):
+            if profile:
+                shortlist = _timed_import("profiles").rank_for_profile(updates, profile, args.limit)
+            else:
+                shortlist = updates[:args.limit]
+        if not args.no_enrich:
+            with profiling.stage("enrich"), tracing.span("enrich", updates=len(shortlist)):
+                shortlist = _timed_import("enrichment").enrich_updates(shortlist)
+        store.save("shortlist", shortlist)
+    shortlist = store.load("shortlist")
+    print(f"Using top {len(shortlist)} updates for analysis")
+
+    crew_module = _timed_import("crew_strategy_brief")
+    llm_routing = _timed_import("llm_routing")
+    try:
+        brief = crew_module.analyze_updates(shortlist, store=store, profile=profile)
+    except Exception as e:
+        print(f"\n❌ Error during crew execution: {e}")
+        print("Check your OpenRouter API key and internet connection; rerun to resume from the failed agent")
+        crew_module.write_fallback_brief(shortlist, profile=profile, date=store.run_date)
+        return 1
+    finally:
+        llm_routing.usage_tracker.print_summary()
+        llm_routing.usage_tracker.save()
+
+    if args.rising_topics > 0:
+        try:
+            brief["rising_topics"] = _timed_import("trends").load_engine().rising(limit=args.rising_topics)
+        except Exception as e:
+            print(f"⚠️ Could not compute rising topics: {e}")
+
+    store.save("brief", brief)
+    print(f"💾 Saved structured brief to {store.artifact_path('brief')}")
+    return 0
+
+def cmd_preview(args):
+    """A brief from the collected updates with no LLM calls (see fast_brief.py), in milliseconds."""
+    store = _store(args)
+    if not store.has("updates"):
+        status = _run_step(cmd_collect, args)
+        if status:
+            return status
+    updates = store.load("updates")
+    fast_brief = _timed_import("fast_brief")
+    brief_renderer = _timed_import("brief_renderer")
+    start = time.perf_counter()
+    with profiling.stage("fast_brief"), tracing.span("fast_brief", updates=len(updates)):
+        brief = fast_brief.analyze_updates(updates, date=store.run_date, profile=_profile(args))
+    elapsed = (time.perf_counter() - start) * 1000
+    brief["note"] = "Preview scored locally without LLMs; the daily brief may pick different signals."
+    brief_renderer.save_brief(brief, args.output, os.path.splitext(args.output)[0] + ".json")
+    print(f"⚡ Preview of {len(updates)} updates scored in {elapsed:.1f} ms, saved to {args.output}")
+    return 0
+
+def cmd_render(args):
+    store = _store(args)
+    if not store.has("brief"):
+        print(f"❌ No structured brief for {store.run_date} - run `analyze` first")
+        return 1
+    brief_renderer = _timed_import("brief_renderer")
+    brief = store.load("brief")
+    markdown = store.load("markdown") if store.has("markdown") else brief_renderer.render_markdown(brief)
+    store.save("markdown", markdown)
+    with open(args.markdown, "w", encoding="utf-8") as f:
+        f.write(markdown)
+    print(f"✅ Strategy brief saved to {args.markdown}")
+    return 0
+
+def cmd_publish(args):
+    """Queue the brief in the publish outbox, then deliver it now unless --queue-only."""
+    store = _store(args)
+    if _reuse(store, "published"):
+        return 0
+    brief = store.load("brief")
+    database_id = _timed_import("profiles").notion_database_id(_profile(args)) if args.profile else None
+    if brief is None:
+        print(f"⚠️ No structured brief for {store.run_date} - publishing from strategy_brief.md")
+        notion_integration = _timed_import("notion_integration")
+        if not notion_integration.push_to_notion(None, database_id=database_id, upsert=not args.new_page):
+            return 1
+        store.save("published", {"published_at": datetime.now().isoformat(timespec="seconds")})
+        return 0
+
+    publish_outbox = _timed_import("publish_outbox")
+    outbox = publish_outbox.Outbox()
+    key = f"{args.profile or 'default'}:{store.run_date}"
+    outbox.enqueue(key, {"brief": brief, "database_id": database_id, "upsert": not args.new_page,
+                         "receipt": {"root": _runs_root(args), "date": store.run_date}})
+    if args.queue_only:
+        print(f"📮 Queued {key} in the publish outbox ({outbox.path})")
+        return 0
+    publish_outbox.drain(outbox, key=key)  # Other queued briefs are left to the daemon or `outbox drain`
+    if outbox.status(key) == "done":
+        return 0
+    print(f"📮 {key} is kept in the publish outbox and will be retried by the daemon or `brief_cli.py outbox drain`")
+    return 1
+
+def cmd_outbox(args):
+    publish_outbox = _timed_import("publish_outbox")
+    outbox = publish_outbox.Outbox()
+    if args.action == "drain":
+        counts = publish_outbox.drain(outbox)
+        print(f"📬 Outbox drained: {counts['published']} published, {counts['retrying']} retrying, {counts['dead']} dead")
+    elif args.action == "retry":
+        print(f"🔁 Requeued {outbox.retry_dead()} dead-lettered briefs")
+    print(f"📮 Outbox {outbox.path}: " + (", ".join(f"{n} {status}" for status, n in outbox.stats().items()) or "empty"))
+    for item in outbox.items():
+        if item["status"] != "done":
+            error = f" - {item['last_error']}" if item["last_error"] else ""
+            print(f"   • {item['key']}: {item['status']}, {item['attempts']} attempts{error}")
+    return 0
+
+def cmd_queue(args):
+    collection_queue = _timed_import("collection_queue")
+    queue = collection_queue.CollectionQueue()
+    round_id = args.date or datetime.now().strftime("%Y-%m-%d")
+    if args.action == "import":
+        for path in args.files:
+            sources = collection_queue.load_opml(path, kind=args.kind)
+            print(f"📥 {path}: {len(sources)} feeds, {queue.add_to_catalog(sources)} new")
+        print(f"📚 Catalog: {len(queue.catalog())} extra sources, queued with every --distributed collection")
+        return 0
+    if args.action == "work":
+        totals = collection_queue.run_worker(args.date, batch=args.batch, exit_when_idle=args.exit_when_idle)
+        return 1 if totals["failed"] else 0
+    stats = queue.stats(round_id)
+    print(f"📬 Round {round_id} in {queue.path}: " + (", ".join(f"{n} {status}" for status, n in stats.items()) or "nothing queued"))
+    for worker, n in sorted(queue.worker_counts(round_id).items()):
+        print(f"   👷 {worker}: {n} sources")
+    for failure in queue.failures(round_id):
+        print(f"   ❌ {failure['name']}: {failure['last_error']}")
+    return 0
+
+def cmd_publish_all(args):
+    """Publish many briefs concurrently: the given files, or every run that has a brief."""
+    run_store = _timed_import("run_store")
+    notion_integration = _timed_import("notion_integration")
+    profiles = _timed_import("profiles") if args.profile else None
+    database_id = profiles.notion_database_id(_profile(args)) if profiles else None
+
+    stores = {}
+    if args.files:
+        sources = args.files
+    else:
+        for run_date in run_store.list_run_dates(_runs_root(args)):
+            store = run_store.RunStore(run_date, root=_runs_root(args))
+            if store.has("brief") and (args.fresh or not store.has("published")):
+                stores[run_date] = store
+        sources = [store.load("brief") for store in stores.values()]
+    if not sources:
+        print("Nothing to publish")
+        return 0
+
+    print(f"📤 Publishing {len(sources)} briefs")
+    results = notion_integration.publish_briefs(sources, database_id=database_id,
+                                                upsert=not args.new_page, concurrency=args.concurrency)
+    for run_date, store in stores.items():
+        if results.get(run_date):
+            store.save("published", {"published_at": datetime.now().isoformat(timespec="seconds"),
+                                     "url": results[run_date]})
+    return 0 if results and all(results.values()) else 1
+
+def _run_step(step, args):
+    """Run one command, timed as a stage when profiling and as a span when tracing."""
+    name = step.__name__[len("cmd_"):]
+    with profiling.stage(name), tracing.span(name, profile=args.profile):
+        return step(args)
+
+def cmd_run(args):
+    for step in (cmd_collect, cmd_analyze, cmd_render, cmd_publish):
+        status = _run_step(step, args)
+        if status:
+            return status
+    return 0
+
+def _run_profile(args, name, updates):
+    """Analyze, render and publish one profile's brief from the shared collection."""
+    profile_args = copy.copy(args)
+    profile_args.profile = name
+    profile_args.markdown = f"strategy_brief_{name}.md"
+    store = _store(profile_args)
+    if not store.has("updates"):
+        store.save("updates", updates)
+    for step in (cmd_analyze, cmd_render, cmd_publish):
+        status = _run_step(step, profile_args)
+        if status:
+            return status
+    return 0
+
+def cmd_profiles(args):
+    """Collect once, then build every profile's brief concurrently.
+    
+    Profiles share the collection pass and the LLM response cache, so work that
+    is identical across profiles (same prompt on the same route) runs only once.
+    """
+    from concurrent.futures import ThreadPoolExecutor
+    profiles = _timed_import("profiles")
+    llm_cache = _timed_import("llm_cache")
+    names = args.names or list(profiles.load_profiles())
+    if not names:
+        print(f"❌ No profiles configured in {profiles.PROFILES_FILE}")
+        return 1
+
+    shared_args = copy.copy(args)
+    shared_args.profile = None
+    status = _run_step(cmd_collect, shared_args)
+    if status:
+        return status
+    updates = _store(shared_args).load("updates")
+
+    with ThreadPoolExecutor(max_workers=len(names)) as executor:
+        run_profile = tracing.propagate(lambda name: _run_profile(args, name, updates))
+        results = dict(zip(names, executor.map(run_profile, names)))
+
+    print("\n📚 Profile briefs:")
+    for name, status in results.items():
+        print(f"   {'✅' if status == 0 else '❌'} {name} -> strategy_brief_{name}.md")
+    print(f"🧠 LLM cache: {llm_cache.hits} hits, {llm_cache.misses} misses")
+    return 0 if all(status == 0 for status in results.values()) else 1
+
+def cmd_search(args):
+    update_archive = _timed_import("update_archive")
+    archive = update_archive.UpdateArchive()
+    start = time.perf_counter()
+    results = archive.search(" ".join(args.query) or None, source=args.source, since=args.since,
+                             until=args.until, limit=args.max_results)
+    elapsed = (time.perf_counter() - start) * 1000
+    if args.json:
+        print(json.dumps(results, indent=2, ensure_ascii=False))
+    else:
+        for update in results:
+            print(f"{update.get('date') or '----------'}  {update.get('source', ''):<18} {update['title']}")
+            if update.get("link"):
+                print(f"{'':12}{update['link']}")
+        print(f"🔎 {len(results)} of {archive.count()} archived updates in {elapsed:.1f} ms")
+    archive.close()
+    return 0
+
+def cmd_backfill(args):
+    backfill = _timed_import("backfill")
+    counts = backfill.backfill(args.start, args.end or datetime.now().strftime("%Y-%m-%d"),
+                               window_days=args.window_days, workers=args.workers,
+                               sources=args.sources, fresh=args.fresh)
+    return 1 if counts["failed"] else 0
+
+def cmd_status(args):
+    run_store = _timed_import("run_store")
+    store = run_store.RunStore(args.date, root=_runs_root(args))
+    print(f"📂 Run {store.run_date} ({store.path})")
+    for stage in run_store.STAGES:
+        print(f"   {'✅' if store.has(stage) else '⬜'} {stage}")
+    next_stage = store.next_stage()
+    print(f"➡️ Next stage: {next_stage}" if next_stage else "🎉 All stages complete")
+    return 0
+
+def _trace_path(args):
+    return args.file or os.path.join(_runs_root(args), args.date or datetime.now().strftime("%Y-%m-%d"), "trace.jsonl")
+
+def cmd_trace(args):
+    path = _trace_path(args)
+    if not os.path.exists(path):
+        print(f"❌ No trace at {path} - run a command with --trace first")
+        return 1
+    grouped = tracing.traces(tracing.load(path))
+    if not grouped:
+        print(f"❌ No spans recorded in {path} - the traced run may have stopped before any span finished")
+        return 1
+    trace_id = args.trace_id or list(grouped)[-1]
+    spans = next((spans for key, spans in grouped.items() if key.startswith(trace_id)), None)
+    if not spans:
+        print(f"❌ No trace {trace_id} in {path}")
+        return 1
+
+    path_spans = tracing.critical_path(spans)
+    root = path_spans[0][1]
+    errors = sum(s["status"] == "error" for s in spans)
+    print(f"🧵 Trace {root['trace_id'][:12]} ({root['name']}): {root['duration_ms'] / 1000:.2f} s, "
+          f"{len(spans)} spans, {errors} errors ({len(grouped)} traces in {path})")
+    print("\nCritical path:")
+    for depth, s in path_spans:
+        attributes = ", ".join(f"{key}={value}" for key, value in s["attributes"].items())
+        print(f"  {s['duration_ms'] / 1000:8.2f} s  {'  ' * depth}{s['name']}" + (f"  [{attributes}]" if attributes else ""))
+    print("\nBy span name (total time, slowest first):")
+    for name, t in list(tracing.summarize(spans).items())[:args.top]:
+        print(f"  {name:<20} {t['count']:>5}x  total {t['total_ms'] / 1000:8.2f} s  "
+              f"max {t['max_ms'] / 1000:7.2f} s" + (f"  {t['errors']} errors" if t["errors"] else ""))
+    return 0
+
+def cmd_daemon(args):
+    scheduler_daemon = _timed_import("scheduler_daemon")
+    return scheduler_daemon.serve(port=args.port, collect_every=args.collect_every * 60,
+                                  brief_time=args.brief_time, runs_dir=args.runs_dir, limit=args.limit)
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog="brief_cli.py",
+        description="Generate the daily AI strategy brief in separate, resumable steps."
+    )
+    parser.add_argument("--timing", action="store_true",
+                        help="print startup and per-module import times")
+    parser.add_argument("--date", default=None,
+                        help="run date YYYY-MM-DD that keys the checkpoints (default: today)")
+    parser.add_argument("--runs-dir", default="runs",
+                        help="where stage artifacts are stored (default: runs)")
+    parser.add_argument("--fresh", action="store_true",
+                        help="ignore existing checkpoints and redo every stage")
+    parser.add_argument("--from-stage", choices=STAGE_NAMES, default=None,
+                        help="redo this stage and everything after it")
+    parser.add_argument("--markdown", default="strategy_brief.md",
+                        help="rendered Markdown brief (default: strategy_brief.md)")
+    parser.add_argument("--limit", type=int, default=15,
+                        help="number of updates given to the agents (default: 15)")
+    parser.add_argument("--queue-only", action="store_true",
+                        help="only queue the brief in the publish outbox; a worker delivers it later")
+    parser.add_argument("--new-page", action="store_true",
+                        help="always add a new Notion page instead of updating the day's existing one")
+    parser.add_argument("--no-enrich", action="store_true",
+                        help="don't fetch the shortlisted links' article text / READMEs for the agents")
+    parser.add_argument("--distributed", action="store_true",
+                        help="collect through the shared work queue; `queue work` processes on any host do the fetching")
+    parser.add_argument("--local-workers", type=int, default=0,
+                        help="with --distributed, also start this many worker processes here (default: 0)")
+    parser.add_argument("--rising-topics", type=int, default=5,
+                        help="rising topics listed in the brief, 0 to leave them out (default: 5)")
+    parser.add_argument("--profile-run", action="store_true",
+                        help="time every stage (wall/CPU) and append a timing table to runs/<date>/report.md")
+    parser.add_argument("--profile-dump", action="store_true",
+                        help="with --profile-run, also write cProfile stats and collapsed stacks to runs/<date>/profile/")
+    parser.add_argument("--trace", action="store_true",
+                        help="record nested spans (fetches, agent tasks, LLM and Notion requests) to runs/<date>/trace.jsonl")
+    parser.add_argument("--trace-format", choices=("json", "otlp"), default="json",
+                        help="span format for --trace: flat JSON lines or OTLP/JSON export lines (default: json)")
+    parser.add_argument("--profile", default=None,
+                        help="reader profile from data/profiles.json (default: the original builder brief)")
+
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    subparsers.add_parser("collect", help="fetch updates from all sources").set_defaults(func=cmd_collect)
+    subparsers.add_parser("analyze", help="run the agents over collected updates").set_defaults(func=cmd_analyze)
+    subparsers.add_parser("render", help="render the structured brief to Markdown").set_defaults(func=cmd_render)
+    subparsers.add_parser("publish", help="queue the brief for Notion and deliver it").set_defaults(func=cmd_publish)
+    subparsers.add_parser("run", help="collect, analyze, render and publish").set_defaults(func=cmd_run)
+    subparsers.add_parser("status", help="show completed stages for a run").set_defaults(func=cmd_status)
+
+    preview = subparsers.add_parser("preview", help="brief without LLM calls, scored locally in milliseconds")
+    preview.add_argument("--output", default="strategy_brief_preview.md",
+                         help="Markdown path; the structured brief goes next to it as .json "
+                              "(default: strategy_brief_preview.md)")
+    preview.set_defaults(func=cmd_preview)
+
+    search = subparsers.add_parser("search", help="search the archive of every collected update")
+    search.add_argument("query", nargs="*", help="words that must all match; `word*` matches a prefix")
+    search.add_argument("--source", default=None, help="only this source, e.g. 'Hacker News'")
+    search.add_argument("--since", default=None, help="earliest update date YYYY-MM-DD")
+    search.add_argument("--until", default=None, help="latest update date YYYY-MM-DD")
+    search.add_argument("-n", "--max-results", type=int, default=20, help="results to show (default: 20)")
+    search.add_argument("--json", action="store_true", help="print results as JSON")
+    search.set_defaults(func=cmd_search)
+
+    backfill = subparsers.add_parser("backfill", help="archive historical updates for a date range (resumable)")
+    backfill.add_argument("start", help="first date YYYY-MM-DD")
+    backfill.add_argument("end", nargs="?", default=None, help="last date YYYY-MM-DD (default: today)")
+    backfill.add_argument("--window-days", type=int, default=1, help="days per Hacker News query window (default: 1)")
+    backfill.add_argument("--workers", type=int, default=8,
+                          help="fetches in flight; each host still keeps its own limit (default: 8)")
+    backfill.add_argument("--sources", nargs="+", choices=("hn", "feeds"), default=["hn", "feeds"],
+                          help="what to backfill (default: hn feeds)")
+    backfill.set_defaults(func=cmd_backfill)
+
+    outbox = subparsers.add_parser("outbox", help="inspect or drain the durable publish outbox")
+    outbox.add_argument("action", nargs="?", choices=("status", "drain", "retry"), default="status",
+                        help="status (default), drain due briefs now, or retry dead-lettered ones")
+    outbox.set_defaults(func=cmd_outbox)
+
+    queue = subparsers.add_parser("queue", help="distributed collection: import OPML feeds, run a worker, show a round")
+    queue.add_argument("action", nargs="?", choices=("status", "work", "import"), default="status",
+                       help="status (default) of the --date round, work on it, or import OPML files into the source catalog")
+    queue.add_argument("files", nargs="*", help="OPML files for `import`")
+    queue.add_argument("--kind", choices=("ai_blog", "ai_research", "newsletter"), default="ai_blog",
+                       help="parser for imported feeds (default: ai_blog, which keeps AI-related posts)")
+    queue.add_argument("--batch", type=int, default=8, help="sources a worker leases at a time (default: 8)")
+    queue.add_argument("--exit-when-idle", action="store_true",
+                       help="stop once the round has nothing left instead of waiting for more work")
+    queue.set_defaults(func=cmd_queue)
+
+    publish_all = subparsers.add_parser("publish-all", help="publish many briefs to Notion concurrently")
+    publish_all.add_argument("files", nargs="*",
+                             help="brief Markdown/JSON files (default: every stored run not yet published)")
+    publish_all.add_argument("--concurrency", type=int, default=4,
+                             help="briefs in flight at once; requests still share the Notion rate limit (default: 4)")
+    publish_all.set_defaults(func=cmd_publish_all)
+
+    profiles = subparsers.add_parser("profiles", help="collect once and build a brief for every profile")
+    profiles.add_argument("--names", nargs="+", default=None, help="only these profiles (default: all)")
+    profiles.set_defaults(func=cmd_profiles)
+
+    trace = subparsers.add_parser("trace", help="critical path and slowest spans of a --trace run")
+    trace.add_argument("file", nargs="?", default=None, help="trace file (default: runs/<date>/trace.jsonl)")
+    trace.add_argument("--trace-id", default=None, help="trace id or prefix (default: the latest trace in the file)")
+    trace.add_argument("--top", type=int, default=15, help="span names listed (default: 15)")
+    trace.set_defaults(func=cmd_trace)
+
+    daemon = subparsers.add_parser("daemon", help="run as a warm, scheduled daemon with a local control endpoint")
+    daemon.add_argument("--port", type=int, default=8765, help="control/health port on 127.0.0.1 (default: 8765)")
+    daemon.add_argument("--collect-every", type=int, default=30, help="minutes between background collections (default: 30)")
+    daemon.add_argument("--brief-time", default="07:00", help="daily time the brief is due, HH:MM (default: 07:00)")
+    daemon.set_defaults(func=cmd_daemon)
+    return parser
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+
+    if args.timing:
+        process_age = _process_age()
+        interpreter = f", process age {process_age * 1000:.0f} ms" if process_age is not None else ""
+        print(f"⏱️ CLI ready in {(time.perf_counter() - _CLI_START) * 1000:.1f} ms{interpreter}")
+
+    if args.fresh or args.from_stage:
+        # Redoing stages must not replay the cached LLM answers they are meant to replace
+        _timed_import("llm_cache").refresh()
+    profiler = profiling.Profiler(dump=args.profile_dump).start() if args.profile_run or args.profile_dump else None
+    # Fixed before the command runs: `run` may be resumed for the day with --date unset
+    run_dir = os.path.join(_runs_root(args), args.date or datetime.now().strftime("%Y-%m-%d"))
+    tracer = tracing.Tracer(os.path.join(run_dir, "trace.jsonl"), args.trace_format).start() if args.trace else None
+    command_start = time.perf_counter()
+    try:
+        with tracing.span("cli", command=args.command, date=args.date, profile=args.profile):
+            status = args.func(args) if args.func in (cmd_run, cmd_profiles) else _run_step(args.func, args)
+    finally:
+        if profiler is not None:
+            profiler.stop()
+            print(f"\n⏱️ Stage timings\n{profiler.table()}")
+            print(f"⏱️ Timing table appended to {profiler.write_report(run_dir, args.command)}")
+        if tracer is not None:
+            tracer.stop()
+            print(f"🧵 {tracer.spans} spans appended to {tracer.path} (see `brief_cli.py trace`)")
+
+    if args.timing:
+        for module_name, seconds in IMPORT_TIMES.items():
+            print(f"⏱️ import {module_name}: {seconds * 1000:.1f} ms")
+        print(f"⏱️ {args.command} finished in {time.perf_counter() - command_start:.2f} s")
+    return status
+
+if __name__ == "__main__":
+    sys.exit(main())
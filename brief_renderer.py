@@ -0,0 +1,267 @@
+import json
+import re
+from datetime import datetime
+from typing import List, Dict, Optional
+
+# Local, deterministic replacement for the Brief Editor LLM call: the earlier
+# stages emit structured JSON and this module pours it into the fixed template.
+
+def extract_json(text, default=None):
+    """Pull the first JSON array/object out of an LLM response (handles ```json fences and chatter)."""
+    if not text:
+        return default
+    fenced = re.search(r'```(?:json)?\s*(.*?)```', text, re.DOTALL)
+    candidates = [fenced.group(1)] if fenced else []
+    candidates.append(text)
+
+    decoder = json.JSONDecoder()
+    for candidate in candidates:
+        for match in re.finditer(r'[\[{]', candidate):
+            try:
+                value, _ = decoder.raw_decode(candidate[match.start():])
+                return value
+            except ValueError:
+                continue
+    return default
+
+def _as_list(value):
+    """Stage outputs may come back as a bare object or wrapped in {"items": [...]}."""
+    if isinstance(value, list):
+        return [v for v in value if isinstance(v, dict)]
+    if isinstance(value, dict):
+        for key in ('items', 'signals', 'scores', 'actions', 'results'):
+            if isinstance(value.get(key), list):
+                return _as_list(value[key])
+        return [value]
+    return []
+
+def _update_for_index(updates, index):
+    """Return the collected update a stage referred to by its 1-based context number."""
+    try:
+        index = int(index)
+    except (TypeError, ValueError):
+        return None
+    if 1 <= index <= len(updates):
+        return updates[index - 1]
+    return None
+
+def _format_tags(tags):
+    if isinstance(tags, str):
+        tags = re.split(r'[\s,\[\]]+', tags)
+    return ' '.join(f"[{str(t).strip().strip('[]')}]" for t in tags or [] if str(t).strip())
+
+def _format_score(score):
+    match = re.search(r'\d+', str(score))
+    return match.group(0) if match else 'N/A'
+
+def build_brief_data(updates: List[Dict], signals, scores, actions, date: Optional[str] = None) -> Dict:
+    """Merge the structured stage outputs into a single brief record.
+
+    Links are always taken from the collected updates (via the `index` each stage
+    reports), never from LLM text, so URLs can't be mangled on the way through.
+    """
+    known_links = {u.get('link') for u in updates}
+    signals, scores, actions = _as_list(signals), _as_list(scores), _as_list(actions)
+
+    scores_by_index = {str(s.get('index')): s for s in scores if s.get('index') is not None}
+    brief_signals = []
+
+    for position, signal in enumerate(signals[:5]):
+        update = _update_for_index(updates, signal.get('index'))
+        link = update.get('link', '') if update else ''
+        if not link and signal.get('link') in known_links:
+            link = signal['link']
+
+        score = scores_by_index.get(str(signal.get('index')))
+        if score is None and position < len(scores):
+            score = scores[position]  # Fall back to order-based matching
+        score = score or {}
+
+        brief_signals.append({
+            'index': signal.get('index'),
+            'title': signal.get('title') or (update or {}).get('title') or (update or {}).get('name', 'Unknown'),
+            'source': signal.get('source') or (update or {}).get('source', 'Unknown'),
+            'why_matters': signal.get('why_matters', ''),
+            'link': link,
+            'relevance_score': _format_score(score.get('score', score.get('relevance_score'))),
+            'tags': _format_tags(score.get('tags')) or 'N/A',
+            'explanation': score.get('explanation', 'N/A'),
+            'time_estimate': score.get('time_estimate', ''),
+            'action': None
+        })
+
+    brief_actions = []
+    for action in actions[:2]:
+        update = _update_for_index(updates, action.get('index'))
+        steps = action.get('steps') or []
+        description = action.get('description', '')
+        if steps:
+            description = f"{description} Steps: {'; '.join(str(s) for s in steps)}".strip()
+
+        brief_action = {
+            'index': action.get('index'),
+            'title': action.get('title', 'Untitled action'),
+            'time_estimate': action.get('time_estimate', ''),
+            'expected_outcome': action.get('expected_outcome', ''),
+            'description': description,
+            'link': update.get('link', '') if update else ''
+        }
+        brief_actions.append(brief_action)
+
+        # Attach the action to the signal it was built from, else to the next free signal
+        matches = [s for s in brief_signals if s['action'] is None and str(s['index']) == str(action.get('index'))]
+        matches = matches or [s for s in brief_signals if s['action'] is None]
+        if matches:
+            matches[0]['action'] = brief_action
+
+    return {
+        'date': date or datetime.now().strftime('%Y-%m-%d'),
+        'signals': brief_signals,
+        'actions': brief_actions,
+        'source_counts': {
+            'newsletter': len([u for u in updates if u.get('type') == 'newsletter']),
+            'news': len([u for u in updates if u.get('type') == 'news']),
+            'repo': len([u for u in updates if u.get('type') == 'repo'])
+        }
+    }
+
+def _markdown_link(url, text='View source'):
+    return f"[{text}]({url})" if url else 'N/A'
+
+def render_markdown(brief: Dict) -> str:
+    """Render the brief in the exact template notion_integration expects."""
+    lines = [
+        "# AI Strategy Brief",
+        "",
+        f"🗓️ Date: {brief['date']}",
+        ""
+    ]
+    if brief.get('note'):
+        lines += [f"⚠️ {brief['note']}", ""]
+    lines += [
+        "⸻",
+        "",
+        "*A curated daily snapshot of real-world AI signals and actions — personalized for a fast-learning founder.*",
+        "",
+        "⸻",
+        "",
+        "## 🔍 **Signal Hunter**",
+        "*Scanning real-world AI sources to surface the most significant updates of the day.*",
+        "",
+        "### 📌 Top 5 AI Signals",
+        ""
+    ]
+
+    for i, signal in enumerate(brief['signals'], 1):
+        lines += [
+            f"{i}. **{signal['title']}**",
+            f"   • Source: {signal['source']}",
+            f"   • Why it matters: {signal['why_matters']}",
+            f"   • Link: {_markdown_link(signal['link'])}",
+            ""
+        ]
+
+    lines += [
+        "⸻",
+        "",
+        "## 🎯 **Relevance Scorer**",
+        "*Evaluating how useful each signal is to a fast-learning AI product founder.*",
+        "",
+        "### 🎯 Relevance Summary",
+        ""
+    ]
+
+    for signal in brief['signals']:
+        lines += [
+            f"**{signal['title']}**",
+            f"• Relevance Score: {signal['relevance_score']}",
+            f"• Tags: {signal['tags']}",
+            f"• Explanation: {signal['explanation']}",
+        ]
+        if signal.get('time_estimate'):
+            lines.append(f"• Time to first working version: {signal['time_estimate']}")
+        lines.append("")
+
+    lines += [
+        "⸻",
+        "",
+        "## 🛠️ **Action Generator**",
+        "*Translating insights into specific, focused, actionable steps.*",
+        "",
+        "### ✅ Today's Suggested Actions",
+        ""
+    ]
+
+    for action in brief['actions']:
+        lines += [
+            f"✅ **{action['title']}**",
+            f"• Time Estimate: {action['time_estimate']}",
+            f"• Expected Outcome: {action['expected_outcome']}",
+            f"• Link: {_markdown_link(action['link'], 'Open resource')}",
+            f"• Description: {action['description']}",
+            ""
+        ]
+
+    counts = brief['source_counts']
+    lines += [
+        "⸻",
+        "",
+        "## 📊 **Source Tracker**",
+        "*Showing which platforms were scanned and how much content was pulled from each.*",
+        "",
+        "### 📊 Update Sources",
+        f"• Newsletters processed: {counts.get('newsletter', 0)}",
+        f"• Hacker News posts reviewed: {counts.get('news', 0)}",
+        f"• GitHub repos reviewed: {counts.get('repo', 0)}",
+        "",
+        "⸻",
+        ""
+    ]
+
+    if brief.get('rising_topics'):
+        lines += rising_topic_lines(brief['rising_topics']) + ["", "⸻", ""]
+
+    return '\n'.join(lines)
+
+def rising_topic_lines(topics: List[Dict]) -> List[str]:
+    """The "📈 Rising Topics" section (see trends.py) as Markdown lines."""
+    lines = ["### 📈 Rising Topics", "*Terms mentioned noticeably more this week than in the previous four.*", ""]
+    for topic in topics:
+        lines.append(f"• **{topic['term']}**: {topic['recent']} mentions this week "
+                     f"(vs {topic['baseline_weekly']}/week before, {topic['growth']}x)")
+    return lines
+
+def brief_to_articles(brief: Dict) -> List[Dict]:
+    """Convert a structured brief straight into the article dicts format_grouped_content uses.
+
+    This is what parse_articles_from_brief reconstructs from Markdown, without the regex round-trip.
+    """
+    articles = []
+    for signal in brief['signals']:
+        action_text = None
+        action = signal.get('action')
+        if action:
+            action_text = '\n'.join([
+                f"✅ **{action['title']}**",
+                f"• Time Estimate: {action['time_estimate']}",
+                f"• Expected Outcome: {action['expected_outcome']}",
+                f"• Description: {action['description']}"
+            ])
+        articles.append({
+            'title': signal['title'],
+            'source': signal['source'],
+            'why_matters': signal['why_matters'],
+            'link': signal['link'],
+            'relevance_score': signal['relevance_score'],
+            'tags': signal['tags'],
+            'explanation': signal['explanation'],
+            'action': action_text
+        })
+    return articles
+
+def save_brief(brief: Dict, markdown_path="strategy_brief.md", json_path="strategy_brief.json"):
+    """Write the rendered Markdown brief plus its structured source next to it."""
+    with open(markdown_path, "w", encoding="utf-8") as f:
+        f.write(render_markdown(brief))
+    with open(json_path, "w", encoding="utf-8") as f:
+        json.dump(brief, f, indent=2, ensure_ascii=False)
@@ -0,0 +1,89 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+import profiling
+import tracing
+from feed_parsers import memo, parse_all
+from http_client import ByteBudget, fetch
+
+# Two-stage collection: an I/O stage fetches every source's raw bytes on a
+# thread pool (per-host limits from http_client), then the whole batch goes to
+# feed_parsers.parse_all, which parses across processes. A source is a tuple
+# (kind, name, url, entry limit); see data_collector.collection_sources().
+#
+# Memory stays bounded whatever upstream sends: each body is capped by its
+# source kind and the whole run by COLLECTION_BYTE_BUDGET (http_client aborts
+# oversized or bomb-like responses), and the run reports its peak RSS.
+
+FETCH_WORKERS = 16
+# Kinds whose servers ignore or don't support conditional GET
+UNCONDITIONAL = {"hn", "github"}
+# Largest body accepted per source kind (after decompression)
+SOURCE_BYTE_LIMITS = {
+    "newsletter": 5_000_000,
+    "ai_blog": 5_000_000,
+    "ai_research": 5_000_000,
+    "hn": 2_000_000,
+    "github": 3_000_000
+}
+DEFAULT_SOURCE_BYTES = 5_000_000
+COLLECTION_BYTE_BUDGET = 150_000_000
+
+def peak_rss_mb() -> Optional[float]:
+    """Peak resident memory of this process so far, in MB (None where unsupported)."""
+    try:
+        import resource
+        import sys
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+def _fetch_source(source: Tuple, budget: Optional[ByteBudget] = None) -> Tuple[Optional[Tuple], Optional[str]]:
+    kind, name, url, limit = source
+    with tracing.span("source.fetch", source=name, kind=kind) as span:
+        try:
+            result = fetch(url, conditional=kind not in UNCONDITIONAL, polite=True,
+                           max_bytes=SOURCE_BYTE_LIMITS.get(kind, DEFAULT_SOURCE_BYTES), budget=budget)
+        except Exception as e:
+            span.set(error=f"{type(e).__name__}: {e}")
+            print(f"  ❌ Failed to fetch {name}: {e}")
+            return None, f"{type(e).__name__}: {e}"
+    return (kind, name, url, limit, result.content), None
+
+def fetch_jobs(sources: List[Tuple], workers: int = FETCH_WORKERS,
+               budget: Optional[ByteBudget] = None) -> List[Tuple[Optional[Tuple], Optional[str]]]:
+    """I/O stage, per source in order: (parse job, None) if it could be fetched, else (None, error)."""
+    budget = budget or ByteBudget(COLLECTION_BYTE_BUDGET)
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(tracing.propagate(lambda source: _fetch_source(source, budget)), sources))
+
+def fetch_sources(sources: List[Tuple], workers: int = FETCH_WORKERS,
+                  budget: Optional[ByteBudget] = None) -> List[Tuple]:
+    """I/O stage: parse jobs (the source plus its raw body) for every source that could be fetched."""
+    return [job for job, _ in fetch_jobs(sources, workers, budget) if job is not None]
+
+def collect(sources: List[Tuple], workers: int = FETCH_WORKERS, processes: Optional[int] = None) -> List[Dict]:
+    """Fetch and parse the sources; updates come back in source order."""
+    start = time.perf_counter()
+    budget = ByteBudget(COLLECTION_BYTE_BUDGET)
+    with profiling.stage("fetch"), tracing.span("collect.fetch", sources=len(sources)) as span:
+        jobs = fetch_sources(sources, workers, budget)
+        span.set(fetched=len(jobs), bytes=budget.used)
+    fetched = time.perf_counter()
+    memo_hits = memo.hits
+    with profiling.stage("parse"), tracing.span("collect.parse", jobs=len(jobs)) as span:
+        results = parse_all(jobs, processes)
+        span.set(memo_hits=memo.hits - memo_hits)
+    updates = []
+    for job, (records, error) in zip(jobs, results):
+        if error:
+            print(f"  ⚠️ Could not parse {job[1]}: {error}")
+        updates.extend(records)
+    print(f"📡 Collected {len(updates)} updates from {len(jobs)}/{len(sources)} sources "
+          f"(fetch {fetched - start:.1f}s, parse {time.perf_counter() - fetched:.1f}s, "
+          f"{memo.hits - memo_hits} unchanged bodies reused)")
+    print(f"📦 Downloaded {budget.used / 1e6:.1f} MB; peak RSS {peak_rss_mb()} MB")
+    return updates
@@ -0,0 +1,333 @@
+import os
+import json
+import time
+import socket
+import sqlite3
+import xml.etree.ElementTree as ET
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from collection import COLLECTION_BYTE_BUDGET, fetch_jobs
+from dedupe import dedupe_updates
+from feed_parsers import parse_all
+from http_client import ByteBudget
+
+# Distributed collection through a shared, lease-based work queue. A
+# coordinator enqueues one job per source for a collection round (normally the
+# run date); any number of workers, in separate processes or on other hosts
+# that share the database file, claim small batches of jobs under a time-limited
+# lease, fetch and parse them exactly like collection.collect, and write each
+# source's update records back. Jobs whose worker dies are claimable again once
+# the lease runs out, and a worker only gets to complete jobs it still holds
+# (the lease owner is checked on write), so a slow worker whose lease was taken
+# over can't overwrite the new holder's result. The coordinator then merges the
+# records in source order and dedupes them.
+#
+# Besides the built-in sources, the queue keeps a catalog of extra feeds
+# imported from OPML files, so a round can cover thousands of blogs.
+#
+# The database uses a rollback journal rather than WAL: WAL needs shared
+# memory, which a file shared by several hosts over a network filesystem
+# doesn't have. Per-host request limits (http_client.HOST_LIMITS) apply per
+# worker process.
+
+QUEUE_DB = os.getenv("COLLECTION_QUEUE_DB", "data/collection_queue.db")
+LEASE_SECONDS = 300
+BATCH_SIZE = 8          # sources claimed at once; small batches spread slow hosts across workers
+MAX_ATTEMPTS = 3
+RETRY_DELAY = 60        # seconds before a failed source can be claimed again
+IDLE_POLL = 2.0
+DEFAULT_ENTRY_LIMITS = {"ai_blog": 3, "ai_research": 2}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS catalog (
+    url TEXT PRIMARY KEY,
+    kind TEXT NOT NULL,
+    name TEXT NOT NULL,
+    entry_limit INTEGER,
+    added_at TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    round TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    kind TEXT NOT NULL,
+    name TEXT NOT NULL,
+    url TEXT NOT NULL,
+    entry_limit INTEGER,
+    status TEXT NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    available_at REAL NOT NULL,
+    lease_owner TEXT,
+    lease_expires REAL,
+    last_error TEXT,
+    updated_at TEXT NOT NULL,
+    UNIQUE (round, url)
+);
+CREATE INDEX IF NOT EXISTS jobs_claim ON jobs (round, status, available_at);
+CREATE TABLE IF NOT EXISTS records (
+    job_id INTEGER PRIMARY KEY REFERENCES jobs(id),
+    round TEXT NOT NULL,
+    worker TEXT NOT NULL,
+    updates TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS records_round ON records (round);
+"""
+
+def _now_iso():
+    return datetime.now().isoformat(timespec="seconds")
+
+def worker_id() -> str:
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+def load_opml(path: str, kind: str = "ai_blog", entry_limit: Optional[int] = None) -> List[Tuple]:
+    """Sources (kind, name, url, entry limit) for every feed outline in an OPML file."""
+    sources = []
+    for outline in ET.parse(path).iter("outline"):
+        url = (outline.get("xmlUrl") or "").strip()
+        if url:
+            name = outline.get("title") or outline.get("text") or url
+            sources.append((kind, name.strip(), url, entry_limit if entry_limit is not None else DEFAULT_ENTRY_LIMITS.get(kind)))
+    return sources
+
+class CollectionQueue:
+    """SQLite queue of per-source collection jobs, shared by a coordinator and its workers."""
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path or QUEUE_DB
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        with self._connect() as conn:
+            conn.executescript(SCHEMA)
+
+    def _connect(self):
+        # One connection per operation, as in publish_outbox: safe from threads and forked workers
+        conn = sqlite3.connect(self.path, timeout=60, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA journal_mode=DELETE")
+        return conn
+
+    # --- catalog ---
+
+    def add_to_catalog(self, sources: Iterable[Tuple]) -> int:
+        """Add extra sources (e.g. from OPML); a known URL keeps its entry. Returns how many were new."""
+        now = _now_iso()
+        with self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            added = sum(conn.execute(
+                "INSERT OR IGNORE INTO catalog (url, kind, name, entry_limit, added_at) VALUES (?, ?, ?, ?, ?)",
+                (url, kind, name, limit, now)).rowcount for kind, name, url, limit in sources)
+            conn.execute("COMMIT")
+            return added
+
+    def catalog(self) -> List[Tuple]:
+        with self._connect() as conn:
+            rows = conn.execute("SELECT kind, name, url, entry_limit FROM catalog ORDER BY added_at, url").fetchall()
+            return [(row["kind"], row["name"], row["url"], row["entry_limit"]) for row in rows]
+
+    # --- coordinator side ---
+
+    def enqueue(self, round_id: str, sources: Iterable[Tuple], fresh: bool = False) -> int:
+        """Queue one job per source for a round; sources already queued for it are left as they are.
+
+        With fresh=True the round's jobs and records are dropped first. Returns
+        how many jobs were added.
+        """
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            if fresh:
+                conn.execute("DELETE FROM records WHERE round = ?", (round_id,))
+                conn.execute("DELETE FROM jobs WHERE round = ?", (round_id,))
+            position = conn.execute("SELECT COALESCE(MAX(position), -1) FROM jobs WHERE round = ?",
+                                    (round_id,)).fetchone()[0]
+            added = 0
+            for kind, name, url, limit in sources:
+                inserted = conn.execute(
+                    """INSERT OR IGNORE INTO jobs (round, position, kind, name, url, entry_limit, available_at, updated_at)
+                       VALUES (?, ?, ?, ?, ?, ?, ?, ?)""",
+                    (round_id, position + 1, kind, name, url, limit, now, _now_iso())).rowcount
+                position += inserted
+                added += inserted
+            conn.execute("COMMIT")
+            return added
+
+    def stats(self, round_id: str) -> Dict[str, int]:
+        with self._connect() as conn:
+            rows = conn.execute("SELECT status, COUNT(*) AS n FROM jobs WHERE round = ? GROUP BY status",
+                                (round_id,)).fetchall()
+            return {row["status"]: row["n"] for row in rows}
+
+    def outstanding(self, round_id: str) -> int:
+        """Jobs in the round that are neither done nor permanently failed."""
+        with self._connect() as conn:
+            # Without a worker left to claim them, expired last attempts would otherwise stay outstanding
+            self._expire(conn, round_id, time.time())
+        stats = self.stats(round_id)
+        return stats.get("pending", 0) + stats.get("leased", 0)
+
+    def failures(self, round_id: str) -> List[sqlite3.Row]:
+        with self._connect() as conn:
+            return conn.execute("SELECT name, url, attempts, last_error FROM jobs WHERE round = ? AND status = 'failed'",
+                                (round_id,)).fetchall()
+
+    def merge(self, round_id: str) -> List[Dict]:
+        """Every update written back for the round, in source order, deduplicated."""
+        with self._connect() as conn:
+            rows = conn.execute(
+                """SELECT r.updates FROM records r JOIN jobs j ON j.id = r.job_id
+                   WHERE r.round = ? ORDER BY j.position""", (round_id,)).fetchall()
+        return dedupe_updates([update for row in rows for update in json.loads(row["updates"])])
+
+    def worker_counts(self, round_id: str) -> Dict[str, int]:
+        """Sources completed per worker in a round, to check the load spread."""
+        with self._connect() as conn:
+            rows = conn.execute("SELECT worker, COUNT(*) AS n FROM records WHERE round = ? GROUP BY worker",
+                                (round_id,)).fetchall()
+            return {row["worker"]: row["n"] for row in rows}
+
+    @staticmethod
+    def _expire(conn, round_id: str, now: float):
+        # A source whose workers keep dying on it (lease ran out every time) stops being handed out
+        conn.execute(
+            """UPDATE jobs SET status = 'failed', last_error = 'lease expired without a result', updated_at = ?
+               WHERE round = ? AND status = 'leased' AND lease_expires <= ? AND attempts >= ?""",
+            (_now_iso(), round_id, now, MAX_ATTEMPTS))
+
+    # --- worker side ---
+
+    def claim(self, round_id: str, owner: str, limit: int = BATCH_SIZE,
+              lease: float = LEASE_SECONDS) -> List[sqlite3.Row]:
+        """Atomically lease up to `limit` due jobs (including ones whose lease ran out)."""
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            self._expire(conn, round_id, now)
+            rows = conn.execute(
+                """SELECT * FROM jobs
+                   WHERE round = ? AND ((status = 'pending' AND available_at <= ?)
+                                        OR (status = 'leased' AND lease_expires <= ?))
+                   ORDER BY position LIMIT ?""",
+                (round_id, now, now, limit)).fetchall()
+            conn.executemany(
+                """UPDATE jobs SET status = 'leased', lease_owner = ?, lease_expires = ?,
+                       attempts = attempts + 1, updated_at = ? WHERE id = ?""",
+                [(owner, now + lease, _now_iso(), row["id"]) for row in rows])
+            conn.execute("COMMIT")
+            return rows
+
+    def complete(self, job_id: int, owner: str, updates: List[Dict]) -> bool:
+        """Store a job's updates if `owner` still holds its lease; returns whether it did."""
+        with self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            held = conn.execute(
+                """UPDATE jobs SET status = 'done', lease_owner = NULL, lease_expires = NULL, last_error = NULL,
+                       updated_at = ? WHERE id = ? AND status = 'leased' AND lease_owner = ?""",
+                (_now_iso(), job_id, owner)).rowcount
+            if held:
+                conn.execute("INSERT OR REPLACE INTO records (job_id, round, worker, updates) "
+                             "SELECT id, round, ?, ? FROM jobs WHERE id = ?",
+                             (owner, json.dumps(updates, ensure_ascii=False), job_id))
+            conn.execute("COMMIT")
+            return bool(held)
+
+    def fail(self, job_id: int, owner: str, error: str) -> Optional[str]:
+        """Record a failed attempt; the job is retried later, or marked failed after MAX_ATTEMPTS."""
+        with self._connect() as conn:
+            conn.execute(
+                """UPDATE jobs SET status = CASE WHEN attempts >= ? THEN 'failed' ELSE 'pending' END,
+                       available_at = ?, lease_owner = NULL, lease_expires = NULL, last_error = ?, updated_at = ?
+                   WHERE id = ? AND status = 'leased' AND lease_owner = ?""",
+                (MAX_ATTEMPTS, time.time() + RETRY_DELAY, error[:2000], _now_iso(), job_id, owner))
+            row = conn.execute("SELECT status FROM jobs WHERE id = ?", (job_id,)).fetchone()
+            return row["status"] if row else None
+
+def process_batch(queue: CollectionQueue, jobs: List[sqlite3.Row], owner: str, processes: int = 1) -> Tuple[int, int]:
+    """Fetch and parse one claimed batch and write the results back; returns (completed, failed)."""
+    sources = [(job["kind"], job["name"], job["url"], job["entry_limit"]) for job in jobs]
+    fetched = fetch_jobs(sources, budget=ByteBudget(COLLECTION_BYTE_BUDGET))
+    parse_jobs = [parse_job for parse_job, _ in fetched if parse_job is not None]
+    parsed = iter(parse_all(parse_jobs, processes))
+    completed = failed = 0
+    for job, (parse_job, fetch_error) in zip(jobs, fetched):
+        records, error = next(parsed) if parse_job is not None else ([], fetch_error)
+        if error is None and queue.complete(job["id"], owner, records):
+            completed += 1
+        elif error is not None:
+            queue.fail(job["id"], owner, error)
+            failed += 1
+    return completed, failed
+
+def run_worker(round_id: Optional[str] = None, path: Optional[str] = None, batch: int = BATCH_SIZE,
+               processes: int = 1, exit_when_idle: bool = False, owner: Optional[str] = None) -> Dict[str, int]:
+    """Claim and process batches until the round has nothing left (or forever, polling, for a standing worker).
+
+    Without a round_id the worker follows today's round, so a standing worker
+    moves on to the next day's collection by itself.
+    """
+    queue = CollectionQueue(path)
+    owner = owner or worker_id()
+    totals = {"completed": 0, "failed": 0, "batches": 0}
+    start = time.perf_counter()
+    while True:
+        current_round = round_id or datetime.now().strftime("%Y-%m-%d")
+        jobs = queue.claim(current_round, owner, batch)
+        if not jobs:
+            if exit_when_idle and not queue.outstanding(current_round):
+                break
+            time.sleep(IDLE_POLL)  # Leased elsewhere or waiting out a retry delay
+            continue
+        completed, failed = process_batch(queue, jobs, owner, processes)
+        totals["completed"] += completed
+        totals["failed"] += failed
+        totals["batches"] += 1
+    elapsed = time.perf_counter() - start
+    print(f"👷 {owner}: {totals['completed']} sources done, {totals['failed']} failed attempts "
+          f"in {totals['batches']} batches ({elapsed:.1f}s)")
+    return totals
+
+def start_local_workers(round_id: str, count: int, path: Optional[str] = None, batch: int = BATCH_SIZE) -> List:
+    """Spawn `count` worker processes on this machine that exit when the round is done."""
+    from multiprocessing import get_context
+
+    # spawn, as for the parse pool: the coordinator may have live threads
+    context = get_context("spawn")
+    workers = [context.Process(target=run_worker, args=(round_id, path, batch),
+                               kwargs={"exit_when_idle": True}, name=f"collector-{i}")
+               for i in range(count)]
+    for worker in workers:
+        worker.start()
+    return workers
+
+def collect_round(round_id: str, sources: List[Tuple], path: Optional[str] = None, local_workers: int = 0,
+                  timeout: float = 1800, fresh: bool = False) -> List[Dict]:
+    """Coordinator: queue a round, wait for the workers (local or remote) to finish it and merge the results."""
+    queue = CollectionQueue(path)
+    added = queue.enqueue(round_id, sources, fresh=fresh)
+    print(f"📬 Round {round_id}: queued {added} new sources ({len(sources)} in total) in {queue.path}")
+    workers = start_local_workers(round_id, local_workers, path) if local_workers else []
+    if not workers:
+        print(f"⏳ Waiting for workers: run `brief_cli.py --date {round_id} queue work` on any host sharing {queue.path}")
+    start = time.perf_counter()
+    try:
+        while queue.outstanding(round_id):
+            if time.perf_counter() - start > timeout:
+                print(f"⏰ Gave up waiting after {timeout:.0f}s; merging what has been collected")
+                break
+            if workers and not any(worker.is_alive() for worker in workers):
+                print("⚠️ All local workers exited with sources outstanding; merging what has been collected")
+                break
+            time.sleep(IDLE_POLL)
+    finally:
+        for worker in workers:
+            worker.join(timeout=5)
+            if worker.is_alive():
+                worker.terminate()
+
+    updates = queue.merge(round_id)
+    stats = queue.stats(round_id)
+    spread = ", ".join(f"{worker}: {n}" for worker, n in sorted(queue.worker_counts(round_id).items()))
+    print(f"📡 Round {round_id}: {len(updates)} updates from {stats.get('done', 0)}/{sum(stats.values())} sources "
+          f"in {time.perf_counter() - start:.1f}s ({spread or 'no workers finished a source'})")
+    for failure in queue.failures(round_id):
+        print(f"  ❌ {failure['name']}: {failure['last_error']} (after {failure['attempts']} attempts)")
+    return updates
@@ -1,48 +1,71 @@
 from crewai import Agent, Task, Crew
-from llm_config import get_openrouter_llm
-from data_collector import get_real_ai_updates
-from notion_integration import push_to_notion
-from datetime import datetime
+from llm_config import get_llm_for_role
+from llm_routing import merge_routes
+from profiles import agent_setting
+from brief_renderer import extract_json, build_brief_data, save_brief
+import fast_brief
+import profiling
+import tracing
 import json
+import os
 
-# Initialize OpenRouter LLM
-try:
-    openrouter_llm = get_openrouter_llm()
-    print("✅ OpenRouter LLM initialized successfully")
-except Exception as e:
-    print(f"❌ Failed to initialize OpenRouter LLM: {e}")
-    exit(1)
+# Nothing runs at import time: collection, LLM setup and the crew all happen in
+# the functions below (see brief_cli.py for the individual pipeline stages).
 
-# Fetch real AI updates
-print("Fetching real AI updates...")
-real_updates = get_real_ai_updates()
-print(f"Found {len(real_updates)} updates")
+ROLES = ("Signal Hunter", "Relevance Scorer", "Action Generator")
 
-# Limit to top 15 updates to keep context manageable
-real_updates = real_updates[:15]
-print(f"Using top {len(real_updates)} updates for analysis")
-
-# Format updates into context text for Signal Hunter
-context_text = "Here are today's top AI updates from various sources:\n\n"
-for i, update in enumerate(real_updates, 1):
-    # Handle different title fields for different types  
-    title = update.get('title', update.get('name', 'No title'))
-    context_text += f"{i}. [{update['type'].upper()}] {update['source']}: {title}\n"
-    if update['type'] == 'newsletter' and 'summary' in update:
-        context_text += f"   Summary: {update['summary'][:150]}...\n"
-    elif update['type'] == 'news' and 'points' in update:
-        context_text += f"   Points: {update['points']}\n"
-    elif update['type'] == 'repo' and 'description' in update:
-        context_text += f"   Description: {update['description'][:150]}...\n"
-        if 'stars' in update:
-            context_text += f"   Stars: {update['stars']}\n"
-    context_text += f"   Link: {update['link']}\n\n"
-
-# Define agents
-signal_hunter = Agent(
-    role="Signal Hunter",
-    goal="Find the top 5 AI updates specifically about agentic systems, multi-agent frameworks, RAG implementations, and tools I can build with today",
-    backstory="""You are a developer-focused AI analyst who prioritizes ACTIONABLE updates about agent systems and RAG.
+# Default scoring rubric; brief profiles can replace it
+BUILDER_RUBRIC = """10: CrewAI multi-agent template I can customize today
+    9: LangChain agent with tools/memory I can fork
+    8: RAG system with vector DB I can deploy
+    7: Agent coordination pattern I can implement
+    6: Claude API integration I haven't tried
+    5: Useful utility for agent development
+    4: Interesting architecture to study
+    3: General AI tool (not agent-focused)
+    1-2: No practical building opportunity"""
+
+# Characters of enriched page text each update contributes to the Signal Hunter context
+CONTENT_CHARS = 1200
+
+def format_updates_context(updates):
+    """Format updates into the numbered context text the Signal Hunter reads."""
+    context_text = "Here are today's top AI updates from various sources:\n\n"
+    for i, update in enumerate(updates, 1):
+        # Handle different title fields for different types  
+        title = update.get('title', update.get('name', 'No title'))
+        context_text += f"{i}. [{update['type'].upper()}] {update['source']}: {title}\n"
+        if update['type'] == 'newsletter' and 'summary' in update:
+            context_text += f"   Summary: {update['summary'][:150]}...\n"
+        elif update['type'] == 'news' and 'points' in update:
+            context_text += f"   Points: {update['points']}\n"
+        elif update['type'] == 'repo' and 'description' in update:
+            context_text += f"   Description: {update['description'][:150]}...\n"
+            if 'stars' in update:
+                context_text += f"   Stars: {update['stars']}\n"
+            if update.get('trending_streak'):
+                context_text += (f"   Momentum: +{update.get('star_velocity', 0)} stars/day, "
+                                 f"trending {update['trending_streak']} day(s) running\n")
+        if update.get('content'):
+            # Linked page text or README from the enrichment stage (enrichment.py)
+            context_text += f"   Content: {update['content'][:CONTENT_CHARS]}...\n"
+        context_text += f"   Link: {update['link']}\n\n"
+    return context_text
+
+def build_agents(stream=True, profile=None):
+    """Create the three CrewAI agents, each with the LLM routed for its role.
+    
+    A brief profile (see profiles.py) can override each agent's goal and
+    backstory and the model routing; without one the builder brief is produced.
+    """
+    # One OpenRouter LLM per agent role (model chains live in llm_routing.py)
+    routes = merge_routes(profile.get("routes")) if profile else None
+    role_llms = {role: get_llm_for_role(role, stream=stream, routes=routes) for role in ROLES}
+    
+    signal_hunter = Agent(
+        role="Signal Hunter",
+        goal=agent_setting(profile, "Signal Hunter", "goal", "Find the top 5 AI updates specifically about agentic systems, multi-agent frameworks, RAG implementations, and tools I can build with today"),
+        backstory=agent_setting(profile, "Signal Hunter", "backstory", """You are a developer-focused AI analyst who prioritizes ACTIONABLE updates about agent systems and RAG.
     You specifically look for:
     - Multi-agent frameworks and orchestration tools (like CrewAI, AutoGen, LangGraph)
     - RAG systems and vector database implementations
@@ -51,16 +74,16 @@ signal_hunter = Agent(
     - Claude, GPT, and LLM integration patterns
     You IGNORE: general AI news, funding announcements, opinion pieces, or anything without code/implementation details.
     You love: GitHub repos with working examples, new agent libraries, practical tutorials, and tools that can be installed today.
-    CRITICAL: You NEVER make up or invent URLs. You only report what actually exists in the data provided to you.""",
-    verbose=True,
-    allow_delegation=False,
-    llm=openrouter_llm
-)
-
-relevance_scorer = Agent(
-    role="Relevance Scorer",
-    goal="Score updates based on how well they help me build agent systems, learn CrewAI/LangChain, and create practical AI tools",
-    backstory="""You evaluate AI updates through the lens of a hands-on builder who uses Claude Code daily and wants to master agentic systems.
+    CRITICAL: You NEVER make up or invent URLs. You only report what actually exists in the data provided to you."""),
+        verbose=True,
+        allow_delegation=False,
+        llm=role_llms["Signal Hunter"]
+    )
+
+    relevance_scorer = Agent(
+        role="Relevance Scorer",
+        goal=agent_setting(profile, "Relevance Scorer", "goal", "Score updates based on how well they help me build agent systems, learn CrewAI/LangChain, and create practical AI tools"),
+        backstory=agent_setting(profile, "Relevance Scorer", "backstory", """You evaluate AI updates through the lens of a hands-on builder who uses Claude Code daily and wants to master agentic systems.
     
     Your scoring criteria (1-10):
     10: CrewAI/LangChain tutorial or template I can build TODAY
@@ -73,16 +96,16 @@ relevance_scorer = Agent(
     1-2: Theory without practical implementation
     
     You VALUE: working code, step-by-step tutorials, agent design patterns, integration examples
-    You PENALIZE: vague announcements, closed-source tools, purely theoretical papers""",
-    verbose=True,
-    allow_delegation=False,
-    llm=openrouter_llm
-)
-
-action_generator = Agent(
-    role="Action Generator",
-    goal="Create hands-on learning tasks where I build something practical using the new agent/RAG concepts discovered today",
-    backstory="""You're a learn-by-doing coach who ALWAYS suggests building projects, not just reading.
+    You PENALIZE: vague announcements, closed-source tools, purely theoretical papers"""),
+        verbose=True,
+        allow_delegation=False,
+        llm=role_llms["Relevance Scorer"]
+    )
+
+    action_generator = Agent(
+        role="Action Generator",
+        goal=agent_setting(profile, "Action Generator", "goal", "Create hands-on learning tasks where I build something practical using the new agent/RAG concepts discovered today"),
+        backstory=agent_setting(profile, "Action Generator", "backstory", """You're a learn-by-doing coach who ALWAYS suggests building projects, not just reading.
     
     You understand that I:
     - Learn best by building things I'll actually use
@@ -100,39 +123,25 @@ action_generator = Agent(
     Good action: "Build a CrewAI agent that summarizes your GitHub notifications"
     Bad action: "Read about agent architectures"
     
-    Always frame learning as building something I'll use tomorrow.""",
-    verbose=True,
-    allow_delegation=False,
-    llm=openrouter_llm
-)
+    Always frame learning as building something I'll use tomorrow."""),
+        verbose=True,
+        allow_delegation=False,
+        llm=role_llms["Action Generator"]
+    )
 
-editor = Agent(
-    role="Brief Editor",
-    goal="Compile a daily brief focused on building agent systems, with clear next steps for hands-on learning",
-    backstory="""You're a technical editor who understands developers learn by doing.
-    
-    You structure the brief to be:
-    - Scannable in 2 minutes over morning coffee
-    - Focused on BUILDABLE agent/RAG projects
-    - Clear about what I'll create today
-    - Honest about time investment (30-60 min sessions)
-    
-    You emphasize:
-    - Working code and git repos I can clone
-    - How each update relates to CrewAI/LangChain/Claude
-    - Practical outcomes ("You'll have a working X that does Y")
-    - Connection to my interests (agent systems, RAG, automation)
+    return signal_hunter, relevance_scorer, action_generator
+
+def _stage_input(label, data):
+    """Append an earlier stage's JSON output to a task description."""
+    return f"""
     
-    You skip fluff and get straight to "here's what you can build today".
-    CRITICAL: You NEVER modify URLs - you copy them EXACTLY as provided by other agents.""",
-    verbose=True,
-    allow_delegation=False,
-    llm=openrouter_llm
-)
+    {label}:
+    {json.dumps(data, indent=2, ensure_ascii=False)}"""
 
-# Define tasks with real data context
-task1 = Task(
-    description=f"""Find UP TO 5 MOST BUILDABLE agent/RAG updates from today's data.
+def signal_hunter_task(signal_hunter, context_text):
+    """Task 1: pick up to 5 buildable updates, referenced by their index in the context."""
+    return Task(
+        description=f"""Find UP TO 5 MOST BUILDABLE agent/RAG updates from today's data.
     
     CRITICAL RULES:
     - Only report updates that ACTUALLY EXIST in the provided data below
@@ -153,46 +162,49 @@ task1 = Task(
     4. Claude/LLM integration patterns (10%)
     
     For each selection provide:
-    - Title and source  
-    - One line: "Build a [WHAT] that [DOES WHAT]"
-    - Link: USE THE EXACT ORIGINAL LINK from the context data above
-    - Has code: Yes/No
+    - index: the number of the update in the list below (links are looked up from it)
+    - title and source  
+    - why_matters: one line "Build a [WHAT] that [DOES WHAT]"
+    - has_code: true/false
     
     Real updates to analyze:
     {context_text}
     
     Remember: I want to BUILD, not just read. If it doesn't have code, it's not worth selecting.
-    IMPORTANT: You MUST use the exact original links provided in the context data above - do NOT create or modify any URLs.""",
-    expected_output="5 buildable agent/RAG projects with implementation details",
-    agent=signal_hunter
-)
-
-task2 = Task(
-    description="""Score each update based on how it helps me BUILD agent systems and level up my CrewAI/LangChain skills.
+    
+    Return ONLY a JSON array, no prose or Markdown:
+    [{{"index": 3, "title": "...", "source": "...", "why_matters": "Build a ... that ...", "has_code": true}}]""",
+        expected_output="JSON array of up to 5 buildable agent/RAG updates referenced by index",
+        agent=signal_hunter
+    )
+
+def relevance_task(relevance_scorer, signals, profile=None):
+    """Task 2: score the Signal Hunter's selections (with the profile's rubric, if any)."""
+    intro = "Score each update based on how it helps me BUILD agent systems and level up my CrewAI/LangChain skills."
+    if agent_setting(profile, "Relevance Scorer", "rubric", None) and profile.get("description"):
+        intro = f"Score each update for this reader: {profile['description']}."
+    return Task(
+        description=intro + """
     
     USE THIS EXACT SCORING:
-    10: CrewAI multi-agent template I can customize today
-    9: LangChain agent with tools/memory I can fork
-    8: RAG system with vector DB I can deploy
-    7: Agent coordination pattern I can implement
-    6: Claude API integration I haven't tried
-    5: Useful utility for agent development
-    4: Interesting architecture to study
-    3: General AI tool (not agent-focused)
-    1-2: No practical building opportunity
+    """ + agent_setting(profile, "Relevance Scorer", "rubric", BUILDER_RUBRIC) + """
     
-    For each update:
-    - Score: [1-10]
-    - Why this score: "Can build [SPECIFIC THING] to [ACHIEVE WHAT]"
-    - Learning tags: [crewai] [langchain] [rag] [agents] [memory] [tools] [claude]
-    - Time to first working version: [X minutes]""",
-    expected_output="Scored list focused on buildable learning opportunities",
-    agent=relevance_scorer,
-    context=[task1]
-)
-
-task3 = Task(
-    description="""Create 1-2 BUILD projects that teach me agent/RAG concepts through hands-on coding.
+    For each update (keep the same index the Signal Hunter used):
+    - score: [1-10]
+    - explanation: "Can build [SPECIFIC THING] to [ACHIEVE WHAT]"
+    - tags: from crewai, langchain, rag, agents, memory, tools, claude
+    - time_estimate: time to first working version, e.g. "45 minutes"
+    
+    Return ONLY a JSON array, no prose or Markdown:
+    [{"index": 3, "score": 9, "tags": ["crewai", "agents"], "explanation": "Can build ...", "time_estimate": "45 minutes"}]""" + _stage_input("Signal Hunter selections", signals),
+        expected_output="JSON array of scores keyed by update index",
+        agent=relevance_scorer
+    )
+
+def action_task(action_generator, signals, scores):
+    """Task 3: turn the best-scored selections into 1-2 build projects."""
+    return Task(
+        description="""Create 1-2 BUILD projects that teach me agent/RAG concepts through hands-on coding.
     
     REQUIREMENTS for each project:
     1. Must result in WORKING CODE I'll use again
@@ -200,202 +212,74 @@ task3 = Task(
     3. Enhances my Claude Code workflow OR automates a daily task
     4. Can reach "v1 working" in 45-60 minutes
     
-    FORMAT each project as:
+    For each project provide:
+    - index: the update index the project is built from
+    - title: "Build a [SPECIFIC TOOL]"
+    - description: what you'll build (2-3 sentences) and which CrewAI/LangChain concepts you'll learn
+    - steps: exact commands / changes (clone or install, quick customization, run it)
+    - time_estimate: minutes to a working version
+    - expected_outcome: the working system you'll have and how to extend it tomorrow
     
-    Project: "Build a [SPECIFIC TOOL]"
-    What you'll build: [2-3 sentences about the working system]
-    What you'll learn: [Specific CrewAI/LangChain concepts]
+    GOOD: "Build a CrewAI team that reviews your code PRs"
+    BAD: "Learn about agent architectures"
     
-    Step 1: Clone/Install
-    ```bash
-    git clone [repo] OR pip install [packages]
-    ```
+    Remember: I learn by BUILDING things I'll USE.
     
-    Step 2: Quick customization
-    - Change X to do Y for your use case
-    - Add your API keys to .env
+    Return ONLY a JSON array, no prose or Markdown:
+    [{"index": 3, "title": "Build a ...", "description": "...", "steps": ["git clone ...", "python app.py"], "time_estimate": "45 minutes", "expected_outcome": "..."}]""" + _stage_input("Signal Hunter selections", signals) + _stage_input("Relevance scores", scores),
+        expected_output="JSON array of 1-2 concrete build projects",
+        agent=action_generator
+    )
+
+def _run_task(agent, task):
+    """Run a single task as its own crew and return its parsed JSON output."""
+    Crew(agents=[agent], tasks=[task], verbose=True).kickoff()
+    return extract_json(str(task.output), [])
+
+def analyze_updates(updates, store=None, profile=None):
+    """Run the agents over the shortlisted updates and return the structured brief.
     
-    Step 3: Run it
-    ```bash
-    python [script.py]
-    ```
+    Each agent runs as its own crew. With a RunStore, every agent's output is
+    checkpointed and reused on the next run, so a failure in a later stage
+    doesn't repeat the earlier LLM calls.
+    """
+    signal_hunter, relevance_scorer, action_generator = build_agents(profile=profile)
     
-    Time: [X minutes to working version]
-    Next steps: [How to extend it tomorrow]
+    def run_stage(stage, make_task, agent):
+        if store is not None and store.has(stage):
+            print(f"♻️ Reusing {stage} from {store.path}")
+            return store.load(stage)
+        with profiling.stage(stage), tracing.span("agent.task", stage=stage, role=agent.role) as span:
+            output = _run_task(agent, make_task())
+            span.set(items=len(output))
+        if not output:
+            raise ValueError(f"{agent.role} returned no parseable JSON")
+        if store is not None:
+            store.save(stage, output)
+        return output
     
-    GOOD: "Build a CrewAI team that reviews your code PRs"
-    BAD: "Learn about agent architectures"
+    signals = run_stage("signals", lambda: signal_hunter_task(signal_hunter, format_updates_context(updates)), signal_hunter)
+    scores = run_stage("scores", lambda: relevance_task(relevance_scorer, signals, profile), relevance_scorer)
+    actions = run_stage("actions", lambda: action_task(action_generator, signals, scores), action_generator)
     
-    Remember: I learn by BUILDING things I'll USE.""",
-    expected_output="1-2 concrete build projects with step-by-step instructions",
-    agent=action_generator,
-    context=[task1, task2]
-)
-
-task4 = Task(
-    description=f"""Create a final strategy brief following this EXACT template:
-
-# AI Strategy Brief
-
-🗓️ Date: {datetime.now().strftime('%Y-%m-%d')}
-
-⸻
-
-*A curated daily snapshot of real-world AI signals and actions — personalized for a fast-learning founder.*
-
-⸻
-
-## 🔍 **Signal Hunter**
-*Scanning real-world AI sources to surface the most significant updates of the day.*
-
-### 📌 Top 5 AI Signals
-
-1. **[Title]**
-   • Source: [source name]
-   • Why it matters: [1-line explanation]
-   • Link: [original URL or resource]
-
-2. **[Title]**
-   • Source: [source name]
-   • Why it matters: [1-line explanation]
-   • Link: [original URL or resource]
-
-3. **[Title]**
-   • Source: [source name]
-   • Why it matters: [1-line explanation]
-   • Link: [original URL or resource]
-
-4. **[Title]**
-   • Source: [source name]
-   • Why it matters: [1-line explanation]
-   • Link: [original URL or resource]
-
-5. **[Title]**
-   • Source: [source name]
-   • Why it matters: [1-line explanation]
-   • Link: [original URL or resource]
-
-⸻
-
-## 🎯 **Relevance Scorer**
-*Evaluating how useful each signal is to a fast-learning AI product founder.*
-
-### 🎯 Relevance Summary
-
-**[Title 1]**
-• Relevance Score: [1–10]
-• Tags: [tag1], [tag2]
-• Explanation: [1–2 sentences]
-
-**[Title 2]**
-• Relevance Score: [1–10]
-• Tags: [tag1], [tag2]
-• Explanation: [1–2 sentences]
-
-**[Title 3]**
-• Relevance Score: [1–10]
-• Tags: [tag1], [tag2]
-• Explanation: [1–2 sentences]
-
-**[Title 4]**
-• Relevance Score: [1–10]
-• Tags: [tag1], [tag2]
-• Explanation: [1–2 sentences]
-
-**[Title 5]**
-• Relevance Score: [1–10]
-• Tags: [tag1], [tag2]
-• Explanation: [1–2 sentences]
-
-⸻
-
-## 🛠️ **Action Generator**
-*Translating insights into specific, focused, actionable steps.*
-
-### ✅ Today's Suggested Actions
-
-✅ **[Action Title 1]**
-• Time Estimate: [xx minutes]
-• Expected Outcome: [what I'll learn or achieve]
-• Link: [formatted as clickable Markdown link](url)
-• Description: [concise instruction or guidance]
-
-✅ **[Action Title 2]**
-• Time Estimate: [xx minutes]
-• Expected Outcome: [what I'll learn or achieve]
-• Link: [formatted as clickable Markdown link](url)
-• Description: [concise instruction or guidance]
-
-⸻
-
-## 📊 **Source Tracker**
-*Showing which platforms were scanned and how much content was pulled from each.*
-
-### 📊 Update Sources
-• Newsletters processed: {len([u for u in real_updates if u['type'] == 'newsletter'])}
-• Hacker News posts reviewed: {len([u for u in real_updates if u['type'] == 'news'])}
-• GitHub repos reviewed: {len([u for u in real_updates if u['type'] == 'repo'])}
-
-⸻
-
-IMPORTANT: 
-- Replace ALL placeholders like [Title], [source name], etc. with actual data
-- Use EXACT URLs from the Signal Hunter - do NOT modify or create new URLs
-- Format links as clickable Markdown: [link text](url) 
-- Use bold for titles, bullet points for details
-- NO TABLES, only clean formatted text
-- EVERY signal MUST have its original link preserved exactly as provided""",
-    expected_output="Polished markdown strategy brief ready for publication",
-    agent=editor,
-    context=[task1, task2, task3]
-)
-
-# Create crew
-crew = Crew(
-    agents=[signal_hunter, relevance_scorer, action_generator, editor],
-    tasks=[task1, task2, task3, task4],
-    verbose=True
-)
+    # Render the brief locally from the structured task outputs
+    brief = build_brief_data(updates, signals, scores, actions, date=store.run_date if store is not None else None)
+    if not brief['signals']:
+        raise ValueError("Signal Hunter returned no parseable JSON signals")
+    return brief
+
+def write_fallback_brief(updates, path="strategy_brief_fallback.md", profile=None, date=None):
+    """Save a brief scored locally (no LLM calls, see fast_brief.py) when the LLM stages fail."""
+    brief = fast_brief.analyze_updates(updates, date=date, profile=profile)
+    brief['note'] = "Generated without LLMs because the agent stages failed: scores, summaries and actions are local heuristics."
+    save_brief(brief, path, os.path.splitext(path)[0] + ".json")
+    print(f"📄 Fallback brief saved to {path}")
+
+def main():
+    # Runs every stage with per-date checkpoints under runs/ (see brief_cli.py)
+    from brief_cli import main as cli_main
+    return cli_main(["run"])
 
 # Run the crew
 if __name__ == "__main__":
-    print("\nStarting AI Strategy Brief generation...")
-    print(f"Processing {len(real_updates)} real updates from today\n")
-    
-    try:
-        result = crew.kickoff()
-        
-        # Save the result
-        with open("strategy_brief.md", "w") as f:
-            f.write(str(result))
-        
-        print("\n✅ Strategy brief saved to strategy_brief.md")
-        
-        # Push to Notion
-        print("\n📤 Pushing to Notion...")
-        push_to_notion()
-        
-    except Exception as e:
-        print(f"\n❌ Error during crew execution: {e}")
-        print("Check your OpenRouter API key and internet connection")
-        
-        # Create a fallback brief with the raw data
-        fallback_brief = f"""# AI Strategy Brief
-🗓️ Date: {datetime.now().strftime('%Y-%m-%d')}
-
-## ⚠️ Note
-This brief was generated from raw data due to LLM processing issues.
-
-## 📊 Raw Updates Found Today
-Total updates: {len(real_updates)}
-
-{context_text}
-
----
-*Generated by AI Strategy Brief System*
-"""
-        
-        with open("strategy_brief_fallback.md", "w") as f:
-            f.write(fallback_brief)
-        
-        print("📄 Fallback brief saved to strategy_brief_fallback.md")
\ No newline at end of file
+    raise SystemExit(main())
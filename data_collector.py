@@ -1,29 +1,58 @@
-import feedparser
-import requests
-from bs4 import BeautifulSoup
 from datetime import datetime, timedelta
 from typing import List, Dict
 import json
-import time
-import random
-from ai_website_scraper import get_ai_website_updates
+import profiling
+import tracing
+from ai_website_scraper import ai_website_sources
+from collection import collect
+from collection_queue import CollectionQueue, collect_round
+from update_archive import UpdateArchive
+from github_stars import momentum, track_trending
+
+def collection_sources(until: datetime = None) -> List[tuple]:
+    """Every source the daily collection reads, as (kind, name, url, entry limit)."""
+    sources = [("newsletter", name, url, None) for name, url in NEWSLETTER_FEEDS]
+    sources.append(hn_source(until=until))
+    sources.append(("github", "GitHub", GITHUB_TRENDING_URL, None))
+    sources.extend(ai_website_sources())  # High-quality AI research blogs and news
+    return sources
 
 def get_real_ai_updates() -> List[Dict[str, str]]:
     """Gather daily real-time AI content from high-quality sources (last 30 days only)."""
-    all_updates = []
-    
     # Use high-quality AI sources with 30-day freshness guarantee
     print("🔍 Scanning high-quality AI sources (last 30 days only)...")
-    all_updates.extend(get_substack_updates())
-    all_updates.extend(get_hackernews_updates()) 
-    all_updates.extend(get_github_updates())
-    all_updates.extend(get_ai_website_updates())  # High-quality AI research blogs and news
+    return _finish_collection(collect(collection_sources()))
+
+def get_distributed_updates(round_id: str = None, local_workers: int = 0, fresh: bool = False,
+                            queue_path: str = None) -> List[Dict[str, str]]:
+    """Same as get_real_ai_updates, but the sources (plus every OPML-imported feed) are
+    collected by queue workers on any number of processes or hosts (see collection_queue.py)."""
+    round_id = round_id or datetime.now().strftime("%Y-%m-%d")
+    try:
+        day = datetime.strptime(round_id, "%Y-%m-%d")
+    except ValueError:
+        day = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+    # Pinned to the round's day so re-running the coordinator queues the same HN search, not a new one
+    sources = collection_sources(until=day) + CollectionQueue(queue_path).catalog()
+    return _finish_collection(collect_round(round_id, sources, queue_path, local_workers, fresh=fresh))
+
+def _finish_collection(all_updates: List[Dict]) -> List[Dict]:
+    all_updates = track_star_momentum(all_updates)
     
-    # Final date validation - ensure no content is older than 30 days
-    cutoff_date = datetime.now() - timedelta(days=30)
+    # Keep everything we saw, including items about to be filtered out, for historical search
+    with profiling.stage("archive"), tracing.span("archive", updates=len(all_updates)):
+        archive_updates(all_updates)
+    
+    filtered_updates = filter_recent(all_updates)
+    print(f"✅ Final result: {len(filtered_updates)} updates (filtered {len(all_updates) - len(filtered_updates)} old items)")
+    return filtered_updates
+
+def filter_recent(updates: List[Dict], days: int = 30) -> List[Dict]:
+    """Final date validation - ensure no content is older than `days` days."""
+    cutoff_date = datetime.now() - timedelta(days=days)
     filtered_updates = []
     
-    for update in all_updates:
+    for update in updates:
         try:
             # Parse the date from the update
             if 'date' in update and update['date']:
@@ -38,144 +67,75 @@ def get_real_ai_updates() -> List[Dict[str, str]]:
         except Exception as e:
             # If date parsing fails, include it anyway (better safe than sorry)
             filtered_updates.append(update)
-    
-    print(f"✅ Final result: {len(filtered_updates)} updates (filtered {len(all_updates) - len(filtered_updates)} old items)")
     return filtered_updates
 
-def get_substack_updates() -> List[Dict[str, str]]:
-    """Fetch AI newsletter updates from Substack RSS feeds."""
-    updates = []
-    feeds = [
-        ("Ben's Bites", "https://www.bensbites.co/rss"),
-        ("Latent Space", "https://latent.space/feed.xml"), 
-        ("Import AI", "https://jack-clark.net/index.xml"),
-        ("The Rundown AI", "https://www.therundown.ai/rss"),
-        ("AI Breakfast", "https://aibreakfast.beehiiv.com/feed")
-    ]
-    
-    cutoff_date = datetime.now() - timedelta(days=30)  # Last 30 days only
-    print(f"📅 Newsletter filtering: content newer than {cutoff_date.strftime('%Y-%m-%d')}")
-    
-    for newsletter_name, feed_url in feeds:
+def archive_updates(updates: List[Dict]) -> int:
+    """Upsert collected updates into the SQLite archive (data/updates.db)."""
+    try:
+        archive = UpdateArchive()
         try:
-            feed = feedparser.parse(feed_url)
-            for entry in feed.entries:
-                # Parse publication date
-                pub_date = datetime(*entry.published_parsed[:6])
-                
-                # Only include posts from the last 30 days
-                if pub_date >= cutoff_date:
-                    update = {
-                        "source": newsletter_name,
-                        "type": "newsletter",
-                        "title": entry.title,
-                        "summary": entry.get('summary', '')[:500],  # Limit summary length
-                        "link": entry.link,
-                        "date": pub_date.strftime("%Y-%m-%d")
-                    }
-                    updates.append(update)
-        except Exception as e:
-            print(f"Error fetching {newsletter_name}: {e}")
-    
-    return updates
+            written = archive.add_updates(updates)
+        finally:
+            archive.close()
+        print(f"🗄️ Archived {written} updates")
+        return written
+    except Exception as e:
+        # Archiving is best-effort; never lose a collection run over it
+        print(f"⚠️ Could not archive updates: {e}")
+        return 0
+
+def search_history(query: str = None, source: str = None, since: str = None, until: str = None,
+                   limit: int = 20) -> List[Dict]:
+    """Search every update ever collected, e.g. search_history("LangGraph", since="2026-09-01")."""
+    archive = UpdateArchive()
+    try:
+        return archive.search(query, source=source, since=since, until=until, limit=limit)
+    finally:
+        archive.close()
+
+NEWSLETTER_FEEDS = [
+    ("Ben's Bites", "https://www.bensbites.co/rss"),
+    ("Latent Space", "https://latent.space/feed.xml"), 
+    ("Import AI", "https://jack-clark.net/index.xml"),
+    ("The Rundown AI", "https://www.therundown.ai/rss"),
+    ("AI Breakfast", "https://aibreakfast.beehiiv.com/feed")
+]
+
+def get_substack_updates() -> List[Dict[str, str]]:
+    """Fetch AI newsletter updates from Substack RSS feeds (last 30 days only)."""
+    return filter_recent(collect([("newsletter", name, url, None) for name, url in NEWSLETTER_FEEDS]))
+
+HN_SEARCH_URL = "https://hn.algolia.com/api/v1/search_by_date"
+HN_QUERY = "AI OR machine learning OR LLM OR GPT OR CrewAI OR LangChain OR agent OR RAG"
+
+GITHUB_TRENDING_URL = "https://github.com/trending?since=daily&spoken_language_code=en"
+
+def hn_source(days: int = 30, until: datetime = None) -> tuple:
+    """The HN Algolia search for AI/ML stories from the `days` days before `until` (default: now)."""
+    cutoff_timestamp = int(((until or datetime.now()) - timedelta(days=days)).timestamp())
+    url = f"{HN_SEARCH_URL}?query={HN_QUERY}&tags=story&numericFilters=created_at_i>{cutoff_timestamp}"
+    return ("hn", "Hacker News", url, None)
 
 def get_hackernews_updates() -> List[Dict[str, str]]:
     """Fetch AI-related posts from Hacker News."""
-    updates = []
-    
-    try:
-        # Get AI/ML posts from the last 30 days with better keywords
-        cutoff_timestamp = int((datetime.now() - timedelta(days=30)).timestamp())
-        print(f"📅 Hacker News filtering: posts newer than {datetime.fromtimestamp(cutoff_timestamp).strftime('%Y-%m-%d')}")
-        url = f"https://hn.algolia.com/api/v1/search_by_date?query=AI OR machine learning OR LLM OR GPT OR CrewAI OR LangChain OR agent OR RAG&tags=story&numericFilters=created_at_i>{cutoff_timestamp}"
-        
-        response = requests.get(url)
-        data = response.json()
-        
-        for hit in data.get('hits', []):
-            # Parse the creation date
-            created_at = datetime.fromisoformat(hit['created_at'].replace('Z', '+00:00'))
-            
-            update = {
-                "source": "Hacker News",
-                "type": "news",
-                "title": hit['title'],
-                "points": hit.get('points', 0),
-                "link": hit.get('url', f"https://news.ycombinator.com/item?id={hit['objectID']}"),
-                "date": created_at.strftime("%Y-%m-%d")
-            }
-            updates.append(update)
-    except Exception as e:
-        print(f"Error fetching Hacker News: {e}")
-    
-    return updates
+    return collect([hn_source()])
 
 def get_github_updates() -> List[Dict[str, str]]:
     """Scrape trending AI projects from GitHub (inherently recent - daily trending)."""
-    updates = []
     print("📅 GitHub trending: fetching today's trending AI repos")
-    ai_keywords = ['ai', 'llm', 'rag', 'agent', 'gpt', 'neural', 'machine learning', 'deep learning', 
-                   'crewai', 'langchain', 'openai', 'anthropic', 'claude', 'transformer', 'vector', 'embedding']
-    
+    return track_star_momentum(collect([("github", "GitHub", GITHUB_TRENDING_URL, None)]))
+
+def track_star_momentum(updates: List[Dict]) -> List[Dict]:
+    """Snapshot the trending repos and order them by star momentum (best-effort)."""
+    repos = [update for update in updates if update.get("type") == "repo"]
     try:
-        url = "https://github.com/trending?since=daily&spoken_language_code=en"
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-        }
-        response = requests.get(url, headers=headers)
-        soup = BeautifulSoup(response.text, 'html.parser')
-        
-        # Find all repository articles
-        repos = soup.find_all('article', class_='Box-row')
-        
-        for repo in repos:
-            try:
-                # Extract repository information
-                h2 = repo.find('h2', class_='h3')
-                if not h2:
-                    continue
-                    
-                repo_link = h2.find('a')
-                if not repo_link:
-                    continue
-                    
-                repo_name = repo_link.get('href', '').strip('/')
-                repo_url = f"https://github.com/{repo_name}"
-                
-                # Get description
-                desc_p = repo.find('p', class_='col-9')
-                description = desc_p.text.strip() if desc_p else ""
-                
-                # Check if it's AI-related
-                desc_lower = description.lower()
-                if any(keyword in desc_lower for keyword in ai_keywords):
-                    # Get stars count
-                    stars_span = repo.find('span', class_='d-inline-block float-sm-right')
-                    stars = 0
-                    if stars_span:
-                        stars_text = stars_span.text.strip().replace(',', '')
-                        try:
-                            stars = int(stars_text.split()[0])
-                        except:
-                            stars = 0
-                    
-                    update = {
-                        "source": "GitHub",
-                        "type": "repo",
-                        "name": repo_name,
-                        "description": description,
-                        "stars": stars,
-                        "link": repo_url,
-                        "date": datetime.now().strftime("%Y-%m-%d")
-                    }
-                    updates.append(update)
-            except Exception as e:
-                print(f"Error parsing repo: {e}")
-                continue
+        track_trending(repos)
     except Exception as e:
-        print(f"Error fetching GitHub trending: {e}")
-    
-    return updates
+        print(f"⚠️ Could not record GitHub star snapshots: {e}")
+        return updates
+    # Repos keep their place in the collection, reordered among themselves
+    ranked = iter(sorted(repos, key=momentum, reverse=True))
+    return [next(ranked) if update.get("type") == "repo" else update for update in updates]
 
 
 if __name__ == "__main__":
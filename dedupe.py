@@ -0,0 +1,46 @@
+import re
+from typing import List, Dict
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+
+# Query parameters that only track where a click came from: any utm_* parameter,
+# and these names exactly (so reference=, refresh= or sourceid= are kept)
+TRACKING_PREFIXES = ('utm_',)
+TRACKING_PARAMS = frozenset({'ref', 'ref_src', 'source', 'fbclid', 'gclid', 'mc_cid', 'mc_eid'})
+
+def _is_tracking(param: str) -> bool:
+    param = param.lower()
+    return param in TRACKING_PARAMS or param.startswith(TRACKING_PREFIXES)
+
+def canonical_url(url: str) -> str:
+    """Normalize a link so the same article from different sources compares equal."""
+    if not url:
+        return ""
+    parts = urlsplit(url.strip())
+    host = parts.netloc.lower()
+    if host.startswith("www."):
+        host = host[4:]
+    query = [(k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True)
+             if not _is_tracking(k)]
+    path = parts.path.rstrip("/") or "/"
+    return urlunsplit(("https" if parts.scheme in ("http", "https") else parts.scheme,
+                       host, path, urlencode(sorted(query)), ""))
+
+def title_key(update: Dict) -> str:
+    title = update.get('title') or update.get('name') or ""
+    return re.sub(r'\W+', ' ', title.lower()).strip()
+
+def dedupe_updates(updates: List[Dict]) -> List[Dict]:
+    """Drop repeats of the same link or the same title, keeping the first occurrence."""
+    seen_links, seen_titles = set(), set()
+    unique = []
+    for update in updates:
+        link_key = canonical_url(update.get('link', ''))
+        title = title_key(update)
+        if (link_key and link_key in seen_links) or (title and title in seen_titles):
+            continue
+        if link_key:
+            seen_links.add(link_key)
+        if title:
+            seen_titles.add(title)
+        unique.append(update)
+    return unique
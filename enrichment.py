@@ -0,0 +1,150 @@
+import os
+import re
+import json
+import time
+import hashlib
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait
+from typing import Dict, List, Optional
+from urllib.parse import urlsplit
+
+import tracing
+from dedupe import canonical_url
+from http_client import fetch_capped
+
+# Linked-article enrichment for the shortlist. Feed summaries are a sentence or
+# two and HN items have none, so before the agents run each shortlisted link is
+# fetched (a bounded thread pool, per-host limits from http_client), its main
+# text is extracted — or the README, for GitHub repositories — and the result
+# is attached to the update as `content`. Bodies are streamed and cut at
+# MAX_BYTES, non-HTML responses are skipped, and the whole stage gives up on
+# stragglers after BUDGET_SECONDS, so a slow site only costs that item its
+# enrichment. Extracted text is cached on disk by canonical-URL hash.
+
+CACHE_DIR = os.getenv("ENRICH_CACHE_DIR", "data/cache/pages")
+CACHE_TTL = 7 * 24 * 3600
+FAILURE_TTL = 6 * 3600     # failed fetches are retried after this long
+MAX_BYTES = 1_000_000
+MAX_TEXT_CHARS = 4000      # extracted text kept per item
+WORKERS = 8
+TIMEOUT = 10
+BUDGET_SECONDS = 45
+HTML_TYPES = ("text/html", "application/xhtml+xml", "text/plain")
+README_TYPES = ("application/vnd.github.raw", "text/plain", "application/octet-stream")
+
+_GITHUB_REPO = re.compile(r"^/([\w.-]+)/([\w.-]+)/?$")
+_NOISE_TAGS = ("script", "style", "noscript", "nav", "header", "footer", "aside", "form", "svg", "iframe")
+
+def _path(key: str) -> str:
+    return os.path.join(CACHE_DIR, key[:2], f"{key}.json")
+
+def cache_key(url: str) -> str:
+    return hashlib.sha256(canonical_url(url).encode("utf-8")).hexdigest()
+
+def cached(url: str) -> Optional[Dict]:
+    """The cached extraction for a URL, if it's still fresh."""
+    try:
+        with open(_path(cache_key(url)), "r", encoding="utf-8") as f:
+            entry = json.load(f)
+    except (OSError, ValueError):
+        return None
+    ttl = CACHE_TTL if entry.get("text") else FAILURE_TTL
+    return entry if time.time() - entry["fetched_at"] <= ttl else None
+
+def store(url: str, entry: Dict):
+    """Cache an extraction; a failed write (disk full, permissions) only costs the cache entry."""
+    path = _path(cache_key(url))
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"  # Profile threads may enrich the same URL
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(entry, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+    except OSError as e:
+        print(f"⚠️ Could not cache {url}: {e}")
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+
+def github_repo(url: str) -> Optional[str]:
+    """'owner/repo' for a GitHub repository URL, else None."""
+    parts = urlsplit(url)
+    if parts.netloc.lower() not in ("github.com", "www.github.com"):
+        return None
+    match = _GITHUB_REPO.match(parts.path)
+    return f"{match.group(1)}/{match.group(2)}" if match else None
+
+def extract_main_text(html: str) -> str:
+    """Readable body text of a page: the <article>/<main> element, or the densest block of paragraphs."""
+    from bs4 import BeautifulSoup
+
+    soup = BeautifulSoup(html, "html.parser")
+    for tag in soup(_NOISE_TAGS):
+        tag.decompose()
+    root = soup.find("article") or soup.find("main") or soup.find(attrs={"role": "main"})
+    if root is None:
+        # The element whose direct <p> children hold the most text
+        parents, sizes = {}, {}
+        for p in soup.find_all("p"):
+            parents[id(p.parent)] = p.parent
+            sizes[id(p.parent)] = sizes.get(id(p.parent), 0) + len(p.get_text())
+        root = parents[max(sizes, key=sizes.get)] if sizes else (soup.body or soup)
+    blocks = [el.get_text(" ", strip=True) for el in root.find_all(("h1", "h2", "h3", "p", "li", "pre"))]
+    text = "\n".join(block for block in blocks if block) or root.get_text(" ", strip=True)
+    return re.sub(r"[ \t]+", " ", text).strip()
+
+def fetch_readme(repo: str) -> str:
+    headers = {"Accept": "application/vnd.github.raw"}
+    if os.getenv("GITHUB_TOKEN"):
+        headers["Authorization"] = f"Bearer {os.getenv('GITHUB_TOKEN')}"
+    result = fetch_capped(f"https://api.github.com/repos/{repo}/readme", MAX_BYTES, README_TYPES,
+                          headers=headers, timeout=TIMEOUT)
+    return result.text
+
+def extract(url: str) -> Dict:
+    """Fetch a link and extract its text (the README for GitHub repos); cached by canonical URL."""
+    entry = cached(url)
+    if entry is not None:
+        return entry
+    repo = github_repo(url)
+    try:
+        if repo:
+            text, kind = fetch_readme(repo), "readme"
+        else:
+            result = fetch_capped(url, MAX_BYTES, HTML_TYPES, timeout=TIMEOUT)
+            is_html = "html" in result.headers.get("Content-Type", "")
+            text, kind = (extract_main_text(result.text) if is_html else result.text), "article"
+        entry = {"url": url, "kind": kind, "text": text[:MAX_TEXT_CHARS].strip(), "fetched_at": time.time()}
+    except Exception as e:
+        entry = {"url": url, "kind": "error", "text": "", "error": str(e)[:300], "fetched_at": time.time()}
+    store(url, entry)
+    return entry
+
+def enrich_updates(updates: List[Dict], workers: int = WORKERS, budget: float = BUDGET_SECONDS) -> List[Dict]:
+    """Copies of the updates with `content` (extracted page or README text) where it could be fetched."""
+    links = sorted({update["link"] for update in updates if str(update.get("link", "")).startswith("http")})
+    start = time.perf_counter()
+    pool = ThreadPoolExecutor(max_workers=workers)
+    futures = {pool.submit(tracing.propagate(extract), link): link for link in links}
+    done, pending = wait(futures, timeout=budget)
+    pool.shutdown(wait=False, cancel_futures=True)
+
+    texts = {}
+    for future in done:
+        try:
+            entry = future.result()
+        except Exception as e:
+            print(f"⚠️ Could not enrich {futures[future]}: {e}")
+            continue
+        if entry.get("text"):
+            texts[futures[future]] = entry["text"]
+    enriched = []
+    for update in updates:
+        update = dict(update)
+        if update.get("link") in texts:
+            update["content"] = texts[update["link"]]
+        enriched.append(update)
+    print(f"📰 Enriched {len(texts)}/{len(links)} links in {time.perf_counter() - start:.1f}s"
+          + (f" ({len(pending)} skipped after the {budget:.0f}s budget)" if pending else ""))
+    return enriched
@@ -0,0 +1,226 @@
+import re
+from typing import Dict, List, Optional, Tuple
+
+from brief_renderer import build_brief_data
+from github_stars import momentum
+from profiles import agent_setting, score_update
+
+# Zero-LLM brief: the three agent stages done locally and deterministically, so
+# a complete brief (same structure as crew_strategy_brief.analyze_updates, ready
+# for render_markdown, Notion and the publish outbox) takes milliseconds. Used
+# as the fallback when the LLM stages fail and as a cheap preview
+# (`brief_cli.py preview`, the daemon's GET /preview).
+#
+# Signal Hunter + Relevance Scorer: each update gets the highest level of the
+# builder rubric (crew_strategy_brief.BUILDER_RUBRIC) whose keywords it matches,
+# plus small feature bonuses for code, tutorials and momentum. Profiles with
+# their own rubric and keywords are scored with their keyword weights instead,
+# and their rubric lines supply the explanations. Summaries are the most informative
+# sentences of the collected text; actions come from templates.
+
+# Builder rubric levels, best first: (score, what it is, keywords)
+RUBRIC_LEVELS = (
+    (10, "CrewAI multi-agent template to customize", ("crewai", "crew ai", "multi-agent", "multi agent", "multiagent")),
+    (9, "LangChain agent with tools/memory to fork", ("langchain", "langgraph", "tool calling", "tool use",
+                                                     "function calling", "agent memory")),
+    (8, "RAG system with a vector DB to deploy", ("rag", "retrieval", "vector database", "vector db", "vector store",
+                                                 "embeddings", "pgvector", "chroma", "qdrant", "pinecone", "weaviate")),
+    (7, "agent coordination pattern to implement", ("agent", "agents", "agentic", "orchestration", "orchestrator",
+                                                   "autogen", "swarm", "planner")),
+    (6, "Claude API integration to try", ("claude", "anthropic", "mcp", "model context protocol")),
+    (5, "useful utility for agent development", ("sdk", "cli", "library", "framework", "toolkit", "evals",
+                                                "prompting", "structured output")),
+    (4, "interesting architecture to study", ("architecture", "paper", "benchmark", "research", "arxiv")),
+    (3, "general AI tool", ("ai", "llm", "llms", "gpt", "model", "models", "machine learning")),
+)
+NO_LEVEL = (1, "no practical building opportunity")
+
+# Tags the Relevance Scorer may use, and the words that earn them
+TAG_KEYWORDS = {
+    "crewai": ("crewai", "crew ai"),
+    "langchain": ("langchain", "langgraph"),
+    "rag": ("rag", "retrieval", "vector", "embeddings"),
+    "agents": ("agent", "agents", "agentic", "multi-agent", "autogen"),
+    "memory": ("memory",),
+    "tools": ("tool", "tools", "tool use", "function calling", "mcp"),
+    "claude": ("claude", "anthropic")
+}
+
+# Feature bonuses on top of the rubric level
+CODE_BONUS = 1.0
+TUTORIAL_BONUS = 0.5
+HN_POINTS_BONUS = ((300, 1.0), (100, 0.5))
+TUTORIAL_WORDS = ("tutorial", "guide", "how to", "step-by-step", "walkthrough", "example", "examples", "quickstart")
+NO_CODE_PENALTY = 1.0  # "If it doesn't have code, it's not worth selecting"
+
+# Characters of collected text read per update (enough for a README's opening)
+TEXT_CHARS = 4000
+SUMMARY_CHARS = 220
+
+# Keywords are found with one tokenizing pass: single words by set intersection
+# and phrases by looking up the token n-grams, so "how to" never matches inside
+# "show total" and levels and tags are set lookups (much faster than one regex
+# per level)
+_ALL_KEYWORDS = ({word for _, _, words in RUBRIC_LEVELS for word in words}
+                 | {word for words in TAG_KEYWORDS.values() for word in words} | set(TUTORIAL_WORDS))
+_WORD = re.compile(r"[a-z0-9]+")
+_SINGLE_WORDS = frozenset(word for word in _ALL_KEYWORDS if _WORD.fullmatch(word))
+_PHRASES: Dict[Tuple[str, ...], List[str]] = {}  # tokens -> phrases ("multi-agent" and "multi agent" share them)
+for _phrase in sorted(_ALL_KEYWORDS - _SINGLE_WORDS):
+    _PHRASES.setdefault(tuple(_WORD.findall(_phrase)), []).append(_phrase)
+_PHRASE_LENGTHS = sorted({len(tokens) for tokens in _PHRASES})
+_PHRASE_STARTS = frozenset(tokens[0] for tokens in _PHRASES)
+_TUTORIAL_WORDS = frozenset(TUTORIAL_WORDS)
+_SENTENCE_END = re.compile(r"(?<=[.!?])\s+")
+_RUBRIC_LINE = re.compile(r"^\s*(\d+)(?:\s*-\s*(\d+))?\s*:\s*(.+?)\s*$", re.MULTILINE)
+
+def _keywords(text: str) -> set:
+    """The rubric, tag and tutorial keywords in a lowercased text."""
+    tokens = _WORD.findall(text)
+    found = set(tokens).intersection(_SINGLE_WORDS)
+    for i, token in enumerate(tokens):
+        if token in _PHRASE_STARTS:
+            for n in _PHRASE_LENGTHS:
+                phrases = _PHRASES.get(tuple(tokens[i:i + n]))
+                if phrases:
+                    found.update(phrases)
+    return found
+
+def _level(found: set) -> Tuple[int, str]:
+    for level, label, words in RUBRIC_LEVELS:
+        if not found.isdisjoint(words):
+            return level, label
+    return NO_LEVEL
+
+def _tags(found: set) -> List[str]:
+    return [tag for tag, words in TAG_KEYWORDS.items() if not found.isdisjoint(words)]
+
+def _title(update: Dict) -> str:
+    return update.get("title") or update.get("name") or "Untitled"
+
+def _body(update: Dict) -> str:
+    return " ".join(str(update.get(field) or "") for field in ("summary", "description", "content"))[:TEXT_CHARS]
+
+def has_code(update: Dict, text: Optional[str] = None) -> bool:
+    """A repo, or a page that links to or talks about its code."""
+    if update.get("type") == "repo" or "github.com" in (update.get("link") or ""):
+        return True
+    text = text if text is not None else f"{_title(update)} {_body(update)}".lower()
+    return "github.com" in text or "pip install" in text or "open source" in text or "open-source" in text
+
+def parse_rubric(rubric: str) -> Dict[int, str]:
+    """A rubric's "N: description" / "N-M: description" lines as {score: description}."""
+    levels = {}
+    for match in _RUBRIC_LINE.finditer(rubric):
+        low, high, description = int(match.group(1)), int(match.group(2) or match.group(1)), match.group(3)
+        for score in range(min(low, high), max(low, high) + 1):
+            levels[score] = description
+    return levels
+
+def _rubric_label(levels: Dict[int, str], score: int) -> str:
+    """The description of the rubric line at or just below `score`."""
+    for candidate in range(score, 0, -1):
+        if candidate in levels:
+            return levels[candidate]
+    return NO_LEVEL[1]
+
+def score(update: Dict, profile: Optional[Dict] = None) -> Tuple[float, int, str, List[str]]:
+    """(ranking score, 1-10 rubric score, rubric description, tags) for one update."""
+    text = f"{_title(update)} {_body(update)}".lower()
+    found = _keywords(text)
+    code = has_code(update, text)
+
+    rubric = agent_setting(profile, "Relevance Scorer", "rubric", None)
+    if rubric and profile.get("keywords"):
+        # A profile's own rubric is free text: place updates on it by keyword weight
+        level, label = 2 + score_update(update, profile.get("keywords", {})), None
+    else:
+        level, label = _level(found)
+        level += momentum(update)
+        if not code and level > 3:
+            level -= NO_CODE_PENALTY
+
+    bonus = CODE_BONUS if code else 0.0
+    if not found.isdisjoint(_TUTORIAL_WORDS):
+        bonus += TUTORIAL_BONUS
+    points = update.get("points") or 0
+    bonus += next((value for threshold, value in HN_POINTS_BONUS if points >= threshold), 0.0)
+
+    ranking = level + bonus
+    rubric_score = max(1, min(10, round(ranking)))
+    if label is None:
+        label = _rubric_label(parse_rubric(rubric), rubric_score)
+    return ranking, rubric_score, label, _tags(found)
+
+def summarize(update: Dict, max_chars: int = SUMMARY_CHARS) -> str:
+    """Extractive summary: the collected text's sentence with the most rubric keywords (earliest on ties)."""
+    sentences = [s.strip() for s in _SENTENCE_END.split(_body(update).replace("\n", " ")) if len(s.strip()) >= 30]
+    if not sentences:
+        return _title(update)
+    _, best = min(enumerate(sentences[:8]), key=lambda item: (-len(_keywords(item[1].lower())), item[0]))
+    if len(best) > max_chars:
+        best = best[:max_chars].rsplit(" ", 1)[0].rstrip(",;:") + "..."
+    return best
+
+def _time_estimate(update: Dict) -> str:
+    return "45 minutes" if update.get("type") == "repo" else "60 minutes"
+
+def _action(index: int, update: Dict, update_tags: List[str]) -> Dict:
+    """A templated build project for one selected update."""
+    title, link = _title(update), update.get("link", "")
+    if "rag" in update_tags:
+        project = f"Build a RAG index over your own notes with {title}"
+        customize = "Point the ingestion step at a folder of your Markdown notes and ask it three real questions"
+    elif "langchain" in update_tags:
+        project = f"Build a LangChain agent with one custom tool using {title}"
+        customize = "Wrap a script you run daily as a tool, add conversation memory and ask the agent to use it"
+    elif "crewai" in update_tags or "agents" in update_tags:
+        project = f"Build a two-agent crew on top of {title}"
+        customize = "Give one agent a research role and one a writing role, then have them summarize today's brief"
+    elif "tools" in update_tags or "claude" in update_tags:
+        project = f"Build a Claude tool integration with {title}"
+        customize = "Expose one script you run daily as a tool and call it from a short agent loop"
+    else:
+        project = f"Build a working prototype from {title}"
+        customize = "Replace the example input with data from your own workflow"
+    if update.get("type") == "repo" or "github.com" in link:
+        setup = [f"git clone {link}", "pip install -r requirements.txt (or follow the README quickstart)"]
+    else:
+        setup = [f"Open {link} and copy the smallest runnable example", "pip install the packages it imports"]
+    return {
+        "index": index,
+        "title": project,
+        "description": f"{summarize(update)} Turn it into something you will run again.",
+        "steps": setup + [customize, "Run it end to end and commit the result"],
+        "time_estimate": _time_estimate(update),
+        "expected_outcome": f"A working {'/'.join(update_tags[:2]) or 'AI'} project based on {title} that you can extend tomorrow"
+    }
+
+def analyze_updates(updates: List[Dict], date: Optional[str] = None, profile: Optional[Dict] = None,
+                    signals: int = 5, actions: int = 2) -> Dict:
+    """The structured brief for `updates` without any LLM call (see build_brief_data).
+
+    Scores every update, so it can rank a whole collection rather than a shortlist.
+    """
+    scored = [(*score(update, profile), index) for index, update in enumerate(updates, 1)]
+    scored.sort(key=lambda item: (-item[0], item[4]))
+
+    brief_signals, brief_scores, brief_actions, titles = [], [], [], set()
+    for _, rubric_score, label, update_tags, index in scored:
+        if len(brief_signals) == signals:
+            break
+        update = updates[index - 1]
+        if _title(update).lower() in titles:
+            continue  # The same item under another link (the daemon's pool is keyed by link)
+        titles.add(_title(update).lower())
+        brief_signals.append({"index": index, "title": _title(update), "source": update.get("source", "Unknown"),
+                              "why_matters": summarize(update), "has_code": has_code(update)})
+        brief_scores.append({"index": index, "score": rubric_score, "tags": update_tags,
+                             "explanation": f"Scored locally as {label.rstrip('.')}",
+                             "time_estimate": _time_estimate(update)})
+        if len(brief_actions) < actions:
+            brief_actions.append(_action(index, update, update_tags))
+
+    brief = build_brief_data(updates, brief_signals, brief_scores, brief_actions, date=date)
+    brief["mode"] = "fast"
+    return brief
@@ -0,0 +1,287 @@
+import os
+import json
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from datetime import datetime
+from multiprocessing import get_context
+from typing import Dict, List, Optional, Tuple
+
+import feedparser
+from bs4 import BeautifulSoup
+
+from parse_memo import ParseMemo
+
+# Pure parse functions for the collection pipeline: raw response bytes in,
+# compact update records out, with no network access or shared state. That lets
+# collection.py fetch every source concurrently on threads and then hand all the
+# bodies to a process pool in one batch, so feedparser, BeautifulSoup and the
+# GitHub HTML parsing use every core instead of queueing behind the GIL.
+#
+# A parse job is a tuple (kind, source name, url, entry limit, body). Results
+# are memoized by body hash (parse_memo.py), so an unchanged body is never
+# parsed twice: bump PARSER_VERSION whenever a parser's output changes.
+
+PARSER_VERSION = 1
+PARSE_PROCESSES = int(os.getenv("PARSE_PROCESSES", "0")) or os.cpu_count() or 1
+INLINE_BELOW = 8   # smaller batches parse in-process; a pool isn't worth the hand-off
+
+# Filter for AI/ML relevant content
+AI_KEYWORDS = ['ai', 'artificial intelligence', 'machine learning', 'deep learning',
+               'neural network', 'llm', 'gpt', 'transformer', 'agent', 'rag',
+               'generative', 'chatgpt', 'claude', 'model', 'algorithm']
+RESEARCH_KEYWORDS = ['ai', 'machine learning', 'deep learning', 'neural', 'llm', 'gpt', 'agent']
+GITHUB_KEYWORDS = ['ai', 'llm', 'rag', 'agent', 'gpt', 'neural', 'machine learning', 'deep learning',
+                   'crewai', 'langchain', 'openai', 'anthropic', 'claude', 'transformer', 'vector', 'embedding']
+
+# --- Entry converters ---------------------------------------------------------------
+
+def is_ai_related(text: str, keywords=AI_KEYWORDS) -> bool:
+    """Whether lowercased text mentions any of the keywords (substring match, so 'ai' also hits 'maintain')."""
+    return any(keyword in text for keyword in keywords)
+
+def entry_date(entry) -> datetime:
+    """Publication date of a feed entry (now, if the feed gives none)."""
+    if hasattr(entry, 'published_parsed') and entry.published_parsed:
+        return datetime(*entry.published_parsed[:6])
+    if hasattr(entry, 'updated_parsed') and entry.updated_parsed:
+        return datetime(*entry.updated_parsed[:6])
+    return datetime.now()  # Default to now if no date
+
+def rss_entry_to_update(entry, source_name: str, feed_url: str):
+    """Convert a blog feed entry into an update, or None if it isn't about AI/ML."""
+    # Clean and extract content
+    title = entry.title if hasattr(entry, 'title') else "No title"
+    summary = ""
+    if hasattr(entry, 'summary'):
+        summary = BeautifulSoup(entry.summary, 'html.parser').get_text()[:300]
+    elif hasattr(entry, 'description'):
+        summary = BeautifulSoup(entry.description, 'html.parser').get_text()[:300]
+
+    link = entry.link if hasattr(entry, 'link') else feed_url
+
+    if not is_ai_related(f"{title} {summary}".lower()):
+        return None
+    return {
+        "source": source_name,
+        "type": "ai_blog",
+        "title": title,
+        "summary": summary,
+        "link": link,
+        "date": entry_date(entry).strftime("%Y-%m-%d"),
+        "content_type": "research_blog"
+    }
+
+def research_entry_to_update(entry, source_name: str, feed_url: str):
+    """Convert a research-site feed entry into an update, or None if it isn't about AI."""
+    title = getattr(entry, 'title', 'No title')
+    summary = ""
+    if hasattr(entry, 'summary'):
+        summary = BeautifulSoup(entry.summary, 'html.parser').get_text()[:200]
+
+    # Filter for AI content
+    if not is_ai_related(f"{title} {summary}".lower(), RESEARCH_KEYWORDS):
+        return None
+    return {
+        "source": source_name,
+        "type": "ai_research",
+        "title": title,
+        "summary": summary,
+        "link": getattr(entry, 'link', feed_url),
+        "date": datetime.now().strftime("%Y-%m-%d"),
+        "content_type": "research_article"
+    }
+
+def newsletter_entry_to_update(entry, newsletter_name: str, feed_url: str = None) -> Dict:
+    """Convert a newsletter feed entry into an update."""
+    pub_date = datetime(*entry.published_parsed[:6])
+    return {
+        "source": newsletter_name,
+        "type": "newsletter",
+        "title": entry.title,
+        "summary": entry.get('summary', '')[:500],  # Limit summary length
+        "link": entry.link,
+        "date": pub_date.strftime("%Y-%m-%d")
+    }
+
+def feed_entry_to_stub(entry, source_name: str, feed_url: str) -> Dict:
+    """Link and date of any feed entry, AI-related or not."""
+    return {"link": getattr(entry, 'link', feed_url), "date": entry_date(entry).strftime("%Y-%m-%d")}
+
+def hn_hit_to_update(hit: Dict) -> Dict:
+    """Convert an HN Algolia search hit into an update."""
+    # Parse the creation date
+    created_at = datetime.fromisoformat(hit['created_at'].replace('Z', '+00:00'))
+    return {
+        "source": "Hacker News",
+        "type": "news",
+        "title": hit['title'],
+        "points": hit.get('points', 0),
+        "link": hit.get('url') or f"https://news.ycombinator.com/item?id={hit['objectID']}",
+        "date": created_at.strftime("%Y-%m-%d")
+    }
+
+# --- Body parsers -------------------------------------------------------------------
+
+def _parse_feed(convert, body: bytes, source: str, url: str, limit: Optional[int]) -> List[Dict]:
+    feed = feedparser.parse(body, response_headers={"content-location": url})
+    updates = []
+    for entry in feed.entries[:limit]:
+        try:
+            update = convert(entry, source, url)
+        except Exception:
+            continue  # One malformed entry shouldn't cost the rest of the feed
+        if update:
+            updates.append(update)
+    return updates
+
+def parse_newsletter(body: bytes, source: str, url: str, limit: Optional[int] = None) -> List[Dict]:
+    return _parse_feed(newsletter_entry_to_update, body, source, url, limit)
+
+def parse_ai_blog(body: bytes, source: str, url: str, limit: Optional[int] = 3) -> List[Dict]:
+    return _parse_feed(rss_entry_to_update, body, source, url, limit)
+
+def parse_research(body: bytes, source: str, url: str, limit: Optional[int] = 2) -> List[Dict]:
+    return _parse_feed(research_entry_to_update, body, source, url, limit)
+
+def parse_feed_entries(body: bytes, source: str, url: str, limit: Optional[int] = None) -> List[Dict]:
+    """Every entry of a feed page, unfiltered, for paging through archives."""
+    return _parse_feed(feed_entry_to_stub, body, source, url, limit)
+
+def parse_hn(body: bytes, source: str, url: str, limit: Optional[int] = None) -> List[Dict]:
+    return [hn_hit_to_update(hit) for hit in json.loads(body).get('hits', [])[:limit] if hit.get('title')]
+
+def parse_github_trending(body: bytes, source: str, url: str, limit: Optional[int] = None) -> List[Dict]:
+    """AI-related repos from the GitHub trending page."""
+    updates = []
+    soup = BeautifulSoup(body, 'html.parser')
+
+    # Find all repository articles
+    for repo in soup.find_all('article', class_='Box-row')[:limit]:
+        try:
+            # Extract repository information
+            h2 = repo.find('h2', class_='h3')
+            repo_link = h2.find('a') if h2 else None
+            if not repo_link:
+                continue
+            repo_name = repo_link.get('href', '').strip('/')
+
+            # Get description
+            desc_p = repo.find('p', class_='col-9')
+            description = desc_p.text.strip() if desc_p else ""
+
+            # Check if it's AI-related
+            if not is_ai_related(description.lower(), GITHUB_KEYWORDS):
+                continue
+
+            # Get stars count
+            stars_span = repo.find('span', class_='d-inline-block float-sm-right')
+            stars = 0
+            if stars_span:
+                try:
+                    stars = int(stars_span.text.strip().replace(',', '').split()[0])
+                except (ValueError, IndexError):
+                    stars = 0
+
+            update = {
+                "source": "GitHub",
+                "type": "repo",
+                "name": repo_name,
+                "description": description,
+                "stars": stars,
+                "link": f"https://github.com/{repo_name}",
+                "date": datetime.now().strftime("%Y-%m-%d")
+            }
+
+            # Total stars, for velocity between snapshots
+            stargazers = repo.find('a', href=f"/{repo_name}/stargazers")
+            if stargazers:
+                try:
+                    update["total_stars"] = int(stargazers.text.strip().replace(',', ''))
+                except ValueError:
+                    pass
+            updates.append(update)
+        except Exception as e:
+            print(f"Error parsing repo: {e}")
+    return updates
+
+PARSERS = {
+    "newsletter": parse_newsletter,
+    "ai_blog": parse_ai_blog,
+    "ai_research": parse_research,
+    "hn": parse_hn,
+    "github": parse_github_trending,
+    "feed_entries": parse_feed_entries
+}
+
+def parse_job(job: Tuple) -> Tuple[List[Dict], Optional[str]]:
+    """Run one parse job; returns (updates, error message or None)."""
+    kind, source, url, limit, body = job
+    try:
+        return PARSERS[kind](body, source, url, limit), None
+    except Exception as e:
+        return [], f"{type(e).__name__}: {e}"
+
+# --- Process pool ---------------------------------------------------------------------
+
+_pools: Dict[int, ProcessPoolExecutor] = {}  # by worker count
+_pool_lock = threading.Lock()
+memo = ParseMemo(PARSER_VERSION)
+
+def _get_pool(processes: int = PARSE_PROCESSES) -> ProcessPoolExecutor:
+    with _pool_lock:
+        if processes not in _pools:
+            # spawn, not fork: the daemon and the fetch stage have live threads
+            _pools[processes] = ProcessPoolExecutor(max_workers=processes, mp_context=get_context("spawn"))
+        return _pools[processes]
+
+def shutdown_pool():
+    with _pool_lock:
+        pools = list(_pools.values())
+        _pools.clear()
+    for pool in pools:
+        pool.shutdown()
+
+def _parse_batch(jobs: List[Tuple], processes: int) -> List[Tuple[List[Dict], Optional[str]]]:
+    if processes <= 1 or len(jobs) < INLINE_BELOW:
+        return [parse_job(job) for job in jobs]
+    # A few chunks per worker: bodies cross the process boundary in bulk but stay balanced
+    chunksize = max(1, len(jobs) // (processes * 4))
+    try:
+        return list(_get_pool(processes).map(parse_job, jobs, chunksize=chunksize))
+    except BrokenProcessPool:
+        shutdown_pool()
+        return [parse_job(job) for job in jobs]
+
+def parse_all(jobs: List[Tuple], processes: Optional[int] = None) -> List[Tuple[List[Dict], Optional[str]]]:
+    """Parse a batch of jobs, in the process pool when the batch is big enough; results keep job order.
+
+    Bodies seen before are answered from the memo; only the rest are parsed.
+    """
+    keys = [memo.key(job) for job in jobs]
+    results = [(cached, None) if cached is not None else None for cached in map(memo.get, keys)]
+    misses = [i for i, result in enumerate(results) if result is None]
+    parsed = _parse_batch([jobs[i] for i in misses], processes or PARSE_PROCESSES)
+    for i, (records, error) in zip(misses, parsed):
+        if error is None:
+            memo.put(keys[i], records)
+        results[i] = (records, error)
+    return results
+
+def parse_one(job: Tuple) -> Tuple[List[Dict], Optional[str]]:
+    """Parse one job in the pool, for callers (like backfill's fetch threads) that need each result as it comes."""
+    key = memo.key(job)
+    cached = memo.get(key)
+    if cached is not None:
+        return cached, None
+    if PARSE_PROCESSES <= 1:
+        records, error = parse_job(job)
+    else:
+        try:
+            records, error = _get_pool().submit(parse_job, job).result()
+        except BrokenProcessPool:
+            shutdown_pool()
+            records, error = parse_job(job)
+    if error is None:
+        memo.put(key, records)
+    return records, error
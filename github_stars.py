@@ -0,0 +1,111 @@
+import os
+import json
+import math
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional
+
+# Star-velocity tracking for GitHub trending repos. Every trending scrape is
+# appended to data/github_snapshots.jsonl as one compact line per repo
+# ({"repo", "date", "stars", "today"}), so momentum is computed from our own
+# history with no extra API calls: velocity is stars gained per day between the
+# latest snapshot and the oldest one in the last VELOCITY_DAYS (the trending
+# page's "stars today" when there's no earlier snapshot), and the streak is how
+# many consecutive days a repo has been trending. A later scrape on the same
+# day replaces that day's snapshot when the file is read.
+
+SNAPSHOT_FILE = os.getenv("GITHUB_SNAPSHOT_FILE", "data/github_snapshots.jsonl")
+VELOCITY_DAYS = 7
+HISTORY_DAYS = 60   # snapshots older than this are ignored when loading
+
+def _day(value: str) -> datetime:
+    return datetime.strptime(value, "%Y-%m-%d")
+
+def snapshot(update: Dict, date: Optional[str] = None) -> Dict:
+    """The compact snapshot line for a trending repo update."""
+    return {
+        "repo": update["name"],
+        "date": date or update.get("date") or datetime.now().strftime("%Y-%m-%d"),
+        "stars": update.get("total_stars"),
+        "today": update.get("stars", 0)
+    }
+
+class StarTracker:
+    """Per-repo trending history loaded from the append-only snapshot file."""
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path or SNAPSHOT_FILE
+        self.history: Dict[str, Dict[str, Dict]] = {}  # repo -> date -> snapshot
+        self._load()
+
+    def _load(self):
+        cutoff = (datetime.now() - timedelta(days=HISTORY_DAYS)).strftime("%Y-%m-%d")
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        snap = json.loads(line)
+                    except ValueError:
+                        continue  # A torn last line from an interrupted write
+                    if snap.get("date", "") >= cutoff:
+                        self.history.setdefault(snap["repo"], {})[snap["date"]] = snap
+        except FileNotFoundError:
+            pass
+
+    def record(self, updates: Iterable[Dict], date: Optional[str] = None) -> int:
+        """Append one snapshot per repo update; returns how many were written."""
+        snaps = [snapshot(update, date) for update in updates if update.get("type") == "repo" and update.get("name")]
+        if not snaps:
+            return 0
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        # One write per scrape keeps appends from concurrent collectors whole lines
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write("".join(json.dumps(snap, separators=(",", ":")) + "\n" for snap in snaps))
+        for snap in snaps:
+            self.history.setdefault(snap["repo"], {})[snap["date"]] = snap
+        return len(snaps)
+
+    def velocity(self, repo: str) -> float:
+        """Stars gained per day over the last VELOCITY_DAYS."""
+        days = self.history.get(repo)
+        if not days:
+            return 0.0
+        latest = days[max(days)]
+        window_start = (_day(latest["date"]) - timedelta(days=VELOCITY_DAYS)).strftime("%Y-%m-%d")
+        earlier = [snap for date, snap in days.items()
+                   if window_start <= date < latest["date"] and snap.get("stars") is not None]
+        if latest.get("stars") is not None and earlier:
+            first = min(earlier, key=lambda snap: snap["date"])
+            elapsed = (_day(latest["date"]) - _day(first["date"])).days
+            return max(0.0, (latest["stars"] - first["stars"]) / elapsed)
+        return float(latest.get("today") or 0)
+
+    def streak(self, repo: str) -> int:
+        """Consecutive trending days up to the repo's latest snapshot."""
+        days = self.history.get(repo)
+        if not days:
+            return 0
+        day, count = _day(max(days)), 0
+        while day.strftime("%Y-%m-%d") in days:
+            count += 1
+            day -= timedelta(days=1)
+        return count
+
+    def annotate(self, updates: List[Dict]) -> List[Dict]:
+        """Add star_velocity and trending_streak to repo updates (in place)."""
+        for update in updates:
+            if update.get("type") == "repo" and update.get("name") in self.history:
+                update["star_velocity"] = round(self.velocity(update["name"]), 1)
+                update["trending_streak"] = self.streak(update["name"])
+        return updates
+
+def momentum(update: Dict) -> float:
+    """Ranking bonus for repos gaining stars fast or trending several days running."""
+    velocity = update.get("star_velocity") or 0
+    streak = update.get("trending_streak") or 0
+    return math.log10(1 + velocity) + 0.5 * min(max(streak - 1, 0), 4)
+
+def track_trending(updates: List[Dict], path: Optional[str] = None) -> List[Dict]:
+    """Record a trending scrape and annotate its repos with velocity and streak."""
+    tracker = StarTracker(path)
+    tracker.record(updates)
+    return tracker.annotate(updates)
@@ -0,0 +1,263 @@
+import time
+import zlib
+import threading
+from contextlib import contextmanager, nullcontext
+from urllib.parse import urlsplit
+import requests
+from requests.adapters import HTTPAdapter
+
+import tracing
+
+# Shared HTTP layer for all collectors: one pooled session (so connections stay
+# warm across sources and, in daemon mode, across collection runs) plus
+# ETag/Last-Modified validators for conditional GETs.
+#
+# Bodies are always streamed and never held beyond a byte cap: a declared
+# Content-Length over the cap aborts before anything is read, gzip/deflate is
+# decompressed here in bounded steps (so a decompression bomb is caught after
+# at most one cap's worth of output), and an optional ByteBudget caps the total
+# across a whole collection run.
+
+USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
+DEFAULT_TIMEOUT = 15
+MAX_RESPONSE_BYTES = 10_000_000  # per response, after decompression
+MAX_COMPRESSION_RATIO = 200      # decompressed/compressed beyond this is treated as a bomb
+CHUNK_SIZE = 65536
+INFLATE_STEP = 1 << 20
+
+_session = None
+_session_lock = threading.Lock()
+
+# url -> {"etag": ..., "last_modified": ..., "content": bytes, "headers": {...}}
+_validators = {}
+# url -> parsed feedparser result for the cached body
+_parsed_feeds = {}
+_cache_lock = threading.Lock()
+
+# Politeness limits for bulk jobs (backfill, enrichment): at most N requests in
+# flight per host, spaced at least this many seconds apart
+HOST_LIMITS = {
+    "hn.algolia.com": (4, 0.4),
+    "api.github.com": (2, 0.5),
+    "github.com": (2, 0.5)
+}
+DEFAULT_HOST_LIMIT = (2, 0.5)
+_host_gates = {}
+_host_gates_lock = threading.Lock()
+
+def get_session() -> requests.Session:
+    """Return the process-wide pooled session."""
+    global _session
+    with _session_lock:
+        if _session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=32, pool_maxsize=32)
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            session.headers["User-Agent"] = USER_AGENT
+            # Only encodings we decompress ourselves, under the byte caps
+            session.headers["Accept-Encoding"] = "gzip, deflate"
+            _session = session
+        return _session
+
+class _HostGate:
+    def __init__(self, concurrency, interval):
+        self.slots = threading.BoundedSemaphore(concurrency)
+        self.interval = interval
+        self.next_start = 0.0
+        self.lock = threading.Lock()
+
+@contextmanager
+def host_slot(url):
+    """Hold one of the host's request slots, waiting out its minimum spacing."""
+    host = urlsplit(url).netloc.lower()
+    with _host_gates_lock:
+        gate = _host_gates.get(host)
+        if gate is None:
+            gate = _host_gates[host] = _HostGate(*HOST_LIMITS.get(host, DEFAULT_HOST_LIMIT))
+    with gate.slots:
+        with gate.lock:
+            now = time.monotonic()
+            wait = gate.next_start - now
+            gate.next_start = max(now, gate.next_start) + gate.interval
+        if wait > 0:
+            time.sleep(wait)
+        yield
+
+class ResponseTooLarge(ValueError):
+    """A response (or the run's byte budget) went over its size limit."""
+
+class ByteBudget:
+    """Total bytes a group of fetches (e.g. one collection run) may download."""
+
+    def __init__(self, limit: int):
+        self.limit = limit
+        self.used = 0
+        self._lock = threading.Lock()
+
+    def consume(self, n: int):
+        with self._lock:
+            self.used += n
+            if self.used > self.limit:
+                raise ResponseTooLarge(f"byte budget of {self.limit:,} bytes exhausted")
+
+def _read_body(response, url, max_bytes, budget=None, truncate=False):
+    """Read a streamed response within max_bytes; returns (body, truncated).
+
+    Over the cap, raises ResponseTooLarge, or with truncate=True returns the
+    first max_bytes.
+    """
+    def too_large(what):
+        return ResponseTooLarge(f"{url}: {what} exceeds the {max_bytes:,}-byte limit")
+
+    length = response.headers.get("Content-Length", "")
+    if not truncate and length.isdigit() and int(length) > max_bytes:
+        raise too_large(f"Content-Length {int(length):,}")
+
+    encoding = response.headers.get("Content-Encoding", "").strip().lower()
+    decoder = zlib.decompressobj(zlib.MAX_WBITS | 32) if encoding in ("gzip", "x-gzip", "deflate") else None
+    if decoder is None and encoding not in ("", "identity"):
+        raw = response.iter_content(CHUNK_SIZE)  # Let urllib3 decode anything else
+    else:
+        raw = response.raw.stream(CHUNK_SIZE, decode_content=False)
+
+    chunks, size, compressed = [], 0, 0
+    for data in raw:
+        compressed += len(data)
+        while data:
+            if decoder is not None:
+                # Inflate in bounded steps: at most 1 MB, and never more than the cap (+1 to see overflow)
+                piece = decoder.decompress(data, min(max_bytes - size + 1, INFLATE_STEP))
+                data = decoder.unconsumed_tail
+            else:
+                piece, data = data, b""
+            if budget is not None:
+                budget.consume(len(piece))
+            chunks.append(piece)
+            size += len(piece)
+            if size > max_bytes:
+                if not truncate:
+                    raise too_large("body")
+                return b"".join(chunks)[:max_bytes], True
+            if decoder is not None and size > INFLATE_STEP and size > MAX_COMPRESSION_RATIO * compressed:
+                raise ResponseTooLarge(f"{url}: compression ratio over {MAX_COMPRESSION_RATIO}:1, refusing to inflate")
+    if decoder is not None:
+        chunks.append(decoder.flush())
+        size += len(chunks[-1])
+        if size > max_bytes and not truncate:
+            raise too_large("body")
+    return b"".join(chunks)[:max_bytes], size > max_bytes
+
+class FetchResult:
+    """Body and metadata of a GET, possibly served from the conditional-GET cache."""
+
+    def __init__(self, url, status_code, content, headers, not_modified=False):
+        self.url = url
+        self.status_code = status_code
+        self.content = content
+        self.headers = headers
+        self.not_modified = not_modified
+        self.truncated = False
+
+    @property
+    def text(self):
+        return self.content.decode(self.encoding, errors="replace")
+
+    @property
+    def encoding(self):
+        content_type = self.headers.get("Content-Type", "")
+        if "charset=" in content_type:
+            return content_type.split("charset=")[-1].split(";")[0].strip() or "utf-8"
+        return "utf-8"
+
+    def json(self):
+        import json
+        return json.loads(self.content)
+
+@contextmanager
+def _streamed_get(url, params, headers, timeout, polite):
+    """A streaming GET, holding the host's slot (if polite) until the body has been read."""
+    queued = time.perf_counter()
+    with host_slot(url) if polite else nullcontext():
+        if polite:
+            tracing.set_attributes(slot_wait_ms=round((time.perf_counter() - queued) * 1000, 1))
+        with get_session().get(url, params=params, headers=headers, timeout=timeout, stream=True) as response:
+            tracing.set_attributes(status_code=response.status_code)
+            yield response
+
+def fetch(url, params=None, headers=None, timeout=DEFAULT_TIMEOUT, conditional=True, polite=False,
+          max_bytes=MAX_RESPONSE_BYTES, budget=None) -> FetchResult:
+    """GET a URL through the shared session.
+
+    With conditional=True the last ETag/Last-Modified seen for the URL is sent,
+    and a 304 is answered from the cached body (not_modified=True). With
+    polite=True the request waits for a per-host slot (see HOST_LIMITS). A body
+    over max_bytes, or one that would overrun the budget, raises ResponseTooLarge.
+    """
+    request_headers = dict(headers or {})
+    cached = _validators.get(url) if conditional and params is None else None
+    if cached:
+        if cached.get("etag"):
+            request_headers["If-None-Match"] = cached["etag"]
+        if cached.get("last_modified"):
+            request_headers["If-Modified-Since"] = cached["last_modified"]
+
+    with tracing.span("http.fetch", url=url, polite=polite, conditional=bool(cached)) as span, \
+            _streamed_get(url, params, request_headers, timeout, polite) as response:
+        if response.status_code == 304 and cached:
+            span.set(not_modified=True, bytes=len(cached["content"]))
+            return FetchResult(url, 200, cached["content"], cached["headers"], not_modified=True)
+
+        response.raise_for_status()
+        content, _ = _read_body(response, url, max_bytes, budget)
+        span.set(bytes=len(content))
+        result = FetchResult(url, response.status_code, content, dict(response.headers))
+
+    if conditional and params is None and (response.headers.get("ETag") or response.headers.get("Last-Modified")):
+        with _cache_lock:
+            _validators[url] = {
+                "etag": response.headers.get("ETag"),
+                "last_modified": response.headers.get("Last-Modified"),
+                "content": result.content,
+                "headers": result.headers
+            }
+            _parsed_feeds.pop(url, None)
+    return result
+
+def fetch_capped(url, max_bytes, content_types=None, headers=None, timeout=DEFAULT_TIMEOUT,
+                 polite=True, budget=None) -> FetchResult:
+    """Stream a GET, keeping at most max_bytes of the body.
+
+    The Content-Type is checked against content_types (prefixes such as
+    "text/html") before any of the body is read; a mismatch raises ValueError.
+    The result's `truncated` flag says whether the body was cut at the cap.
+    """
+    with tracing.span("http.fetch", url=url, polite=polite, capped=True) as span, \
+            _streamed_get(url, None, headers, timeout, polite) as response:
+        response.raise_for_status()
+        content_type = response.headers.get("Content-Type", "").split(";")[0].strip().lower()
+        if content_types and not content_type.startswith(tuple(content_types)):
+            raise ValueError(f"Unsupported content type {content_type or 'unknown'} for {url}")
+        content, truncated = _read_body(response, url, max_bytes, budget, truncate=True)
+        span.set(bytes=len(content), truncated=truncated)
+        result = FetchResult(response.url, response.status_code, content, dict(response.headers))
+    result.truncated = truncated
+    return result
+
+def fetch_feed(url, timeout=DEFAULT_TIMEOUT, polite=False):
+    """Fetch and parse an RSS/Atom feed, reusing the parsed result when the server says 304."""
+    import feedparser
+
+    result = fetch(url, timeout=timeout, polite=polite)
+    if result.not_modified and url in _parsed_feeds:
+        return _parsed_feeds[url]
+
+    feed = feedparser.parse(result.content, response_headers={"content-location": url})
+    if url in _validators:
+        with _cache_lock:
+            _parsed_feeds[url] = feed
+    return feed
+
+def cache_stats():
+    """Sizes of the warm caches, for the daemon's health endpoint."""
+    return {"validators": len(_validators), "parsed_feeds": len(_parsed_feeds)}
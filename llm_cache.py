@@ -0,0 +1,85 @@
+import os
+import json
+import time
+import hashlib
+import threading
+
+# Shared LLM response cache. Identical prompts (same model, messages and
+# sampling settings) are answered once: concurrent callers wait for the first
+# request instead of sending their own, and answers are kept on disk so other
+# profiles and resumed runs reuse them. Set LLM_CACHE=0 to disable; after
+# refresh() (brief_cli --fresh / --from-stage) answers cached before that point
+# are ignored and replaced, while this run's own answers are still shared.
+
+CACHE_DIR = os.getenv("LLM_CACHE_DIR", "data/cache/llm")
+CACHE_TTL = int(os.getenv("LLM_CACHE_TTL", str(12 * 3600)))
+
+_memory = {}
+_key_locks = {}
+_locks_guard = threading.Lock()
+_stats_lock = threading.Lock()  # hits/misses are counted from every pool thread
+hits = 0
+misses = 0
+_fresh_after = 0.0
+
+def enabled() -> bool:
+    return os.getenv("LLM_CACHE", "1") != "0"
+
+def refresh():
+    """Ignore every answer cached before now, so redone work asks the models again."""
+    global _fresh_after
+    _fresh_after = time.time()
+
+def cache_key(model, messages, **params) -> str:
+    payload = json.dumps({"model": model, "messages": messages, "params": params},
+                         sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+def _path(key):
+    return os.path.join(CACHE_DIR, key[:2], f"{key}.json")
+
+def get(key):
+    """Return a cached response if one is fresh, else None."""
+    entry = _memory.get(key)
+    if entry is None:
+        try:
+            with open(_path(key), "r", encoding="utf-8") as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        _memory[key] = entry
+    if time.time() - entry["created_at"] > CACHE_TTL or entry["created_at"] < _fresh_after:
+        return None
+    return entry["response"]
+
+def put(key, response):
+    entry = {"created_at": time.time(), "response": response}
+    _memory[key] = entry
+    path = _path(key)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(entry, f, ensure_ascii=False)
+    os.replace(tmp_path, path)
+
+def cached_call(key, compute):
+    """Return the cached response for key, computing it at most once across threads."""
+    global hits, misses
+    if not enabled():
+        return compute()
+
+    with _locks_guard:
+        lock = _key_locks.setdefault(key, threading.Lock())
+    with lock:
+        response = get(key)
+        with _stats_lock:
+            if response is not None:
+                hits += 1
+            else:
+                misses += 1
+        if response is not None:
+            return response
+        response = compute()
+        if response:
+            put(key, response)
+        return response
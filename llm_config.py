@@ -1,15 +1,71 @@
 import os
+import time
 from dotenv import load_dotenv
 from crewai import LLM
+from llm_routing import get_route, usage_tracker, estimate_tokens
+import llm_cache
+import profiling
+import tracing
 
 load_dotenv()
 
+class RoutedLLM(LLM):
+    """CrewAI LLM that falls back through its role's model chain and records latency/cost per call."""
+
+    def __init__(self, role, route, stream=False):
+        self.role = role
+        self.route = route
+        super().__init__(
+            model=f"openrouter/{route['models'][0]}",
+            api_key=os.getenv("OPENROUTER_API_KEY"),
+            base_url="https://openrouter.ai/api/v1",
+            temperature=route["temperature"],
+            max_tokens=route["max_tokens"],
+            timeout=route["timeout"],
+            stream=stream
+        )
+
+    def call(self, messages, *args, **kwargs):
+        # Time spent here vs. in the enclosing agent stage separates LLM latency from crewai overhead
+        with profiling.stage("llm"), tracing.span("llm.call", role=self.role, models=",".join(self.route["models"])) as span:
+            # Identical prompts on the same route are answered once (see llm_cache.py)
+            if kwargs.get("tools"):
+                return self._call_with_fallback(messages, *args, **kwargs)
+            key = llm_cache.cache_key(self.route["models"], messages,
+                                      temperature=self.route["temperature"], max_tokens=self.route["max_tokens"])
+            span.set(cached=True)
+
+            def complete():
+                span.set(cached=False)
+                return self._call_with_fallback(messages, *args, **kwargs)
+            return llm_cache.cached_call(key, complete)
+
+    def _call_with_fallback(self, messages, *args, **kwargs):
+        last_error = None
+        for retries, model in enumerate(self.route["models"]):
+            tracing.set_attributes(retries=retries)
+            self.model = f"openrouter/{model}"
+            start = time.perf_counter()
+            try:
+                result = super().call(messages, *args, **kwargs)
+            except Exception as e:
+                usage_tracker.record(self.role, model, time.perf_counter() - start, ok=False)
+                print(f"⚠️ {self.role}: {model} failed ({e}), trying next model")
+                last_error = e
+                continue
+            # CrewAI's LLM.call returns only the text, not OpenRouter's usage block, so
+            # tokens (and the cost derived from them) are chars/4 estimates on this path
+            usage_tracker.record(self.role, model, time.perf_counter() - start,
+                                 prompt_tokens=estimate_tokens(messages),
+                                 completion_tokens=estimate_tokens(result), estimated=True)
+            return result
+        raise last_error
+
+def get_llm_for_role(role, stream=False, routes=None):
+    """Return a CrewAI LLM configured from the routing table for this agent role."""
+    return RoutedLLM(role, get_route(role, routes), stream=stream)
+
 # Configure OpenRouter LLM for CrewAI using CrewAI's LLM wrapper
-def get_openrouter_llm():
-    return LLM(
-        model="openrouter/mistralai/mistral-small-3.2-24b-instruct:free",
-        api_key=os.getenv("OPENROUTER_API_KEY"),
-        base_url="https://openrouter.ai/api/v1",
-        temperature=0.7,
-        max_tokens=1000
-    )
\ No newline at end of file
+def get_openrouter_llm(stream=False):
+    # stream=True makes CrewAI consume OpenRouter's SSE stream token by token
+    return get_llm_for_role("default", stream=stream)
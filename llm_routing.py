@@ -0,0 +1,167 @@
+import os
+import json
+import threading
+from datetime import datetime
+from typing import Dict, List, Optional
+
+import tracing
+
+# Per-agent model routing. Each role gets a chain of OpenRouter models (tried in
+# order until one answers), a token cap and a timeout. Cheap, fast models handle
+# filtering and scoring; the action stage gets a stronger model first.
+DEFAULT_ROUTES = {
+    "default": {
+        "models": ["mistralai/mistral-small-3.2-24b-instruct:free"],
+        "temperature": 0.7,
+        "max_tokens": 1000,
+        "timeout": 60
+    },
+    "Signal Hunter": {
+        "models": [
+            "meta-llama/llama-3.1-8b-instruct:free",
+            "mistralai/mistral-small-3.2-24b-instruct:free"
+        ],
+        "temperature": 0.3,
+        "max_tokens": 800,
+        "timeout": 45
+    },
+    "Relevance Scorer": {
+        "models": [
+            "meta-llama/llama-3.1-8b-instruct:free",
+            "mistralai/mistral-small-3.2-24b-instruct:free"
+        ],
+        "temperature": 0.2,
+        "max_tokens": 600,
+        "timeout": 45
+    },
+    "Action Generator": {
+        "models": [
+            "meta-llama/llama-3.3-70b-instruct:free",
+            "mistralai/mistral-small-3.2-24b-instruct:free"
+        ],
+        "temperature": 0.7,
+        "max_tokens": 1500,
+        "timeout": 90
+    }
+}
+
+# USD per 1M tokens (prompt, completion) for cost estimates when OpenRouter
+# doesn't report the cost itself. Free models cost nothing.
+MODEL_PRICES = {
+    "mistralai/mistral-small-3.2-24b-instruct": (0.05, 0.10),
+    "meta-llama/llama-3.1-8b-instruct": (0.02, 0.03),
+    "meta-llama/llama-3.3-70b-instruct": (0.13, 0.40)
+}
+
+ROUTES_FILE = os.getenv("LLM_ROUTES_FILE", "data/llm_routes.json")
+USAGE_FILE = "data/llm_usage.jsonl"
+
+def load_routes(path=None) -> Dict[str, Dict]:
+    """Return the routing table, with per-role overrides from the JSON routes file if present."""
+    routes = {role: dict(route) for role, route in DEFAULT_ROUTES.items()}
+    path = path or ROUTES_FILE
+    if os.path.exists(path):
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                overrides = json.load(f)
+            for role, route in overrides.items():
+                routes[role] = {**routes.get(role, routes["default"]), **route}
+        except (OSError, ValueError) as e:
+            print(f"⚠️ Ignoring invalid LLM routes file {path}: {e}")
+    return routes
+
+def merge_routes(overrides: Optional[Dict[str, Dict]]) -> Dict[str, Dict]:
+    """Routing table with extra per-role overrides (e.g. from a brief profile) applied on top."""
+    routes = load_routes()
+    for role, route in (overrides or {}).items():
+        routes[role] = {**routes.get(role, routes["default"]), **route}
+    return routes
+
+def get_route(role: str, routes: Optional[Dict[str, Dict]] = None) -> Dict:
+    """Return the model chain, token cap and timeout configured for an agent role."""
+    routes = routes or load_routes()
+    return {**routes["default"], **routes.get(role, {})}
+
+def estimate_cost(model: str, prompt_tokens: int, completion_tokens: int) -> float:
+    """Estimate the USD cost of a call from the price table (0 for :free models)."""
+    if model.endswith(":free"):
+        return 0.0
+    prompt_price, completion_price = MODEL_PRICES.get(model.split(":")[0], (0.0, 0.0))
+    return (prompt_tokens * prompt_price + completion_tokens * completion_price) / 1_000_000
+
+class UsageTracker:
+    """Thread-safe record of latency, tokens and cost per agent role."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.records: List[Dict] = []
+
+    def record(self, role, model, latency, prompt_tokens=0, completion_tokens=0, cost=None, ok=True, estimated=False):
+        """Record one attempt; estimated=True marks token counts from estimate_tokens, not the API."""
+        if cost is None:
+            cost = estimate_cost(model, prompt_tokens, completion_tokens)
+        # Every attempt on every model passes through here, so it is also where LLM requests are traced
+        tracing.record("llm.request", latency, error=None if ok else "request failed", role=role, model=model,
+                       prompt_tokens=prompt_tokens, completion_tokens=completion_tokens, cost=cost,
+                       estimated=estimated)
+        with self._lock:
+            self.records.append({
+                "timestamp": datetime.now().isoformat(timespec="seconds"),
+                "role": role,
+                "model": model,
+                "latency": round(latency, 3),
+                "prompt_tokens": prompt_tokens,
+                "completion_tokens": completion_tokens,
+                "cost": cost,
+                "estimated": estimated,
+                "ok": ok
+            })
+
+    def summary(self) -> Dict[str, Dict]:
+        """Aggregate calls, failures, latency, tokens and cost per role."""
+        totals = {}
+        with self._lock:
+            records = list(self.records)
+        for r in records:
+            t = totals.setdefault(r["role"], {"calls": 0, "failures": 0, "latency": 0.0,
+                                              "tokens": 0, "cost": 0.0, "estimated": False, "models": set()})
+            t["calls"] += 1
+            t["failures"] += 0 if r["ok"] else 1
+            t["latency"] += r["latency"]
+            t["tokens"] += r["prompt_tokens"] + r["completion_tokens"]
+            t["cost"] += r["cost"]
+            t["estimated"] = t["estimated"] or r.get("estimated", False)
+            if r["ok"]:
+                t["models"].add(r["model"])
+        return totals
+
+    def print_summary(self):
+        summary = self.summary()
+        if not summary:
+            return
+        print("\n📈 LLM usage by role:")
+        for role, t in summary.items():
+            models = ", ".join(sorted(t["models"])) or "none succeeded"
+            approx = "~" if t["estimated"] else ""
+            print(f"   • {role}: {t['calls']} calls ({t['failures']} failed), "
+                  f"{t['latency']:.1f}s total, {approx}{t['tokens']} tokens, {approx}${t['cost']:.4f} [{models}]")
+
+    def save(self, path=USAGE_FILE):
+        """Append this run's records to the usage log so routing can be tuned over time."""
+        with self._lock:
+            records, self.records = self.records, []
+        if not records:
+            return
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(path, "a", encoding="utf-8") as f:
+            for r in records:
+                f.write(json.dumps(r) + "\n")
+
+# Shared by every agent in the process
+usage_tracker = UsageTracker()
+
+def estimate_tokens(text) -> int:
+    """Rough token count (~4 chars per token) for when the API doesn't report usage."""
+    if isinstance(text, list):
+        text = " ".join(str(m.get("content", "")) if isinstance(m, dict) else str(m) for m in text)
+    return len(str(text or "")) // 4
@@ -0,0 +1,189 @@
+import re
+from typing import Dict, Iterable, List, Optional
+
+# Single-pass compiler from brief Markdown (or article data) to Notion block
+# JSON. Each line is tokenized once: block syntax (headings, bullets, numbered
+# items, quotes, fenced code, dividers) picks the block type and an inline
+# tokenizer turns **bold**, *italic*, `code` and [links](url) into annotated
+# rich text, split to fit Notion's 2,000 characters per text object and 100
+# rich text objects per block.
+
+MAX_TEXT_CHARS = 2000
+MAX_RICH_TEXT_ITEMS = 100
+
+_INLINE = re.compile(
+    # URLs may contain one level of balanced parentheses, e.g. Wikipedia's /Foo_(bar)
+    r"\[(?P<link_text>[^\]]+)\]\((?P<url>(?:[^()\s]|\([^()\s]*\))+)\)"
+    r"|\*\*(?P<bold>.+?)\*\*"
+    r"|`(?P<code>[^`]+)`"
+    r"|(?<![\w*])\*(?P<italic>[^*\s](?:[^*]*[^*\s])?)\*(?![\w*])"
+    r"|(?<![\w_])_(?P<italic_u>[^_\s](?:[^_]*[^_\s])?)_(?![\w_])"
+)
+_HEADING = re.compile(r"^(#{1,6})\s+(.*)$")
+_NUMBERED = re.compile(r"^\d+[.)]\s+(.*)$")
+_DIVIDERS = {"⸻", "---", "***", "___"}
+_BULLETS = ("• ", "- ", "* ")
+# Lines without any of these characters skip the inline tokenizer
+_MARKUP = re.compile(r"[*_`\[]")
+
+def _segments(text: str, annotations: frozenset = frozenset(), link: Optional[str] = None):
+    """Yield (content, annotations, link) runs for one line of inline Markdown."""
+    if not _MARKUP.search(text):
+        yield text, annotations, link
+        return
+    position = 0
+    for match in _INLINE.finditer(text):
+        start = match.start()
+        if start > position:
+            yield text[position:start], annotations, link
+        kind = match.lastgroup
+        if kind == "url":
+            yield from _segments(match.group("link_text"), annotations, match.group("url"))
+        elif kind == "bold":
+            yield from _segments(match.group("bold"), annotations | {"bold"}, link)
+        elif kind == "code":
+            yield match.group("code"), annotations | {"code"}, link
+        else:
+            yield from _segments(match.group(kind), annotations | {"italic"}, link)
+        position = match.end()
+    if position < len(text):
+        yield text[position:], annotations, link
+
+def _text_item(content: str, annotations: frozenset, link: Optional[str]) -> Dict:
+    text = {"content": content}
+    if link:
+        text["link"] = {"url": link}
+    if not annotations:
+        return {"type": "text", "text": text}
+    return {"type": "text", "text": text, "annotations": dict.fromkeys(sorted(annotations), True)}
+
+def rich_text(text: str, inline: bool = True) -> List[Dict]:
+    """Notion rich text for a line, with annotations/links and 2,000-char chunking."""
+    items = []
+    previous = None
+    for content, annotations, link in (_segments(text) if inline else [(text, frozenset(), None)]):
+        if not content:
+            continue
+        # Adjacent runs with the same style become one text object
+        if previous == (annotations, link) and len(items[-1]["text"]["content"]) + len(content) <= MAX_TEXT_CHARS:
+            items[-1]["text"]["content"] += content
+            continue
+        for start in range(0, len(content), MAX_TEXT_CHARS):
+            items.append(_text_item(content[start:start + MAX_TEXT_CHARS], annotations, link))
+        previous = (annotations, link)
+    return items
+
+def text_block(block_type: str, text: str, inline: bool = True, **extra) -> List[Dict]:
+    """One block (or several, if the text needs more than 100 rich text objects)."""
+    items = rich_text(text, inline) or [_text_item("", frozenset(), None)]
+    return [
+        {"object": "block", "type": block_type,
+         block_type: {"rich_text": items[start:start + MAX_RICH_TEXT_ITEMS], **extra}}
+        for start in range(0, len(items), MAX_RICH_TEXT_ITEMS)
+    ]
+
+def divider() -> Dict:
+    return {"object": "block", "type": "divider", "divider": {}}
+
+def compile_lines(lines: Iterable[str]) -> List[Dict]:
+    """Compile Markdown lines to Notion blocks in a single pass."""
+    blocks = []
+    code_lines = None
+    code_language = "plain text"
+    for raw in lines:
+        line = raw.strip()
+        if code_lines is not None:
+            if line.startswith("```"):
+                blocks += text_block("code", "\n".join(code_lines), inline=False, language=code_language)
+                code_lines = None
+            else:
+                code_lines.append(raw.rstrip())
+            continue
+        if not line:
+            continue
+        if line.startswith("```"):
+            code_lines, code_language = [], line[3:].strip() or "plain text"
+        elif line in _DIVIDERS:
+            blocks.append(divider())
+        elif line.startswith("🔹 **") and line.endswith("**"):
+            # Article titles in the grouped Notion layout
+            blocks += text_block("heading_2", line.replace("**", ""), inline=False)
+        elif line.startswith("#"):
+            match = _HEADING.match(line)
+            if match:
+                level = min(len(match.group(1)), 3)
+                blocks += text_block(f"heading_{level}", match.group(2).replace("**", ""))
+            else:
+                blocks += text_block("paragraph", line)
+        elif line.startswith(_BULLETS):
+            blocks += text_block("bulleted_list_item", line[2:].strip())
+        elif line.startswith("> "):
+            blocks += text_block("quote", line[2:])
+        elif line[0].isdigit() and _NUMBERED.match(line):
+            blocks += text_block("numbered_list_item", _NUMBERED.match(line).group(1))
+        else:
+            blocks += text_block("paragraph", line)
+    if code_lines is not None:
+        blocks += text_block("code", "\n".join(code_lines), inline=False, language=code_language)
+    return blocks
+
+def compile_markdown(markdown_text: str) -> List[Dict]:
+    return compile_lines(markdown_text.split("\n"))
+
+def _score(article: Dict) -> int:
+    try:
+        return int(article.get('relevance_score', 0))
+    except (TypeError, ValueError):
+        return 0
+
+def article_lines(article: Dict) -> List[str]:
+    """The grouped Notion layout for one article, as Markdown lines."""
+    # Format tags - remove brackets and clean up
+    tags = article.get('tags', 'N/A')
+    if tags != 'N/A':
+        tags = tags.replace('[', '').replace(']', '').replace(' ', ', ')
+
+    lines = [
+        f"🔹 **{article['title']}**",
+        "",
+        f"📍 Source: {article['source']}",
+        f"💡 Why it matters: {article['why_matters']}",
+        f"🏷 Tags: {tags}",
+        f"🎯 Relevance Score: {article['relevance_score']}"
+    ]
+
+    # Add explanation if available and different from why_matters
+    if article['explanation'] != 'N/A' and article['explanation'] and article['explanation'] != article['why_matters']:
+        lines.append(article['explanation'])
+
+    if article['action']:
+        # Parse action to extract key details
+        action_lines = article['action'].strip().split('\n')
+        action_title = action_lines[0].replace('✅ **', '').replace('**', '').strip()
+        lines += ["", "✅ Suggested Action:", action_title]
+        for line in action_lines[1:]:
+            if '• Time Estimate:' in line:
+                lines.append(f"• Time: {line.replace('• Time Estimate:', '').strip()}")
+            elif '• Expected Outcome:' in line:
+                lines.append(f"• Outcome: {line.replace('• Expected Outcome:', '').strip()}")
+            elif '• Description:' in line:
+                desc = line.replace('• Description:', '').strip()
+                if desc:
+                    lines.append(f"• {desc}")
+    else:
+        lines += ["", "📌 No specific action generated - bookmark for future reference."]
+
+    # Add source link at the end of action section
+    if article['link']:
+        lines.append(f"• [🔗 Read more]({article['link']})")
+
+    lines += ["", "⸻"]
+    return lines
+
+def sort_articles(articles: List[Dict]) -> List[Dict]:
+    """Highest relevance score first."""
+    return sorted(articles, key=_score, reverse=True)
+
+def compile_articles(articles: List[Dict]) -> List[Dict]:
+    """Blocks for the grouped article layout, straight from article dicts."""
+    return compile_lines(line for article in sort_articles(articles) for line in article_lines(article))
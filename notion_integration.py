@@ -1,8 +1,13 @@
 import os
 import re
+import json
+import time
+import asyncio
 from datetime import datetime
-from notion_client import Client
 from dotenv import load_dotenv
+from brief_renderer import brief_to_articles, rising_topic_lines
+from notion_blocks import article_lines, compile_articles, compile_lines, compile_markdown, sort_articles
+from notion_publisher import NotionPublisher, AsyncNotionPublisher
 
 load_dotenv()
 
@@ -25,14 +30,28 @@ def extract_section_content(markdown_text, header):
     
     return '\n'.join(content).strip()
 
+def split_sections(markdown_text, headers):
+    """extract_section_content for several headers, scanning the document once."""
+    sections = {header: [] for header in headers}
+    current = None
+    for line in markdown_text.split('\n'):
+        header = next((h for h in headers if h in line), None)
+        if header is not None:
+            current = sections[header]
+        elif current is not None and (line.startswith('##') or line.startswith('⸻')):
+            current = None
+        elif current is not None:
+            current.append(line)
+    return {header: '\n'.join(lines).strip() for header, lines in sections.items()}
+
 def parse_articles_from_brief(markdown_text):
     """Parse the brief and extract article information grouped by source."""
     articles = []
     
-    # Extract the three main sections
-    top_signals = extract_section_content(markdown_text, '📌 Top 5 AI Signals')
-    relevance_summary = extract_section_content(markdown_text, '🎯 Relevance Summary') 
-    suggested_actions = extract_section_content(markdown_text, '✅ Today\'s Suggested Actions')
+    # Extract the three main sections in one pass over the document
+    sections = split_sections(markdown_text, ['📌 Top 5 AI Signals', '🎯 Relevance Summary',
+                                              '✅ Today\'s Suggested Actions'])
+    top_signals, relevance_summary, suggested_actions = sections.values()
     
     # Parse signals (numbered list)
     signal_articles = parse_signal_entries(top_signals)
@@ -169,264 +188,194 @@ def parse_action_entries(actions_text):
 
 def format_grouped_content(articles):
     """Format articles into grouped content blocks."""
-    content_blocks = []
-    
-    # Sort articles by relevance score (highest first)
-    sorted_articles = sorted(articles, key=lambda x: int(x.get('relevance_score', 0)) if x.get('relevance_score', '0') != 'N/A' else 0, reverse=True)
-    
-    for article in sorted_articles:
-        # Format tags - remove brackets and clean up
-        tags = article.get('tags', 'N/A')
-        if tags != 'N/A':
-            # Remove brackets and clean up formatting
-            tags = tags.replace('[', '').replace(']', '').replace(' ', ', ')
-        
-        block = f"""🔹 **{article['title']}**
-
-📍 Source: {article['source']}
-💡 Why it matters: {article['why_matters']}
-🏷 Tags: {tags}
-🎯 Relevance Score: {article['relevance_score']}"""
-        
-        # Add explanation if available and different from why_matters
-        if article['explanation'] != 'N/A' and article['explanation'] and article['explanation'] != article['why_matters']:
-            block += f"\n{article['explanation']}"
-        
-        # Add action if available
-        if article['action']:
-            # Parse action to extract key details
-            action_lines = article['action'].strip().split('\n')
-            action_title = action_lines[0].replace('✅ **', '').replace('**', '').strip()
-            
-            block += f"\n\n✅ Suggested Action:\n{action_title}"
-            
-            # Extract time, outcome, and description from action
-            for line in action_lines[1:]:
-                if '• Time Estimate:' in line:
-                    time = line.replace('• Time Estimate:', '').strip()
-                    block += f"\n• Time: {time}"
-                elif '• Expected Outcome:' in line:
-                    outcome = line.replace('• Expected Outcome:', '').strip()
-                    block += f"\n• Outcome: {outcome}"
-                elif '• Description:' in line:
-                    desc = line.replace('• Description:', '').strip()
-                    if desc:
-                        block += f"\n• {desc}"
-        else:
-            block += f"\n\n📌 No specific action generated - bookmark for future reference."
-        
-        # Add source link at the end of action section
-        if article['link']:
-            block += f"\n• [🔗 Read more]({article['link']})"
-        
-        block += "\n\n⸻"
-        content_blocks.append(block)
-    
-    return '\n\n'.join(content_blocks)
+    return '\n\n'.join('\n'.join(article_lines(article)) for article in sort_articles(articles))
 
 def create_notion_blocks(content):
     """Convert markdown content to Notion blocks."""
-    blocks = []
-    lines = content.split('\n')
+    return compile_markdown(content)
+
+def build_notion_page(brief=None, markdown_text=None):
+    """Build (date, row properties, content blocks) for one brief.
     
-    for line in lines:
-        line = line.strip()
-        if not line:
-            continue
-        elif line == '⸻':
-            blocks.append({
-                "object": "block",
-                "type": "divider",
-                "divider": {}
-            })
-        elif line.startswith('🔹 **') and line.endswith('**'):
-            # Title
-            title_text = line.replace('🔹 **', '').replace('**', '')
-            blocks.append({
-                "object": "block",
-                "type": "heading_2",
-                "heading_2": {
-                    "rich_text": [
-                        {
-                            "type": "text",
-                            "text": {"content": f"🔹 {title_text}"}
-                        }
-                    ]
-                }
-            })
-        elif line.startswith(('📍', '💡', '🏷', '🎯', '✅', '📌')):
-            # Emoji-prefixed lines
-            blocks.append({
-                "object": "block",
-                "type": "paragraph",
-                "paragraph": {
-                    "rich_text": [
-                        {
-                            "type": "text",
-                            "text": {"content": line}
-                        }
-                    ]
-                }
-            })
-        elif line.startswith('• '):
-            # Bullet point items (for actions)
-            # Check if it contains a markdown link
-            if '[🔗' in line and '](' in line:
-                # Parse markdown link
-                parts = line.split('[🔗')
-                prefix = parts[0]
-                link_parts = parts[1].split('](')
-                link_text = '🔗 ' + link_parts[0].strip()
-                link_url = link_parts[1].rstrip(')')
-                
-                blocks.append({
-                    "object": "block",
-                    "type": "bulleted_list_item",
-                    "bulleted_list_item": {
-                        "rich_text": [
-                            {
-                                "type": "text",
-                                "text": {"content": prefix}
-                            },
-                            {
-                                "type": "text",
-                                "text": {
-                                    "content": link_text,
-                                    "link": {"url": link_url}
-                                }
-                            }
-                        ]
-                    }
-                })
-            else:
-                blocks.append({
-                    "object": "block",
-                    "type": "bulleted_list_item",
-                    "bulleted_list_item": {
-                        "rich_text": [
-                            {
-                                "type": "text",
-                                "text": {"content": line}
-                            }
-                        ]
+    Takes the structured brief from brief_renderer, or rendered brief Markdown
+    whose date is read from its "🗓️ Date:" line.
+    """
+    if brief is not None:
+        articles = brief_to_articles(brief)
+        brief_date = brief['date']
+    else:
+        # Parse articles from the brief
+        articles = parse_articles_from_brief(markdown_text)
+        brief_date = brief_date_from_markdown(markdown_text) or datetime.now().strftime("%Y-%m-%d")
+    
+    properties = {
+        "Name": {
+            "title": [
+                {
+                    "type": "text",
+                    "text": {
+                        "content": f"AI Brief – {brief_date}"
                     }
-                })
-        else:
-            # Regular paragraph
-            blocks.append({
-                "object": "block",
-                "type": "paragraph",
-                "paragraph": {
-                    "rich_text": [
-                        {
-                            "type": "text",
-                            "text": {"content": line}
-                        }
-                    ]
                 }
-            })
+            ]
+        },
+        "Date": {
+            "date": {
+                "start": brief_date
+            }
+        }
+    }
+    
+    # Full page content, compiled straight from the articles (no Markdown round-trip)
+    content_blocks = compile_articles(articles)
+    if brief is not None and brief.get('rising_topics'):
+        content_blocks += compile_lines(rising_topic_lines(brief['rising_topics']))
+    
+    # Add title block at the beginning
+    title_block = {
+        "object": "block",
+        "type": "heading_1",
+        "heading_1": {
+            "rich_text": [
+                {
+                    "type": "text",
+                    "text": {"content": f"AI Strategy Brief - {brief_date}"}
+                }
+            ]
+        }
+    }
     
-    return blocks
+    return brief_date, properties, [title_block] + content_blocks
 
-def push_to_notion():
-    """Push the daily strategy brief to Notion database with a full page."""
+def brief_date_from_markdown(markdown_text):
+    match = re.search(r'🗓️ Date:\s*(\d{4}-\d{2}-\d{2})', markdown_text)
+    return match.group(1) if match else None
+
+def push_to_notion(brief=None, database_id=None, upsert=True, raise_errors=False):
+    """Push the daily strategy brief to Notion database with a full page.
+    
+    When the structured brief from brief_renderer is passed in, articles are taken
+    from it directly instead of being regex-parsed back out of strategy_brief.md.
+    database_id defaults to NOTION_DATABASE_ID; brief profiles pass their own.
+    With upsert, an existing row for the same Date is updated in place (only the
+    changed blocks are rewritten) instead of adding a duplicate page.
+    raise_errors lets callers that retry (the publish outbox) see the actual error.
+    """
     try:
         # Load environment variables
         notion_token = os.getenv("NOTION_TOKEN")
-        database_id = os.getenv("NOTION_DATABASE_ID")
+        database_id = database_id or os.getenv("NOTION_DATABASE_ID")
         
         if not notion_token or not database_id:
-            print("❌ Missing NOTION_TOKEN or NOTION_DATABASE_ID in .env file")
-            return False
-        
-        # Read the markdown file
-        try:
-            with open("strategy_brief.md", "r", encoding="utf-8") as f:
-                markdown_text = f.read()
-        except FileNotFoundError:
-            print("❌ strategy_brief.md not found")
+            print("❌ Missing NOTION_TOKEN or Notion database ID in .env file")
             return False
         
-        # Parse articles from the brief
-        articles = parse_articles_from_brief(markdown_text)
+        markdown_text = None
+        if brief is None:
+            # Read the markdown file
+            try:
+                with open("strategy_brief.md", "r", encoding="utf-8") as f:
+                    markdown_text = f.read()
+            except FileNotFoundError:
+                print("❌ strategy_brief.md not found")
+                return False
         
-        # Format into grouped content
-        formatted_content = format_grouped_content(articles)
+        today_date, properties, all_blocks = build_notion_page(brief, markdown_text)
         
-        # Initialize Notion client
+        # Initialize Notion client (imported lazily so rendering/parsing stays fast to load)
+        from notion_client import Client
         notion = Client(auth=notion_token)
         
-        # Get today's date
-        today_date = datetime.now().strftime("%Y-%m-%d")
-        
-        # Step 1: Create database row
-        database_row = {
-            "parent": {
-                "type": "database_id",
-                "database_id": database_id
-            },
-            "properties": {
-                "Name": {
-                    "title": [
-                        {
-                            "type": "text",
-                            "text": {
-                                "content": f"AI Brief – {today_date}"
-                            }
-                        }
-                    ]
-                },
-                "Date": {
-                    "date": {
-                        "start": today_date
-                    }
-                }
-            }
-        }
-        
-        # Create the database row
-        row_response = notion.pages.create(**database_row)
-        row_page_id = row_response['id']
-        
-        print(f"✅ Database row created: {row_response['url']}")
-        
-        # Step 2: Create full content page as child of the row
-        content_blocks = create_notion_blocks(formatted_content)
-        
-        # Add title block at the beginning
-        title_block = {
-            "object": "block",
-            "type": "heading_1",
-            "heading_1": {
-                "rich_text": [
-                    {
-                        "type": "text",
-                        "text": {"content": f"AI Strategy Brief - {today_date}"}
-                    }
-                ]
-            }
-        }
-        
-        # Add all blocks to the page
-        all_blocks = [title_block] + content_blocks
-        
-        # Notion has a limit on blocks per request, so we'll add them in chunks
-        for i in range(0, len(all_blocks), 100):  # Process in chunks of 100
-            chunk = all_blocks[i:i+100]
-            notion.blocks.children.append(
-                block_id=row_page_id,
-                children=chunk
-            )
+        # Create the row with its first 100 blocks inline and append the rest through
+        # the rate limiter; a page that can't be completed is archived, not left half-written
+        publisher = NotionPublisher(notion)
+        if upsert:
+            row_response, stats = publisher.upsert_page(database_id, today_date, properties, all_blocks)
+        else:
+            parent = {"type": "database_id", "database_id": database_id}
+            row_response, stats = publisher.create_page(parent, properties, all_blocks), None
         
-        print("✅ AI Brief successfully pushed to Notion page")
+        if stats is None:
+            print(f"✅ Database row created: {row_response['url']}")
+        else:
+            print(f"🔁 Updated existing row for {today_date}: {stats['updated']} updated, "
+                  f"{stats['inserted']} inserted, {stats['deleted']} removed, {stats['unchanged']} unchanged blocks")
+        print(f"✅ AI Brief successfully pushed to Notion page ({publisher.requests} requests, {publisher.retries} retries)")
         print(f"📄 View full brief at: {row_response['url']}")
         
         return True
         
     except Exception as e:
         print(f"❌ Error pushing to Notion: {str(e)}")
+        if raise_errors:
+            raise
         return False
 
+def _load_brief_source(source):
+    """A bulk-publish input -> (label, structured brief or None, markdown or None)."""
+    if isinstance(source, dict):
+        return source.get('date', 'brief'), source, None
+    with open(source, "r", encoding="utf-8") as f:
+        if source.endswith(".json"):
+            data = json.load(f)
+            # run_store artifacts wrap the brief in an envelope
+            return source, data.get('data', data) if 'stage' in data else data, None
+        return source, None, f.read()
+
+async def _publish_briefs_async(sources, database_id, notion_token, upsert, concurrency):
+    from notion_client import AsyncClient
+    notion = AsyncClient(auth=notion_token)
+    publisher = AsyncNotionPublisher(notion)
+    semaphore = asyncio.Semaphore(concurrency)
+    results = {}
+    done = 0
+    
+    async def publish_one(source):
+        nonlocal done
+        async with semaphore:
+            try:
+                label, brief, markdown_text = _load_brief_source(source)
+                brief_date, properties, blocks = build_notion_page(brief, markdown_text)
+                if upsert:
+                    page, _ = await publisher.upsert_page(database_id, brief_date, properties, blocks)
+                else:
+                    parent = {"type": "database_id", "database_id": database_id}
+                    page = await publisher.create_page(parent, properties, blocks)
+                results[brief_date] = page['url']
+                status = f"✅ {brief_date}"
+            except Exception as e:
+                label = source if isinstance(source, str) else (source or {}).get('date', 'brief')
+                results[label] = None
+                status = f"❌ {label}: {e}"
+            done += 1
+            print(f"📤 [{done}/{len(sources)}] {status} ({publisher.requests} requests so far)")
+    
+    try:
+        await asyncio.gather(*(publish_one(source) for source in sources))
+    finally:
+        await notion.aclose()
+    return results
+
+def publish_briefs(sources, database_id=None, upsert=True, concurrency=4):
+    """Publish many briefs concurrently, e.g. when regenerating or backfilling weeks of them.
+    
+    sources may mix structured brief dicts, brief JSON files (run_store artifacts
+    included) and rendered Markdown files. All pages share the process-wide Notion
+    rate limiter, so the batch runs at the API's allowed rate. Returns
+    {date or source: page URL, or None if it failed}.
+    """
+    notion_token = os.getenv("NOTION_TOKEN")
+    database_id = database_id or os.getenv("NOTION_DATABASE_ID")
+    if not notion_token or not database_id:
+        print("❌ Missing NOTION_TOKEN or Notion database ID in .env file")
+        return {}
+    sources = list(sources)
+    start = time.perf_counter()
+    results = asyncio.run(_publish_briefs_async(sources, database_id, notion_token, upsert, concurrency))
+    published = sum(1 for url in results.values() if url)
+    print(f"📚 Published {published}/{len(sources)} briefs in {time.perf_counter() - start:.1f}s")
+    return results
+
 if __name__ == "__main__":
     # Test the function
     push_to_notion()
\ No newline at end of file
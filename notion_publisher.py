@@ -0,0 +1,463 @@
+import json
+import time
+import random
+import asyncio
+import difflib
+import threading
+from typing import Callable, Dict, Generator, List, Optional
+
+import tracing
+
+# Rate-limit-aware Notion writes. Notion allows ~3 requests/second per
+# integration, at most 100 children per create/append request and ~500KB per
+# payload. Pages are created with their first chunk of blocks inline, the rest
+# is appended through a shared token bucket, 429/5xx responses are retried with
+# backoff (honouring Retry-After), and a page whose content can't be completed
+# is archived instead of being left half-written. Upserts find the day's page
+# by its Date property and only touch the blocks that changed.
+#
+# Creating a page and appending blocks are not idempotent: a request that timed
+# out or got a 5xx may still have been applied. Those two are only retried
+# blindly on 429 or when the connection never got through; after any other
+# ambiguous failure the plan re-queries (the page by Date, the children after
+# the insertion point) and re-sends only what didn't land.
+#
+# Each operation is written once as a plan: a generator that yields
+# (endpoint, kwargs) requests and receives the responses. NotionPublisher runs
+# plans with the blocking client, AsyncNotionPublisher with notion-client's
+# AsyncClient, and both draw from the same token bucket.
+
+MAX_CHILDREN_PER_REQUEST = 100
+# Notion rejects payloads over 500KB; leave headroom for the request envelope
+MAX_PAYLOAD_BYTES = 450_000
+RETRY_STATUSES = {409, 429, 500, 502, 503, 504}
+# Block body fields the compiler emits besides rich_text (all others are API defaults)
+COMPILED_FIELDS = ("language",)
+# Endpoints whose failed request may still have been applied
+NON_IDEMPOTENT = {"pages.create", "blocks.children.append"}
+# Errors raised before a request reached Notion, so it is safe to resend anything
+CONNECT_ERRORS = ("ConnectError", "ConnectTimeout")
+# Re-sends of a non-idempotent request after reconciling an ambiguous failure
+RECONCILE_ATTEMPTS = 3
+
+class TokenBucket:
+    """Thread-safe token bucket: `rate` requests per second with bursts up to `capacity`.
+
+    Callers reserve a token and are told how long to wait for it, so threads
+    (acquire) and asyncio tasks (acquire_async) can share one bucket.
+    """
+
+    def __init__(self, rate: float = 3.0, capacity: Optional[float] = None):
+        self.rate = rate
+        self.capacity = capacity or rate
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        """Take a token and return how many seconds to wait before using it."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1
+            return max(0.0, -self._tokens / self.rate)
+
+    def acquire(self):
+        wait = self.reserve()
+        if wait:
+            time.sleep(wait)
+
+    async def acquire_async(self):
+        wait = self.reserve()
+        if wait:
+            await asyncio.sleep(wait)
+
+    def pause(self, seconds: float):
+        """Drain the bucket so every caller backs off (used when Notion answers 429)."""
+        with self._lock:
+            self._tokens = min(self._tokens, 0) - seconds * self.rate
+            self._updated = time.monotonic()
+
+# One bucket per process: the limit is per integration, not per client
+shared_limiter = TokenBucket(3.0)
+
+def _payload_size(block: Dict) -> int:
+    return len(json.dumps(block, ensure_ascii=False).encode("utf-8"))
+
+def chunk_blocks(blocks: List[Dict], max_children=MAX_CHILDREN_PER_REQUEST,
+                 max_bytes=MAX_PAYLOAD_BYTES) -> List[List[Dict]]:
+    """Split blocks into the fewest requests that respect Notion's count and size limits."""
+    chunks, current, current_size = [], [], 0
+    for block in blocks:
+        size = _payload_size(block)
+        if current and (len(current) >= max_children or current_size + size > max_bytes):
+            chunks.append(current)
+            current, current_size = [], 0
+        current.append(block)
+        current_size += size
+    if current:
+        chunks.append(current)
+    return chunks
+
+def _retry_after(error) -> Optional[float]:
+    headers = getattr(error, "headers", None) or {}
+    try:
+        return float(headers.get("retry-after") or headers.get("Retry-After"))
+    except (TypeError, ValueError):
+        return None
+
+def _is_retryable(error, idempotent: bool = True) -> bool:
+    """Whether to resend a failed request as is (only if it can't have been applied, when not idempotent)."""
+    status = getattr(error, "status", None)
+    if not idempotent:
+        return status == 429 or (status is None and type(error).__name__ in CONNECT_ERRORS)
+    if status is not None:
+        return status in RETRY_STATUSES
+    # notion_client raises RequestTimeoutError / httpx errors without a status
+    return type(error).__name__ in ("RequestTimeoutError", "ReadTimeout", "RemoteProtocolError") + CONNECT_ERRORS
+
+def _is_ambiguous(error) -> bool:
+    """A failure after which a non-idempotent request may or may not have been applied."""
+    return _is_retryable(error) and not _is_retryable(error, idempotent=False)
+
+def _retry_delay(error, attempt: int) -> float:
+    delay = _retry_after(error)
+    if delay is None:
+        delay = min(30.0, 0.5 * 2 ** attempt) + random.uniform(0, 0.25)
+    return delay
+
+# --- request plans ----------------------------------------------------------
+
+Plan = Generator
+
+def _landed(children: List[Dict], chunk: List[Dict], after: Optional[str]) -> Optional[List[Dict]]:
+    """The children an append of `chunk` created, if it was applied (after `after`, else at the end)."""
+    if after:
+        ids = [child["id"] for child in children]
+        if after not in ids:
+            return None
+        start = ids.index(after) + 1
+    else:
+        start = len(children) - len(chunk)
+    candidates = children[start:start + len(chunk)] if start >= 0 else []
+    if len(candidates) == len(chunk) and all(
+            _block_signature(old) == _block_signature(new) for old, new in zip(candidates, chunk)):
+        return candidates
+    return None
+
+def _append_chunk_plan(block_id: str, chunk: List[Dict], after: Optional[str] = None) -> Plan:
+    """One append request; after an ambiguous failure, re-list the children and re-send only if it didn't land."""
+    kwargs = {"block_id": block_id, "children": chunk}
+    if after:
+        kwargs["after"] = after
+    for attempt in range(RECONCILE_ATTEMPTS + 1):
+        try:
+            response = yield "blocks.children.append", kwargs
+            return response.get("results", [])
+        except Exception as e:
+            if attempt == RECONCILE_ATTEMPTS or not _is_ambiguous(e):
+                raise
+            children = yield from _list_children_plan(block_id)
+            landed = _landed(children, chunk, after)
+            if landed is not None:
+                return landed
+            print(f"⏳ Append to {block_id} failed ({e}) and didn't land; sending it again")
+
+def _append_plan(block_id: str, blocks: List[Dict], after: Optional[str] = None) -> Plan:
+    """Append blocks under block_id (after a given child, if set); returns the created blocks."""
+    created = []
+    for chunk in chunk_blocks(blocks):
+        results = yield from _append_chunk_plan(block_id, chunk, after)
+        created.extend(results)
+        if after and results:
+            after = results[-1]["id"]
+    return created
+
+def _list_children_plan(block_id: str) -> Plan:
+    """All direct children of a block, following pagination."""
+    children, cursor = [], None
+    while True:
+        kwargs = {"block_id": block_id, "page_size": 100}
+        if cursor:
+            kwargs["start_cursor"] = cursor
+        response = yield "blocks.children.list", kwargs
+        children.extend(response.get("results", []))
+        if not response.get("has_more"):
+            return children
+        cursor = response.get("next_cursor")
+
+def _find_page_plan(database_id: str, date: str) -> Plan:
+    """The database row whose Date property is `date`, if one exists."""
+    response = yield "databases.query", {"database_id": database_id,
+                                         "filter": {"property": "Date", "date": {"equals": date}},
+                                         "page_size": 1}
+    results = response.get("results", [])
+    return results[0] if results else None
+
+def _created_page_plan(parent: Dict, properties: Dict, since: str) -> Plan:
+    """The database row with these properties' Date created at or after `since`, if any."""
+    date = ((properties.get("Date") or {}).get("date") or {}).get("start")
+    if parent.get("type") != "database_id" or not date:
+        return None
+    response = yield "databases.query", {
+        "database_id": parent["database_id"],
+        "filter": {"and": [{"property": "Date", "date": {"equals": date}},
+                           {"timestamp": "created_time", "created_time": {"on_or_after": since}}]},
+        "page_size": 1
+    }
+    results = response.get("results", [])
+    return results[0] if results else None
+
+def _create_page_plan(parent: Dict, properties: Dict, blocks: List[Dict]) -> Plan:
+    """Create a page with all its blocks, or archive it if any block request fails.
+
+    If the create request fails ambiguously, the database is queried for a row
+    with the page's Date created since the first attempt before sending it again.
+    """
+    chunks = chunk_blocks(blocks)
+    first, rest = (chunks[0], chunks[1:]) if chunks else ([], [])
+    # Notion rounds created_time down to the minute
+    since = time.strftime("%Y-%m-%dT%H:%M:00Z", time.gmtime())
+    for attempt in range(RECONCILE_ATTEMPTS + 1):
+        try:
+            page = yield "pages.create", {"parent": parent, "properties": properties, "children": first}
+            break
+        except Exception as e:
+            if attempt == RECONCILE_ATTEMPTS or not _is_ambiguous(e):
+                raise
+            page = yield from _created_page_plan(parent, properties, since)
+            if page is not None:
+                break
+            print(f"⏳ Page create failed ({e}) and no page was created; sending it again")
+    try:
+        for chunk in rest:
+            yield from _append_chunk_plan(page["id"], chunk)
+    except Exception:
+        try:
+            yield "pages.update", {"page_id": page["id"], "archived": True}
+            print(f"🗑️ Archived partially written page {page['id']}")
+        except Exception as archive_error:
+            print(f"⚠️ Could not archive partial page {page['id']}: {archive_error}")
+        raise
+    return page
+
+def _sync_blocks_plan(page_id: str, blocks: List[Dict]) -> Plan:
+    """Make a page's children match `blocks`, touching only the blocks that differ.
+
+    Existing and new blocks are compared by type and text/links; unchanged
+    blocks are left alone, changed ones are updated in place, and the rest
+    are inserted after their predecessor or deleted.
+    """
+    existing = yield from _list_children_plan(page_id)
+    stats = {"unchanged": 0, "updated": 0, "inserted": 0, "deleted": 0}
+    deleted = set()
+    anchor = None  # id of the last block already in its final position
+
+    def delete(old_blocks):
+        for block in old_blocks:
+            yield "blocks.delete", {"block_id": block["id"]}
+            deleted.add(block["id"])
+            stats["deleted"] += 1
+
+    matcher = difflib.SequenceMatcher(a=[_block_signature(b) for b in existing],
+                                      b=[_block_signature(b) for b in blocks], autojunk=False)
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag == "equal":
+            stats["unchanged"] += i2 - i1
+            anchor = existing[i2 - 1]["id"]
+            continue
+        # Update replaced blocks in place while the block type allows it
+        pairs = list(zip(existing[i1:i2], blocks[j1:j2])) if tag == "replace" else []
+        inserts = []
+        for old, new in pairs:
+            if old["type"] == new["type"] and not inserts:
+                yield "blocks.update", {"block_id": old["id"], new["type"]: new[new["type"]]}
+                stats["updated"] += 1
+                anchor = old["id"]
+            else:
+                yield from delete([old])
+                inserts.append(new)
+        yield from delete(existing[i1 + len(pairs):i2])
+        inserts += blocks[j1 + len(pairs):j2]
+        if not inserts:
+            continue
+        if anchor is None and any(b["id"] not in deleted for b in existing):
+            # Notion can only insert after an existing block, not at the top of a
+            # page: rewrite the page body instead
+            yield from delete([b for b in existing if b["id"] not in deleted])
+            yield from _append_plan(page_id, blocks)
+            return {"unchanged": 0, "updated": 0, "inserted": len(blocks), "deleted": stats["deleted"]}
+        created = yield from _append_plan(page_id, inserts, after=anchor)
+        stats["inserted"] += len(inserts)
+        if created:
+            anchor = created[-1]["id"]
+    return stats
+
+def _upsert_page_plan(database_id: str, date: str, properties: Dict, blocks: List[Dict]) -> Plan:
+    """Update the day's page in place if it exists, otherwise create it.
+
+    Returns (page, stats) where stats counts the blocks touched (None for a new page).
+    Row properties that differ from `properties` are updated too.
+    """
+    page = yield from _find_page_plan(database_id, date)
+    if page is None:
+        page = yield from _create_page_plan({"type": "database_id", "database_id": database_id}, properties, blocks)
+        return page, None
+    changed = _changed_properties(page.get("properties") or {}, properties)
+    if changed:
+        yield "pages.update", {"page_id": page["id"], "properties": changed}
+    stats = yield from _sync_blocks_plan(page["id"], blocks)
+    return page, stats
+
+def _rich_text_signature(rich_text: List[Dict]):
+    parts = []
+    for item in rich_text:
+        text = item.get("text") or {}
+        content = text.get("content", item.get("plain_text", ""))
+        link = (text.get("link") or {}).get("url")
+        styles = tuple(sorted(k for k, v in (item.get("annotations") or {}).items() if v is True))
+        parts.append((content, link, styles))
+    return tuple(parts)
+
+def _block_signature(block: Dict):
+    """What makes two blocks equal for diffing: type plus text, links and styles.
+
+    Only fields the compiler (notion_blocks.py) sets count; blocks read back from
+    Notion carry API defaults such as is_toggleable and color that ours never have.
+    """
+    block_type = block.get("type")
+    body = block.get(block_type) or {}
+    return (block_type, _rich_text_signature(body.get("rich_text", [])),
+            tuple(body.get(field) for field in COMPILED_FIELDS))
+
+def _property_signature(prop: Dict):
+    """What makes two row property values equal, whether ours or read back from Notion (with ids and defaults)."""
+    kind = prop.get("type") or next((key for key in prop if key != "id"), None)
+    value = prop.get(kind)
+    if kind in ("title", "rich_text"):
+        return kind, _rich_text_signature(value or [])
+    if kind == "date":
+        return kind, ((value or {}).get("start"), (value or {}).get("end"))
+    if kind == "select":
+        return kind, (value or {}).get("name")
+    if kind == "multi_select":
+        return kind, tuple(sorted(option.get("name") for option in value or []))
+    return kind, value
+
+def _changed_properties(existing: Dict, properties: Dict) -> Dict:
+    """The entries of `properties` whose value differs from the page's `existing` properties."""
+    return {name: prop for name, prop in properties.items()
+            if name not in existing or _property_signature(existing[name]) != _property_signature(prop)}
+
+# --- runners -----------------------------------------------------------------
+
+class NotionPublisher:
+    """Wraps a notion_client.Client with rate limiting, retries and atomic page creation."""
+
+    def __init__(self, client, limiter: Optional[TokenBucket] = None, max_retries: int = 5):
+        self.client = client
+        self.limiter = limiter or shared_limiter
+        self.max_retries = max_retries
+        self.requests = 0
+        self.retries = 0
+
+    def _endpoint(self, name: str) -> Callable:
+        target = self.client
+        for part in name.split("."):
+            target = getattr(target, part)
+        return target
+
+    def request(self, method: Callable, idempotent: bool = True, **kwargs):
+        """Call a Notion endpoint through the limiter, retrying rate limits and server errors.
+
+        Non-idempotent calls are only retried here when they can't have been applied;
+        their plans reconcile other failures.
+        """
+        for attempt in range(self.max_retries + 1):
+            self.limiter.acquire()
+            self.requests += 1
+            tracing.set_attributes(retries=attempt)
+            try:
+                return method(**kwargs)
+            except Exception as e:
+                if attempt == self.max_retries or not _is_retryable(e, idempotent):
+                    raise
+                delay = _retry_delay(e, attempt)
+                self.retries += 1
+                print(f"⏳ Notion request failed ({e}); retrying in {delay:.1f}s")
+                if getattr(e, "status", None) == 429:
+                    self.limiter.pause(delay)  # The next acquire() waits it out, for every caller
+                else:
+                    time.sleep(delay)
+
+    def run(self, plan: Plan):
+        """Execute a request plan, feeding each response (or error) back into it."""
+        response, error = None, None
+        while True:
+            try:
+                endpoint, kwargs = plan.throw(error) if error else plan.send(response)
+            except StopIteration as done:
+                return done.value
+            try:
+                with tracing.span("notion.request", endpoint=endpoint, blocks=len(kwargs["children"]) if "children" in kwargs else None):
+                    response, error = self.request(self._endpoint(endpoint), endpoint not in NON_IDEMPOTENT,
+                                                   **kwargs), None
+            except Exception as e:
+                response, error = None, e
+
+    def append_blocks(self, block_id: str, blocks: List[Dict], after: Optional[str] = None) -> List[Dict]:
+        return self.run(_append_plan(block_id, blocks, after))
+
+    def list_children(self, block_id: str) -> List[Dict]:
+        return self.run(_list_children_plan(block_id))
+
+    def find_page_by_date(self, database_id: str, date: str) -> Optional[Dict]:
+        return self.run(_find_page_plan(database_id, date))
+
+    def create_page(self, parent: Dict, properties: Dict, blocks: List[Dict]) -> Dict:
+        return self.run(_create_page_plan(parent, properties, blocks))
+
+    def sync_blocks(self, page_id: str, blocks: List[Dict]) -> Dict[str, int]:
+        return self.run(_sync_blocks_plan(page_id, blocks))
+
+    def upsert_page(self, database_id: str, date: str, properties: Dict, blocks: List[Dict]):
+        return self.run(_upsert_page_plan(database_id, date, properties, blocks))
+
+class AsyncNotionPublisher(NotionPublisher):
+    """Same operations on notion_client.AsyncClient, for publishing many pages concurrently.
+
+    Every public method is a coroutine here.
+    """
+
+    async def request(self, method: Callable, idempotent: bool = True, **kwargs):
+        for attempt in range(self.max_retries + 1):
+            await self.limiter.acquire_async()
+            self.requests += 1
+            tracing.set_attributes(retries=attempt)
+            try:
+                return await method(**kwargs)
+            except Exception as e:
+                if attempt == self.max_retries or not _is_retryable(e, idempotent):
+                    raise
+                delay = _retry_delay(e, attempt)
+                self.retries += 1
+                print(f"⏳ Notion request failed ({e}); retrying in {delay:.1f}s")
+                if getattr(e, "status", None) == 429:
+                    self.limiter.pause(delay)
+                else:
+                    await asyncio.sleep(delay)
+
+    async def run(self, plan: Plan):
+        response, error = None, None
+        while True:
+            try:
+                endpoint, kwargs = plan.throw(error) if error else plan.send(response)
+            except StopIteration as done:
+                return done.value
+            try:
+                with tracing.span("notion.request", endpoint=endpoint, blocks=len(kwargs["children"]) if "children" in kwargs else None):
+                    response, error = await self.request(self._endpoint(endpoint), endpoint not in NON_IDEMPOTENT,
+                                                         **kwargs), None
+            except Exception as e:
+                response, error = None, e
@@ -0,0 +1,109 @@
+import os
+import json
+import time
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+# Memo of parsed feed bodies. Many servers ignore conditional GET and send the
+# same 200 body on every poll; instead of re-running feedparser and
+# BeautifulSoup over it, a parse job is looked up by a BLAKE2 hash of its body
+# plus everything else that shapes the output (parser version, kind, source,
+# URL, entry limit) and answered with the update records extracted last time.
+# Recent entries live in an in-memory LRU, backed by small JSON files on disk
+# so the memo survives restarts; files past MEMO_TTL are deleted when read and
+# by an hourly sweep from put(), so the directory doesn't grow with every
+# distinct body ever seen. Records are reused verbatim, so items the
+# parsers stamp with today's date keep the date of their first parse.
+
+MEMO_DIR = os.getenv("PARSE_MEMO_DIR", "data/cache/parsed")
+MEMO_SIZE = 1024          # entries kept in memory
+MEMO_TTL = 30 * 24 * 3600  # disk entries older than this are ignored and deleted
+SWEEP_INTERVAL = 3600      # seconds between sweeps of expired disk entries
+
+def body_hash(body: bytes) -> str:
+    return hashlib.blake2b(body, digest_size=16).hexdigest()
+
+class ParseMemo:
+    """LRU + on-disk map from (parser version, job, body hash) to parsed updates."""
+
+    def __init__(self, version: int, path: Optional[str] = None, size: int = MEMO_SIZE):
+        self.version = version
+        self.path = path or MEMO_DIR
+        self.size = size
+        self._entries: "OrderedDict[str, List[Dict]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self._swept_at = 0.0
+
+    def key(self, job: Tuple) -> str:
+        kind, source, url, limit, body = job
+        shape = f"{self.version}\0{kind}\0{source}\0{url}\0{limit}\0".encode("utf-8")
+        return hashlib.blake2b(shape + body_hash(body).encode("ascii"), digest_size=16).hexdigest()
+
+    def _file(self, key: str) -> str:
+        return os.path.join(self.path, key[:2], f"{key}.json")
+
+    def get(self, key: str) -> Optional[List[Dict]]:
+        with self._lock:
+            records = self._entries.get(key)
+            if records is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return [dict(record) for record in records]
+        try:
+            path = self._file(key)
+            if time.time() - os.path.getmtime(path) > MEMO_TTL:
+                os.remove(path)
+                raise OSError("expired")
+            with open(path, "r", encoding="utf-8") as f:
+                records = json.load(f)
+        except (OSError, ValueError):
+            with self._lock:
+                self.misses += 1
+            return None
+        with self._lock:
+            self.hits += 1
+            self._remember(key, records)
+        return [dict(record) for record in records]
+
+    def put(self, key: str, records: List[Dict]):
+        with self._lock:
+            self._remember(key, [dict(record) for record in records])
+        path = self._file(key)
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(records, f, ensure_ascii=False, separators=(",", ":"))
+            os.replace(tmp_path, path)
+        except OSError:
+            pass  # The in-memory entry still saves the next parse this run
+        if time.time() - self._swept_at > SWEEP_INTERVAL:
+            self.sweep()
+
+    def sweep(self) -> int:
+        """Delete disk entries (and leftover temp files) older than MEMO_TTL; returns how many."""
+        self._swept_at = now = time.time()
+        removed = 0
+        for root, _, files in os.walk(self.path):
+            for name in files:
+                path = os.path.join(root, name)
+                try:
+                    if now - os.path.getmtime(path) > MEMO_TTL:
+                        os.remove(path)
+                        removed += 1
+                except OSError:
+                    pass  # Removed by another process meanwhile
+        return removed
+
+    def _remember(self, key: str, records: List[Dict]):
+        self._entries[key] = records
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.size:
+            self._entries.popitem(last=False)
+
+    def stats(self) -> Dict[str, int]:
+        return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses}
@@ -0,0 +1,56 @@
+import os
+import json
+from typing import Dict, List, Optional
+
+from github_stars import momentum
+
+# Brief profiles: one per reader persona. A profile sets the keywords used to
+# rank the shared pool of updates, optional agent goal/backstory/rubric
+# overrides, per-role model routing overrides and the Notion database to publish to.
+
+PROFILES_FILE = os.getenv("BRIEF_PROFILES_FILE", "data/profiles.json")
+
+def load_profiles(path=None) -> Dict[str, Dict]:
+    """Load all profile definitions, keyed by name."""
+    with open(path or PROFILES_FILE, "r", encoding="utf-8") as f:
+        profiles = json.load(f)
+    for name, profile in profiles.items():
+        profile["name"] = name
+    return profiles
+
+def get_profile(name: str, path=None) -> Dict:
+    profiles = load_profiles(path)
+    if name not in profiles:
+        raise ValueError(f"Unknown profile '{name}' (available: {', '.join(profiles)})")
+    return profiles[name]
+
+def agent_setting(profile: Optional[Dict], role: str, field: str, default):
+    """A profile's override for one agent field (goal, backstory, rubric), or the default."""
+    if not profile:
+        return default
+    return profile.get("agents", {}).get(role, {}).get(field, default)
+
+def notion_database_id(profile: Optional[Dict]) -> Optional[str]:
+    env_name = (profile or {}).get("notion_database_env", "NOTION_DATABASE_ID")
+    return os.getenv(env_name)
+
+def score_update(update: Dict, keywords: Dict[str, float]) -> float:
+    """Keyword relevance of an update for a profile; title matches count double.
+
+    Trending repos also get a star-momentum bonus (see github_stars.momentum).
+    """
+    title = (update.get("title") or update.get("name") or "").lower()
+    body = " ".join(str(update.get(field, "")) for field in ("summary", "description")).lower()
+    score = 0.0
+    for keyword, weight in keywords.items():
+        if keyword in title:
+            score += 2 * weight
+        elif keyword in body:
+            score += weight
+    return score + momentum(update)
+
+def rank_for_profile(updates: List[Dict], profile: Dict, limit: int = 15) -> List[Dict]:
+    """Shortlist the updates that best match a profile's keywords (ties keep collection order)."""
+    keywords = profile.get("keywords", {})
+    ranked = sorted(enumerate(updates), key=lambda item: (-score_update(item[1], keywords), item[0]))
+    return [update for _, update in ranked[:limit]]
@@ -0,0 +1,145 @@
+import os
+import sys
+import time
+import threading
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime
+from typing import Dict, Optional
+
+# Built-in profiling for pipeline runs (brief_cli.py --profile-run). Pipeline
+# code marks its stages with `with profiling.stage("fetch"):`, which costs
+# nothing unless a profiler is active. An active profiler records wall and CPU
+# time per stage (nested stages are named "collect/fetch") and, with dumps
+# enabled, also runs cProfile on the main thread and a stack sampler over every
+# thread, written out as pstats and as collapsed stacks ("a;b;c count" lines,
+# the input format of flamegraph.pl and speedscope).
+
+SAMPLE_INTERVAL = 0.005
+
+active: Optional["Profiler"] = None
+_path: ContextVar[tuple] = ContextVar("profiling_path", default=())
+
+@contextmanager
+def stage(name: str):
+    """Time a pipeline stage if profiling is on."""
+    profiler = active
+    if profiler is None:
+        yield
+        return
+    path = _path.get() + (name,)
+    token = _path.set(path)
+    profiler.row("/".join(path))  # Parents are listed before the stages nested in them
+    wall, cpu = time.perf_counter(), time.process_time()
+    try:
+        yield
+    finally:
+        profiler.record("/".join(path), time.perf_counter() - wall, time.process_time() - cpu)
+        _path.reset(token)
+
+class StackSampler:
+    """Samples every thread's Python stack on an interval into collapsed-stack counts."""
+
+    def __init__(self, interval: float = SAMPLE_INTERVAL):
+        self.interval = interval
+        self.counts: Counter = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="stack-sampler", daemon=True)
+
+    def _run(self):
+        own = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for ident, frame in sys._current_frames().items():
+                if ident == own:
+                    continue
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+                    frame = frame.f_back
+                stack.append(names.get(ident, f"thread-{ident}"))
+                self.counts[";".join(reversed(stack))] += 1
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def write(self, path: str):
+        with open(path, "w", encoding="utf-8") as f:
+            for stack, count in self.counts.most_common():
+                f.write(f"{stack} {count}\n")
+
+class Profiler:
+    """Per-stage wall/CPU timings for one CLI run, plus optional cProfile and stack samples."""
+
+    def __init__(self, dump: bool = False):
+        self.dump = dump
+        self.stages: Dict[str, Dict] = {}  # insertion order = first time each stage ran
+        self._lock = threading.Lock()
+        self._cprofile = None
+        self._sampler = None
+        self.started_at = datetime.now()
+        self._wall = self._cpu = 0.0
+
+    def row(self, name: str) -> Dict:
+        with self._lock:
+            return self.stages.setdefault(name, {"calls": 0, "wall": 0.0, "cpu": 0.0})
+
+    def record(self, name: str, wall: float, cpu: float):
+        row = self.row(name)
+        with self._lock:
+            row["calls"] += 1
+            row["wall"] += wall
+            row["cpu"] += cpu
+
+    def start(self):
+        global active
+        active = self
+        self.row("total")
+        if self.dump:
+            import cProfile
+            self._cprofile = cProfile.Profile()
+            self._sampler = StackSampler().start()
+            self._cprofile.enable()
+        self._wall, self._cpu = time.perf_counter(), time.process_time()
+        return self
+
+    def stop(self):
+        global active
+        self.record("total", time.perf_counter() - self._wall, time.process_time() - self._cpu)
+        if self._cprofile is not None:
+            self._cprofile.disable()
+            self._sampler.stop()
+        active = None
+
+    def table(self) -> str:
+        """The timings as a compact Markdown table."""
+        lines = ["| Stage | Calls | Wall (s) | CPU (s) | CPU % |", "|---|---:|---:|---:|---:|"]
+        for name, row in self.stages.items():
+            depth = 0 if name == "total" else name.count("/")
+            busy = 100 * row["cpu"] / row["wall"] if row["wall"] else 0
+            lines.append(f"| {'  ' * depth}{name.rsplit('/', 1)[-1]} | {row['calls']} | "
+                         f"{row['wall']:.2f} | {row['cpu']:.2f} | {busy:.0f}% |")
+        return "\n".join(lines)
+
+    def write_report(self, directory: str, command: str) -> str:
+        """Append the timing table (and dump files, if enabled) under a run directory."""
+        os.makedirs(directory, exist_ok=True)
+        report_path = os.path.join(directory, "report.md")
+        with open(report_path, "a", encoding="utf-8") as f:
+            f.write(f"\n## ⏱️ Timing: `{command}` at {self.started_at.isoformat(timespec='seconds')}\n\n")
+            f.write("CPU is process-wide (all threads), so concurrent stages overlap.\n\n")
+            f.write(self.table() + "\n")
+        if self._cprofile is not None:
+            profile_dir = os.path.join(directory, "profile")
+            os.makedirs(profile_dir, exist_ok=True)
+            stamp = self.started_at.strftime("%H%M%S")
+            self._cprofile.dump_stats(os.path.join(profile_dir, f"{command}-{stamp}.pstats"))
+            self._sampler.write(os.path.join(profile_dir, f"{command}-{stamp}.folded"))
+        return report_path
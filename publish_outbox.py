@@ -0,0 +1,222 @@
+import os
+import json
+import time
+import sqlite3
+import threading
+from datetime import datetime
+from typing import Callable, Dict, Optional
+
+# Durable publish outbox. Rendered briefs are enqueued here instead of being
+# pushed to Notion inline, so brief generation never blocks on (or loses a
+# brief to) a Notion outage or an expired token. A worker drains the queue,
+# retrying failures with exponential backoff and moving briefs that keep
+# failing to a dead-letter state that `brief_cli.py outbox retry` requeues.
+
+OUTBOX_DB = os.getenv("BRIEF_OUTBOX_DB", "data/outbox.db")
+MAX_ATTEMPTS = 8
+BASE_DELAY = 60          # seconds before the first retry, doubling per attempt
+MAX_DELAY = 6 * 3600
+LEASE_SECONDS = 15 * 60  # an in-progress item not finished by then is claimable again
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS outbox (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    key TEXT NOT NULL UNIQUE,
+    payload TEXT NOT NULL,
+    next_payload TEXT,
+    status TEXT NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    next_attempt_at REAL NOT NULL,
+    claimed_at REAL,
+    last_error TEXT,
+    result TEXT,
+    created_at TEXT NOT NULL,
+    updated_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS outbox_due ON outbox (status, next_attempt_at);
+"""
+
+def _now_iso():
+    return datetime.now().isoformat(timespec="seconds")
+
+def retry_delay(attempts: int) -> float:
+    return min(MAX_DELAY, BASE_DELAY * 2 ** max(0, attempts - 1))
+
+class Outbox:
+    """SQLite-backed queue of briefs waiting to be published."""
+
+    def __init__(self, path: str = None):
+        self.path = path or OUTBOX_DB
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        with self._connect() as conn:
+            conn.executescript(SCHEMA)
+            columns = {row["name"] for row in conn.execute("PRAGMA table_info(outbox)")}
+            if "next_payload" not in columns:  # Outboxes created before re-enqueueing in-flight items was handled
+                conn.execute("ALTER TABLE outbox ADD COLUMN next_payload TEXT")
+
+    def _connect(self):
+        # One connection per operation keeps the outbox safe to use from several threads
+        conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA journal_mode=WAL")
+        return conn
+
+    def enqueue(self, key: str, payload: Dict) -> int:
+        """Queue a brief for publishing.
+
+        Re-enqueueing a pending or dead key replaces its payload and resets it. An
+        item being published keeps its claim and gets the new payload queued once it
+        completes; a published item is only queued again if the payload changed.
+        """
+        now, body = _now_iso(), json.dumps(payload, ensure_ascii=False)
+        with self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            row = conn.execute("SELECT id, status, payload FROM outbox WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                item_id = conn.execute(
+                    "INSERT INTO outbox (key, payload, next_attempt_at, created_at, updated_at) VALUES (?, ?, ?, ?, ?)",
+                    (key, body, time.time(), now, now)).lastrowid
+            else:
+                item_id = row["id"]
+                if row["status"] == "in_progress":
+                    conn.execute("UPDATE outbox SET next_payload = ?, updated_at = ? WHERE id = ?", (body, now, item_id))
+                elif row["status"] != "done" or row["payload"] != body:
+                    conn.execute(
+                        """UPDATE outbox SET payload = ?, next_payload = NULL, status = 'pending', attempts = 0,
+                               next_attempt_at = ?, claimed_at = NULL, last_error = NULL, updated_at = ? WHERE id = ?""",
+                        (body, time.time(), now, item_id))
+            conn.execute("COMMIT")
+            return item_id
+
+    def claim(self, key: Optional[str] = None) -> Optional[sqlite3.Row]:
+        """Atomically take the next due item (or one whose worker died mid-publish), only `key` if given."""
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            row = conn.execute(
+                """SELECT * FROM outbox
+                   WHERE ((status = 'pending' AND next_attempt_at <= ?)
+                       OR (status = 'in_progress' AND claimed_at <= ?))
+                     AND (? IS NULL OR key = ?)
+                   ORDER BY next_attempt_at LIMIT 1""",
+                (now, now - LEASE_SECONDS, key, key)).fetchone()
+            if row is not None:
+                conn.execute("UPDATE outbox SET status = 'in_progress', claimed_at = ?, updated_at = ? WHERE id = ?",
+                             (now, _now_iso(), row["id"]))
+            conn.execute("COMMIT")
+            return row
+
+    def complete(self, item_id: int, result: Optional[Dict] = None):
+        """Mark an item published, or queue the payload enqueued while it was being published."""
+        with self._connect() as conn:
+            conn.execute(
+                """UPDATE outbox SET status = CASE WHEN next_payload IS NULL THEN 'done' ELSE 'pending' END,
+                       payload = COALESCE(next_payload, payload), next_payload = NULL, attempts = 0,
+                       next_attempt_at = ?, claimed_at = NULL, result = ?, updated_at = ? WHERE id = ?""",
+                (time.time(), json.dumps(result or {}), _now_iso(), item_id))
+
+    def fail(self, item_id: int, error: str) -> str:
+        """Record a failed attempt; returns the item's new status ('pending' or 'dead')."""
+        with self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            attempts = conn.execute("SELECT attempts FROM outbox WHERE id = ?", (item_id,)).fetchone()["attempts"] + 1
+            status = "dead" if attempts >= MAX_ATTEMPTS else "pending"
+            # A payload enqueued meanwhile is what the retry should publish
+            conn.execute(
+                """UPDATE outbox SET status = ?, attempts = ?, next_attempt_at = ?, claimed_at = NULL,
+                       payload = COALESCE(next_payload, payload), next_payload = NULL,
+                       last_error = ?, updated_at = ? WHERE id = ?""",
+                (status, attempts, time.time() + retry_delay(attempts), error[:2000], _now_iso(), item_id))
+            conn.execute("COMMIT")
+            return status
+
+    def retry_dead(self) -> int:
+        """Move dead-lettered items back to pending; returns how many."""
+        with self._connect() as conn:
+            return conn.execute(
+                "UPDATE outbox SET status = 'pending', attempts = 0, next_attempt_at = ?, updated_at = ? WHERE status = 'dead'",
+                (time.time(), _now_iso())).rowcount
+
+    def status(self, key: str) -> Optional[str]:
+        with self._connect() as conn:
+            row = conn.execute("SELECT status FROM outbox WHERE key = ?", (key,)).fetchone()
+            return row["status"] if row else None
+
+    def stats(self) -> Dict[str, int]:
+        with self._connect() as conn:
+            rows = conn.execute("SELECT status, COUNT(*) AS n FROM outbox GROUP BY status").fetchall()
+            return {row["status"]: row["n"] for row in rows}
+
+    def items(self, status: Optional[str] = None):
+        with self._connect() as conn:
+            if status:
+                return conn.execute("SELECT * FROM outbox WHERE status = ? ORDER BY id", (status,)).fetchall()
+            return conn.execute("SELECT * FROM outbox ORDER BY id").fetchall()
+
+def publish_item(payload: Dict) -> Dict:
+    """Default publisher: push the queued brief to Notion and write the run's receipt."""
+    import notion_integration
+    if not notion_integration.push_to_notion(payload["brief"], database_id=payload.get("database_id"),
+                                             upsert=payload.get("upsert", True), raise_errors=True):
+        raise RuntimeError("Notion is not configured (NOTION_TOKEN / database ID missing)")
+    receipt = {"published_at": _now_iso()}
+    if payload.get("receipt"):
+        from run_store import RunStore
+        RunStore(payload["receipt"]["date"], root=payload["receipt"]["root"]).save("published", receipt)
+    return receipt
+
+def drain(outbox: Outbox, publish: Callable[[Dict], Dict] = publish_item, limit: Optional[int] = None,
+          key: Optional[str] = None) -> Dict[str, int]:
+    """Publish every due item (or just `key`) once; returns counts of published, retrying and dead items."""
+    counts = {"published": 0, "retrying": 0, "dead": 0}
+    while limit is None or sum(counts.values()) < limit:
+        item = outbox.claim(key)
+        if item is None:
+            break
+        try:
+            result = publish(json.loads(item["payload"]))
+        except Exception as e:
+            status = outbox.fail(item["id"], str(e))
+            if status == "dead":
+                counts["dead"] += 1
+                print(f"☠️ Outbox: {item['key']} failed {MAX_ATTEMPTS} times, moved to dead letters ({e})")
+            else:
+                counts["retrying"] += 1
+                print(f"⏳ Outbox: {item['key']} failed ({e}); retrying in {retry_delay(item['attempts'] + 1):.0f}s")
+            continue
+        outbox.complete(item["id"], result)
+        counts["published"] += 1
+        print(f"📬 Outbox: published {item['key']}")
+    return counts
+
+class OutboxWorker:
+    """Background thread that keeps draining the outbox."""
+
+    def __init__(self, outbox: Optional[Outbox] = None, interval: float = 30, publish=publish_item):
+        self.outbox = outbox or Outbox()
+        self.interval = interval
+        self.publish = publish
+        self._stop = threading.Event()
+        self._wake = threading.Event()
+        self._thread = None
+
+    def _loop(self):
+        while not self._stop.is_set():
+            try:
+                drain(self.outbox, self.publish)
+            except Exception as e:
+                print(f"⚠️ Outbox worker error: {e}")
+            self._wake.wait(self.interval)
+            self._wake.clear()
+
+    def start(self):
+        self._thread = threading.Thread(target=self._loop, name="outbox", daemon=True)
+        self._thread.start()
+        return self
+
+    def wake(self):
+        self._wake.set()
+
+    def stop(self):
+        self._stop.set()
+        self._wake.set()
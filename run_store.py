@@ -0,0 +1,101 @@
+import os
+import json
+from datetime import datetime
+from typing import Any, List, Optional
+
+# Every pipeline stage persists its output under runs/<date>/<stage>.json so a
+# run keyed by date can resume from the last completed stage after a failure.
+
+ARTIFACT_VERSION = 1
+
+# In pipeline order
+STAGES = (
+    "updates",      # raw collected updates
+    "shortlist",    # ranked updates handed to the agents
+    "signals",      # Signal Hunter output
+    "scores",       # Relevance Scorer output
+    "actions",      # Action Generator output
+    "brief",        # merged structured brief
+    "markdown",     # rendered Markdown brief
+    "published"     # Notion publish receipt
+)
+
+def list_run_dates(root: str = "runs") -> List[str]:
+    """Dates that have a run directory under root, oldest first."""
+    try:
+        names = os.listdir(root)
+    except FileNotFoundError:
+        return []
+    dates = []
+    for name in names:
+        try:
+            datetime.strptime(name, "%Y-%m-%d")
+        except ValueError:
+            continue
+        dates.append(name)
+    return sorted(dates)
+
+class RunStore:
+    """Versioned, per-date artifact store for one pipeline run."""
+
+    def __init__(self, run_date: Optional[str] = None, root: str = "runs"):
+        self.run_date = run_date or datetime.now().strftime("%Y-%m-%d")
+        self.path = os.path.join(root, self.run_date)
+
+    def artifact_path(self, stage: str) -> str:
+        return os.path.join(self.path, f"{stage}.json")
+
+    def save(self, stage: str, data: Any) -> str:
+        """Atomically write a stage artifact (write to a temp file, then rename)."""
+        if stage not in STAGES:
+            raise ValueError(f"Unknown pipeline stage: {stage}")
+        os.makedirs(self.path, exist_ok=True)
+        envelope = {
+            "version": ARTIFACT_VERSION,
+            "stage": stage,
+            "run_date": self.run_date,
+            "created_at": datetime.now().isoformat(timespec="seconds"),
+            "data": data
+        }
+        path = self.artifact_path(stage)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(envelope, f, indent=2, ensure_ascii=False)
+        os.replace(tmp_path, path)
+        return path
+
+    def _read(self, stage: str) -> Optional[dict]:
+        try:
+            with open(self.artifact_path(stage), "r", encoding="utf-8") as f:
+                envelope = json.load(f)
+        except (OSError, ValueError):
+            return None
+        # Artifacts written by an older layout are treated as missing
+        if envelope.get("version") != ARTIFACT_VERSION:
+            return None
+        return envelope
+
+    def has(self, stage: str) -> bool:
+        return self._read(stage) is not None
+
+    def load(self, stage: str, default: Any = None) -> Any:
+        envelope = self._read(stage)
+        return envelope["data"] if envelope else default
+
+    def completed_stages(self) -> List[str]:
+        return [stage for stage in STAGES if self.has(stage)]
+
+    def next_stage(self) -> Optional[str]:
+        """First stage without an artifact, i.e. where a resumed run starts."""
+        for stage in STAGES:
+            if not self.has(stage):
+                return stage
+        return None
+
+    def invalidate_from(self, stage: str):
+        """Delete the artifact for `stage` and every later stage so they are recomputed."""
+        for later in STAGES[STAGES.index(stage):]:
+            try:
+                os.remove(self.artifact_path(later))
+            except FileNotFoundError:
+                pass
@@ -0,0 +1,278 @@
+#!/usr/bin/env python3
+"""Long-running brief daemon.
+
+Instead of cold-starting from cron, the daemon keeps the interpreter, the
+crewai import, the pooled HTTP session and the conditional-GET/parsed-feed
+caches warm. Collection runs in the background on an interval and merges into
+an in-memory pool of updates; when the brief is due it is generated from that
+pool, so brief latency is just the LLM time. Rendered briefs go to the publish
+outbox, which a background worker delivers to Notion with retries. A failed scheduled
+brief is retried with exponential backoff, at most BRIEF_MAX_ATTEMPTS times a day.
+
+Control endpoint (localhost only):
+    GET  /health    liveness plus pool and cache stats
+    GET  /preview   LLM-free brief from the current pool (fast_brief.py), as JSON
+    POST /collect   trigger a background collection now
+    POST /brief     generate today's brief now from the current pool
+    POST /publish   drain the publish outbox now
+"""
+import json
+import threading
+import time
+import traceback
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# A scheduled brief that fails is retried with exponential backoff, a few times a day at most
+BRIEF_MAX_ATTEMPTS = 4
+BRIEF_RETRY_DELAY = 10 * 60  # seconds before the first retry, doubling per attempt
+BRIEF_MAX_RETRY_DELAY = 2 * 3600
+
+class BriefDaemon:
+    def __init__(self, collect_every=30 * 60, brief_time="07:00", runs_dir="runs", limit=15):
+        self.collect_every = collect_every
+        self.brief_time = brief_time
+        self.runs_dir = runs_dir
+        self.limit = limit
+        self.started_at = time.time()
+
+        self._pool = {}  # link -> update
+        self._pool_lock = threading.Lock()
+        self._collect_lock = threading.Lock()
+        self._brief_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._wake_collector = threading.Event()
+
+        self.last_collect = None
+        self.last_collect_seconds = None
+        self.last_brief_date = None
+        self.last_error = None
+        # Scheduled attempts today: {"date", "attempts", "next_attempt" (epoch seconds)}
+        self.brief_attempts = {"date": None, "attempts": 0, "next_attempt": 0.0}
+
+        from publish_outbox import OutboxWorker
+        self.outbox_worker = OutboxWorker()
+
+    # --- collection -------------------------------------------------------
+
+    def collect_once(self):
+        """Run one collection pass and merge it into the warm pool."""
+        if not self._collect_lock.acquire(blocking=False):
+            return False  # Already collecting
+        try:
+            from data_collector import get_real_ai_updates
+            start = time.perf_counter()
+            updates = get_real_ai_updates()
+            self._merge(updates)
+            try:
+                from trends import update_trends
+                update_trends(updates)
+            except Exception as e:
+                print(f"⚠️ Could not update trends: {e}")
+            self.last_collect = datetime.now().isoformat(timespec="seconds")
+            self.last_collect_seconds = round(time.perf_counter() - start, 2)
+            print(f"🗃️ Pool now holds {self.pool_size()} updates (collected in {self.last_collect_seconds}s)")
+            return True
+        except Exception as e:
+            self.last_error = f"collect: {e}"
+            traceback.print_exc()
+            return False
+        finally:
+            self._collect_lock.release()
+
+    def _merge(self, updates):
+        cutoff = (datetime.now() - timedelta(days=30)).strftime("%Y-%m-%d")
+        with self._pool_lock:
+            for update in updates:
+                link = update.get("link")
+                if link:
+                    self._pool[link] = update
+            # Drop anything that aged out of the 30-day window
+            for link in [l for l, u in self._pool.items() if u.get("date") and u["date"] < cutoff]:
+                del self._pool[link]
+
+    def pool_snapshot(self):
+        """Pool ordered like a fresh collection pass (insertion order, newest collection last)."""
+        with self._pool_lock:
+            return list(self._pool.values())
+
+    def pool_size(self):
+        with self._pool_lock:
+            return len(self._pool)
+
+    def _collector_loop(self):
+        while not self._stop.is_set():
+            self.collect_once()
+            self._wake_collector.wait(self.collect_every)
+            self._wake_collector.clear()
+
+    # --- brief generation -------------------------------------------------
+
+    def generate_brief(self, run_date=None):
+        """Generate (or resume) the brief for a date from the warm pool."""
+        if not self._brief_lock.acquire(blocking=False):
+            return None  # Already generating
+        try:
+            from run_store import RunStore
+            import brief_cli
+
+            if not self.pool_size():
+                self.collect_once()
+
+            store = RunStore(run_date, root=self.runs_dir)
+            if not store.has("updates"):
+                store.save("updates", self.pool_snapshot())
+
+            status = brief_cli.main(["--date", store.run_date, "--runs-dir", self.runs_dir,
+                                     "--limit", str(self.limit), "--queue-only", "run"])
+            if status == 0:
+                self.last_brief_date = store.run_date
+                self.outbox_worker.wake()
+            else:
+                self.last_error = f"brief {store.run_date}: exit status {status}"
+            return status == 0
+        except Exception as e:
+            self.last_error = f"brief: {e}"
+            traceback.print_exc()
+            return False
+        finally:
+            self._brief_lock.release()
+
+    def preview(self):
+        """A brief scored locally from the current pool, without LLM calls."""
+        import fast_brief
+        start = time.perf_counter()
+        brief = fast_brief.analyze_updates(self.pool_snapshot())
+        brief["elapsed_ms"] = round((time.perf_counter() - start) * 1000, 1)
+        return brief
+
+    def _brief_due(self, now):
+        hour, minute = (int(part) for part in self.brief_time.split(":"))
+        due_at = now.replace(hour=hour, minute=minute, second=0, microsecond=0)
+        today = now.strftime("%Y-%m-%d")
+        if now < due_at or self.last_brief_date == today:
+            return False
+        attempts = self.brief_attempts
+        if attempts["date"] != today:
+            return True
+        return attempts["attempts"] < BRIEF_MAX_ATTEMPTS and now.timestamp() >= attempts["next_attempt"]
+
+    def _record_attempt(self, now, ok):
+        """Count a scheduled attempt; after a failure, wait before the next one."""
+        today = now.strftime("%Y-%m-%d")
+        if self.brief_attempts["date"] != today:
+            self.brief_attempts = {"date": today, "attempts": 0, "next_attempt": 0.0}
+        self.brief_attempts["attempts"] += 1
+        if not ok:
+            attempts = self.brief_attempts["attempts"]
+            delay = min(BRIEF_MAX_RETRY_DELAY, BRIEF_RETRY_DELAY * 2 ** (attempts - 1))
+            self.brief_attempts["next_attempt"] = now.timestamp() + delay
+            if attempts >= BRIEF_MAX_ATTEMPTS:
+                print(f"❌ Brief for {today} failed {attempts} times; no more scheduled attempts today "
+                      f"(POST /brief to retry)")
+            else:
+                print(f"🔁 Brief for {today} failed; retrying in {delay // 60} min")
+
+    def _scheduler_loop(self):
+        while not self._stop.wait(30):
+            now = datetime.now()
+            if self._brief_due(now):
+                ok = self.generate_brief()
+                if ok is not None:
+                    self._record_attempt(now, ok)
+
+    # --- lifecycle --------------------------------------------------------
+
+    def health(self):
+        from http_client import cache_stats
+        from feed_parsers import memo
+        from collection import peak_rss_mb
+        return {
+            "status": "ok",
+            "uptime_seconds": round(time.time() - self.started_at),
+            "pool_size": self.pool_size(),
+            "collecting": self._collect_lock.locked(),
+            "generating": self._brief_lock.locked(),
+            "last_collect": self.last_collect,
+            "last_collect_seconds": self.last_collect_seconds,
+            "last_brief_date": self.last_brief_date,
+            "brief_attempts": self.brief_attempts,
+            "next_brief_time": self.brief_time,
+            "last_error": self.last_error,
+            "outbox": self.outbox_worker.outbox.stats(),
+            "caches": {**cache_stats(), "parse_memo": memo.stats()},
+            "peak_rss_mb": peak_rss_mb()
+        }
+
+    def start(self):
+        # Warm the heavy imports once up front so the first brief doesn't pay for them
+        import crew_strategy_brief  # noqa: F401
+        threading.Thread(target=self._collector_loop, name="collector", daemon=True).start()
+        threading.Thread(target=self._scheduler_loop, name="scheduler", daemon=True).start()
+        self.outbox_worker.start()
+
+    def trigger_collect(self):
+        self._wake_collector.set()
+
+    def trigger_brief(self):
+        threading.Thread(target=self.generate_brief, name="brief", daemon=True).start()
+
+    def stop(self):
+        self._stop.set()
+        self._wake_collector.set()
+        self.outbox_worker.stop()
+
+def _make_handler(daemon):
+    class ControlHandler(BaseHTTPRequestHandler):
+        def _reply(self, status, payload):
+            body = json.dumps(payload).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self):
+            if self.path == "/health":
+                self._reply(200, daemon.health())
+            elif self.path == "/preview":
+                self._reply(200, daemon.preview())
+            else:
+                self._reply(404, {"error": "not found"})
+
+        def do_POST(self):
+            if self.path == "/collect":
+                daemon.trigger_collect()
+                self._reply(202, {"status": "collection triggered"})
+            elif self.path == "/brief":
+                daemon.trigger_brief()
+                self._reply(202, {"status": "brief generation triggered"})
+            elif self.path == "/publish":
+                daemon.outbox_worker.wake()
+                self._reply(202, {"status": "outbox drain triggered"})
+            else:
+                self._reply(404, {"error": "not found"})
+
+        def log_message(self, format, *args):
+            pass  # Keep the console for pipeline output
+
+    return ControlHandler
+
+def serve(port=8765, collect_every=30 * 60, brief_time="07:00", runs_dir="runs", limit=15):
+    """Start the daemon and block serving the control endpoint until interrupted."""
+    daemon = BriefDaemon(collect_every=collect_every, brief_time=brief_time, runs_dir=runs_dir, limit=limit)
+    daemon.start()
+    server = ThreadingHTTPServer(("127.0.0.1", port), _make_handler(daemon))
+    print(f"🛰️ Brief daemon listening on http://127.0.0.1:{port} "
+          f"(collect every {collect_every // 60} min, brief due at {brief_time})")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\n👋 Stopping brief daemon")
+    finally:
+        daemon.stop()
+        server.server_close()
+    return 0
+
+if __name__ == "__main__":
+    serve()
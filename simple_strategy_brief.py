@@ -1,22 +1,33 @@
 #!/usr/bin/env python3
 
 import os
-import requests
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
 from dotenv import load_dotenv
 from data_collector import get_real_ai_updates
+from brief_renderer import extract_json, build_brief_data, save_brief
+from llm_routing import get_route, usage_tracker
+from http_client import get_session
+import llm_cache
+import tracing
 from datetime import datetime
 
 load_dotenv()
 
+class LLMCallFailed(Exception):
+    """Every model in the route failed; the message is the last error."""
+
 class SimpleAIAgent:
     def __init__(self, role, goal, backstory):
         self.role = role
         self.goal = goal
         self.backstory = backstory
         self.api_key = os.getenv("OPENROUTER_API_KEY")
+        self.route = get_route(role)
         
-    def call_llm(self, prompt):
-        """Call OpenRouter API directly"""
+    def _build_request(self, prompt, model, stream=False):
+        """Build the OpenRouter chat completion request for this agent."""
         url = "https://openrouter.ai/api/v1/chat/completions"
         headers = {
             "Authorization": f"Bearer {self.api_key}",
@@ -26,24 +37,215 @@ class SimpleAIAgent:
         system_prompt = f"You are a {self.role}. {self.backstory}\n\nGoal: {self.goal}"
         
         data = {
-            "model": "meta-llama/llama-3.1-8b-instruct:free",
+            "model": model,
             "messages": [
                 {"role": "system", "content": system_prompt},
                 {"role": "user", "content": prompt}
             ],
-            "max_tokens": 1500,
-            "temperature": 0.7
+            "max_tokens": self.route["max_tokens"],
+            "temperature": self.route["temperature"],
+            # Ask OpenRouter to report token usage and cost with the response
+            "usage": {"include": True}
         }
+        if stream:
+            data["stream"] = True
         
-        try:
-            response = requests.post(url, headers=headers, json=data, timeout=60)
-            if response.status_code == 200:
-                result = response.json()
-                return result['choices'][0]['message']['content']
+        return url, headers, data
+    
+    def _record_usage(self, model, start, usage, ok=True):
+        usage = usage or {}
+        usage_tracker.record(self.role, model, time.perf_counter() - start,
+                             prompt_tokens=usage.get('prompt_tokens', 0),
+                             completion_tokens=usage.get('completion_tokens', 0),
+                             cost=usage.get('cost'), ok=ok)
+        
+    def call_llm(self, prompt, stream=False, stop_when=None):
+        """Call OpenRouter API directly, falling back through the role's model chain.
+        
+        With stream=True the response is consumed token by token (server-sent
+        events) with a live progress line, and the stream is cancelled as soon
+        as stop_when(text_so_far) returns True.
+        """
+        with tracing.span("llm.call", role=self.role, models=",".join(self.route["models"]), stream=stream) as span:
+            if stream:
+                return self._collect_stream(prompt, stop_when)
+            
+            try:
+                return llm_cache.cached_call(self._cache_key(prompt), lambda: self._complete(prompt))
+            except LLMCallFailed as e:
+                span.set(error=str(e)[:300])
+                return str(e)
+    
+    def _cache_key(self, prompt):
+        _, _, data = self._build_request(prompt, self.route["models"][0])
+        return llm_cache.cache_key(self.route["models"], data["messages"],
+                                   temperature=data["temperature"], max_tokens=data["max_tokens"])
+    
+    def _complete(self, prompt):
+        result = None
+        for retries, model in enumerate(self.route["models"]):
+            tracing.set_attributes(retries=retries)
+            url, headers, data = self._build_request(prompt, model)
+            start = time.perf_counter()
+            try:
+                response = get_session().post(url, headers=headers, json=data, timeout=self.route["timeout"])
+                if response.status_code == 200:
+                    result = response.json()
+                    self._record_usage(model, start, result.get('usage'))
+                    return result['choices'][0]['message']['content']
+                else:
+                    result = f"Error {response.status_code}: {response.text}"
+            except Exception as e:
+                result = f"Connection error: {e}"
+            self._record_usage(model, start, None, ok=False)
+            print(f"⚠️ {self.role}: {model} failed, trying next model")
+        # Raised so the error text is returned to the caller but never cached
+        raise LLMCallFailed(result)
+    
+    def _open_stream(self, prompt):
+        """Open a streaming request on the first model in the chain that accepts it."""
+        error = None
+        for model in self.route["models"]:
+            url, headers, data = self._build_request(prompt, model, stream=True)
+            start = time.perf_counter()
+            try:
+                response = get_session().post(url, headers=headers, json=data, stream=True,
+                                         timeout=self.route["timeout"])
+            except Exception as e:
+                error = f"Connection error: {e}"
             else:
-                return f"Error {response.status_code}: {response.text}"
+                if response.status_code == 200:
+                    return response, model, start, None
+                error = f"Error {response.status_code}: {response.text}"
+                response.close()
+            self._record_usage(model, start, None, ok=False)
+            print(f"⚠️ {self.role}: {model} failed, trying next model")
+        return None, None, None, error
+    
+    def stream_llm(self, prompt):
+        """Yield content deltas from OpenRouter's SSE stream as they arrive.
+        
+        Closing the generator early (e.g. breaking out of the loop) closes the
+        HTTP connection, which cancels the generation on OpenRouter's side.
+        """
+        key = self._cache_key(prompt)
+        cached = llm_cache.get(key) if llm_cache.enabled() else None
+        if cached is not None:
+            yield cached
+            return
+        
+        response, model, start, error = self._open_stream(prompt)
+        if response is None:
+            yield error
+            return
+        
+        usage = None
+        text = ""
+        try:
+            for line in response.iter_lines(decode_unicode=True):
+                # Skip keep-alives and SSE comments (": OPENROUTER PROCESSING")
+                if not line or line.startswith(':') or not line.startswith('data:'):
+                    continue
+                payload = line[len('data:'):].strip()
+                if payload == '[DONE]':
+                    # Only complete generations are cached, never cancelled ones
+                    if llm_cache.enabled() and text:
+                        llm_cache.put(key, text)
+                    break
+                try:
+                    chunk = json.loads(payload)
+                except ValueError:
+                    continue
+                if 'error' in chunk:
+                    yield f"Error: {chunk['error'].get('message', chunk['error'])}"
+                    break
+                usage = chunk.get('usage') or usage  # Sent with the final chunk
+                choices = chunk.get('choices') or [{}]
+                delta = choices[0].get('delta', {}).get('content')
+                if delta:
+                    text += delta
+                    yield delta
         except Exception as e:
-            return f"Connection error: {e}"
+            yield f"\nConnection error: {e}"
+        finally:
+            response.close()
+            self._record_usage(model, start, usage)
+    
+    def _collect_stream(self, prompt, stop_when=None):
+        """Accumulate a streamed response, showing live progress."""
+        text = ""
+        stream = self.stream_llm(prompt)
+        try:
+            for delta in stream:
+                text += delta
+                print(f"\r   ✍️  {self.role}: {len(text)} chars received", end="", flush=True)
+                if stop_when and stop_when(text):
+                    print(f"\r   ✂️  {self.role}: expected structure complete, stream cancelled", end="")
+                    break
+        finally:
+            stream.close()
+            print()
+        return text
+
+def stream_json_lines(token_stream, limit=5):
+    """Yield JSON objects from a JSON Lines token stream as soon as each line is complete.
+    
+    After `limit` objects the stream is closed, so trailing commentary is never generated.
+    If the model ignored the format (e.g. a pretty-printed or fenced array), the whole
+    response is parsed with extract_json once the stream ends.
+    """
+    buffer = ""
+    text = ""
+    emitted = 0
+    try:
+        for delta in token_stream:
+            buffer += delta
+            text += delta
+            # JSON Lines start with an object; anything else is parsed as a whole at the end
+            while '\n' in buffer and text.lstrip().startswith('{'):
+                line, buffer = buffer.split('\n', 1)
+                item = _parse_json_line(line)
+                if item is not None:
+                    yield item
+                    emitted += 1
+                    if emitted >= limit:
+                        return
+        
+        # Stream finished: the last line may not end with a newline
+        item = _parse_json_line(buffer) if '\n' not in buffer.strip() else None
+        if item is not None:
+            yield item
+        elif not emitted:
+            items = extract_json(text, [])
+            items = items if isinstance(items, list) else [items]
+            yield from [item for item in items if isinstance(item, dict)][:limit]
+    finally:
+        if hasattr(token_stream, 'close'):
+            token_stream.close()
+
+def _parse_json_line(line):
+    line = line.strip().rstrip(',')
+    if not line.startswith('{'):
+        return None
+    try:
+        return json.loads(line)
+    except ValueError:
+        return None
+
+def format_context(updates):
+    """Format updates into the numbered context text the Signal Hunter reads."""
+    context_text = "Here are today's top AI updates:\n\n"
+    for i, update in enumerate(updates, 1):
+        title = update.get('title', update.get('name', 'No title'))
+        context_text += f"{i}. [{update['type'].upper()}] {update['source']}: {title}\n"
+        if update['type'] == 'newsletter' and 'summary' in update:
+            context_text += f"   Summary: {update['summary'][:150]}...\n"
+        elif update['type'] == 'news' and 'points' in update:
+            context_text += f"   Points: {update['points']}\n"
+        elif update['type'] == 'repo' and 'description' in update:
+            context_text += f"   Description: {update['description'][:150]}...\n"
+        context_text += f"   Link: {update['link']}\n\n"
+    return context_text
 
 def main():
     print("🚀 Starting AI Strategy Brief generation...")
@@ -58,17 +260,7 @@ def main():
     print(f"Using top {len(real_updates)} updates for analysis")
     
     # Format updates for analysis
-    context_text = "Here are today's top AI updates:\n\n"
-    for i, update in enumerate(real_updates, 1):
-        title = update.get('title', update.get('name', 'No title'))
-        context_text += f"{i}. [{update['type'].upper()}] {update['source']}: {title}\n"
-        if update['type'] == 'newsletter' and 'summary' in update:
-            context_text += f"   Summary: {update['summary'][:150]}...\n"
-        elif update['type'] == 'news' and 'points' in update:
-            context_text += f"   Points: {update['points']}\n"
-        elif update['type'] == 'repo' and 'description' in update:
-            context_text += f"   Description: {update['description'][:150]}...\n"
-        context_text += f"   Link: {update['link']}\n\n"
+    context_text = format_context(real_updates)
     
     # Create agents
     signal_hunter = SimpleAIAgent(
@@ -89,43 +281,50 @@ def main():
         backstory="You translate AI developments into concrete 15-60 minute actions that provide real value."
     )
     
-    editor = SimpleAIAgent(
-        role="Brief Editor",
-        goal="Compile insights into a clean, well-formatted strategy brief",
-        backstory="You create concise, scannable briefs that highlight what matters most for busy founders."
-    )
-    
-    # Step 1: Signal Hunter - Find top 5 updates
-    print("🔍 Step 1: Signal Hunter analyzing updates...")
+    # Step 1 + 2 overlap: stream the Signal Hunter and score each signal as soon
+    # as it is complete, while the hunter is still generating the next one
+    print("🔍 Step 1: Signal Hunter analyzing updates (streaming)...")
     hunter_prompt = f"""Analyze these AI updates and select the 5 most significant ones.
-For each, provide:
-- Original title and source
-- One-line explanation of why it matters
 
 {context_text}
 
-Focus on breakthrough technologies, industry shifts, and advances in AI agents/RAG/LLMs."""
-    
-    top_signals = signal_hunter.call_llm(hunter_prompt)
-    print("✅ Top signals identified")
+Focus on breakthrough technologies, industry shifts, and advances in AI agents/RAG/LLMs.
+
+Answer in JSON Lines: exactly one JSON object per line, no other text. For each provide
+the update's number from the list above (links are looked up from it), its original
+title and source, and a one-line explanation of why it matters:
+{{"index": 1, "title": "...", "source": "...", "why_matters": "..."}}"""
     
-    # Step 2: Relevance Scorer - Score the updates
-    print("📊 Step 2: Relevance Scorer evaluating...")
-    scorer_prompt = f"""Score these 5 selected updates on relevance (1-10 scale) for a founder focused on:
+    signals = []
+    score_futures = []
+    with ThreadPoolExecutor(max_workers=5) as pool:
+        for signal in stream_json_lines(signal_hunter.stream_llm(hunter_prompt), limit=5):
+            signals.append(signal)
+            print(f"   📌 Signal {len(signals)} ready - scoring started")
+            scorer_prompt = f"""Score this selected update on relevance (1-10 scale) for a founder focused on:
 - AI agents and multi-agent systems
 - RAG implementations  
 - LLM workflows and prompt engineering
 - Fast learning and staying ahead
 
-For each update provide:
-- Relevance score (1-10)
-- 1-2 sentence explanation
-- Tags: [agents] [rag] [llm] [tooling] [research] [business]
+Here is the selected update:
+{json.dumps(signal)}
 
-Here are the selected updates:
-{top_signals}"""
-    
-    relevance_scores = relevance_scorer.call_llm(scorer_prompt)
+Return ONLY a JSON object with the relevance score, a 1-2 sentence explanation and
+tags chosen from agents, rag, llm, tooling, research, business:
+{{"score": 8, "explanation": "...", "tags": ["agents", "llm"]}}"""
+            score_futures.append(pool.submit(relevance_scorer.call_llm, scorer_prompt))
+        if not signals:
+            raise ValueError("Signal Hunter returned no parseable JSON signals")
+        print("✅ Top signals identified")
+        
+        print("📊 Step 2: Relevance Scorer finishing evaluations...")
+        relevance_scores = []
+        for signal, future in zip(signals, score_futures):
+            score = extract_json(future.result(), {})
+            if isinstance(score, dict):
+                score['index'] = signal.get('index')
+                relevance_scores.append(score)
     print("✅ Relevance scoring completed")
     
     # Step 3: Action Generator - Create actionable steps
@@ -138,62 +337,28 @@ Actions should be:
 - Directly related to the highest-scoring updates
 - Focused on learning, experimenting, or implementing
 
-Format each action as:
-- Action title
-- Time estimate  
-- Expected outcome
-- Link to resource
-
-Scored updates:
-{relevance_scores}"""
-    
-    suggested_actions = action_generator.call_llm(action_prompt)
-    print("✅ Actions generated")
-    
-    # Step 4: Editor - Create final brief
-    print("📝 Step 4: Editor compiling final brief...")
-    editor_prompt = f"""Create a final strategy brief in clean Markdown format with these sections:
-
-# AI Strategy Brief
-🗓️ Date: {datetime.now().strftime('%Y-%m-%d')}
-
-## 📌 Top 5 AI Signals
-[List the 5 updates with sources and why they matter]
+Selected updates:
+{json.dumps(signals, indent=2)}
 
-## 🎯 Relevance Summary  
-[Show scores, explanations, and tags in a clean format]
+Scores:
+{json.dumps(relevance_scores, indent=2)}
 
-## 🛠️ Suggested Actions
-[Present the 1-2 actions with all details]
-
-## 📊 Update Sources
-- Total updates analyzed: {len(real_updates)}
-- Newsletters: {len([u for u in real_updates if u['type'] == 'newsletter'])}
-- HN posts: {len([u for u in real_updates if u['type'] == 'news'])}
-- GitHub repos: {len([u for u in real_updates if u['type'] == 'repo'])}
-
-Make it clean, scannable, and actionable.
-
-Content to compile:
-
-TOP SIGNALS:
-{top_signals}
-
-RELEVANCE SCORES:
-{relevance_scores}
-
-SUGGESTED ACTIONS:
-{suggested_actions}"""
+Return ONLY a JSON array; "index" is the update the action is based on:
+[{{"index": 1, "title": "...", "time_estimate": "30 minutes", "expected_outcome": "...", "description": "..."}}]"""
     
-    final_brief = editor.call_llm(editor_prompt)
-    print("✅ Final brief compiled")
+    suggested_actions = action_generator.call_llm(action_prompt, stream=True)
+    print("✅ Actions generated")
     
-    # Save the result
-    with open("strategy_brief.md", "w") as f:
-        f.write(final_brief)
+    # Step 4: Render the final brief locally (no Editor LLM call)
+    print("📝 Step 4: Rendering final brief...")
+    brief = build_brief_data(real_updates, signals, relevance_scores, extract_json(suggested_actions, []))
+    save_brief(brief)
+    print("✅ Final brief rendered")
     
     print(f"\n🎉 Strategy brief saved to strategy_brief.md")
-    print(f"📊 Processed {len(real_updates)} updates through 4-agent pipeline")
+    print(f"📊 Processed {len(real_updates)} updates through 3-agent pipeline")
+    usage_tracker.print_summary()
+    usage_tracker.save()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,31 @@
+import pytest
+
+from collection_queue import MAX_ATTEMPTS, CollectionQueue
+
+SOURCES = [("rss", "Example feed", "https://example.com/feed.xml", 5)]
+ROUND = "2026-10-19"
+
+@pytest.fixture
+def queue(tmp_path):
+    queue = CollectionQueue(str(tmp_path / "queue.db"))
+    queue.enqueue(ROUND, SOURCES)
+    return queue
+
+def test_expired_lease_moves_to_next_owner(queue):
+    [job] = queue.claim(ROUND, "worker-a", lease=0)
+    [taken] = queue.claim(ROUND, "worker-b")
+    assert taken["id"] == job["id"]
+
+    # The first worker's lease ran out: its late result is dropped
+    assert not queue.complete(job["id"], "worker-a", [{"title": "late"}])
+    assert queue.complete(taken["id"], "worker-b", [{"title": "on time", "link": "https://example.com/a"}])
+    assert queue.worker_counts(ROUND) == {"worker-b": 1}
+    assert [update["title"] for update in queue.merge(ROUND)] == ["on time"]
+    assert queue.outstanding(ROUND) == 0
+
+def test_expired_last_attempt_is_not_outstanding(queue):
+    for attempt in range(MAX_ATTEMPTS):
+        assert queue.claim(ROUND, f"worker-{attempt}", lease=0)
+    assert queue.outstanding(ROUND) == 0
+    assert queue.stats(ROUND) == {"failed": 1}
+    assert queue.failures(ROUND)[0]["last_error"] == "lease expired without a result"
@@ -0,0 +1,46 @@
+from fast_brief import analyze_updates, score, summarize
+
+CREW_REPO = {"type": "repo", "title": "crewAI-examples", "source": "GitHub",
+             "description": "Templates. Build a crew of agents that research topics and write reports for you.",
+             "link": "https://github.com/crewAIInc/crewAI-examples"}
+LANGGRAPH_POST = {"type": "ai_blog", "title": "LangGraph patterns", "source": "Blog",
+                  "summary": "How LangGraph handles tool calling across long agent runs in production systems.",
+                  "link": "https://blog.example.com/langgraph"}
+DASHBOARD_POST = {"type": "ai_blog", "title": "Dashboards", "source": "Blog",
+                  "summary": "We show total revenue per region to every tool user, screw air freight.",
+                  "link": "https://example.com/dashboards"}
+
+def test_score_uses_the_best_rubric_level():
+    ranking, rubric_score, label, tags = score(CREW_REPO)
+    assert rubric_score == 10
+    assert label == "CrewAI multi-agent template to customize"
+    assert tags == ["crewai", "agents"]
+
+def test_score_penalizes_updates_without_code():
+    _, rubric_score, _, tags = score(LANGGRAPH_POST)
+    assert rubric_score == 8  # Level 9, minus the no-code penalty
+    assert "langchain" in tags
+
+def test_phrases_match_whole_words_only():
+    ranking, rubric_score, _, tags = score(DASHBOARD_POST)
+    assert rubric_score == 1
+    assert tags == ["tools"]  # "tool user" is a tool, but not "tool use"; "screw air" is not "crew ai"
+    assert ranking == 1.0     # "show total" is not a "how to" tutorial
+
+def test_profile_rubric_without_keywords_falls_back_to_builder_levels():
+    profile = {"agents": {"Relevance Scorer": {"rubric": "10: exactly what I need\n1: irrelevant"}}}
+    assert score(CREW_REPO, profile)[:2] == score(CREW_REPO)[:2]
+
+def test_summarize_picks_the_most_relevant_sentence():
+    update = {"title": "Release notes", "summary": "We moved our offices to a new building downtown. "
+                                                   "The release adds tool calling and agent memory to the SDK."}
+    assert summarize(update) == "The release adds tool calling and agent memory to the SDK."
+
+def test_analyze_updates_builds_a_ranked_brief():
+    updates = [DASHBOARD_POST, LANGGRAPH_POST, CREW_REPO, dict(CREW_REPO, link="https://github.com/mirror/crewAI")]
+    brief = analyze_updates(updates, date="2026-10-19", signals=3, actions=2)
+    assert brief["mode"] == "fast" and brief["date"] == "2026-10-19"
+    assert [signal["title"] for signal in brief["signals"]] == ["crewAI-examples", "LangGraph patterns", "Dashboards"]
+    assert brief["signals"][0]["link"] == CREW_REPO["link"]
+    assert brief["signals"][0]["relevance_score"] == "10"
+    assert [signal["action"] is not None for signal in brief["signals"]] == [True, True, False]
@@ -0,0 +1,11 @@
+from notion_blocks import rich_text
+
+def links(text):
+    return [(item["text"]["content"], (item["text"].get("link") or {}).get("url")) for item in rich_text(text)]
+
+def test_link_with_balanced_parentheses():
+    assert links("See [Rust](https://en.wikipedia.org/wiki/Rust_(programming_language)) today") == [
+        ("See ", None), ("Rust", "https://en.wikipedia.org/wiki/Rust_(programming_language)"), (" today", None)]
+
+def test_parenthesis_after_link_stays_text():
+    assert links("[a](https://example.com/a) (note)") == [("a", "https://example.com/a"), (" (note)", None)]
@@ -0,0 +1,114 @@
+from notion_blocks import compile_lines
+from notion_publisher import _block_signature, _sync_blocks_plan, _upsert_page_plan
+
+BRIEF_LINES = [
+    "# AI Strategy Brief",
+    "## 🔍 **Signal Hunter**",
+    "1. **CrewAI examples** - [View source](https://github.com/crewAIInc/crewAI-examples)",
+    "• Relevance Score: 9",
+    "> Built with `crewai` and **LangGraph**",
+    "⸻",
+    "```python",
+    "print('hello')",
+    "```",
+]
+
+ANNOTATIONS = ("bold", "italic", "strikethrough", "underline", "code")
+
+def api_shaped(blocks):
+    """Blocks as blocks.children.list returns them: ids, API defaults and fully spelled-out rich text."""
+    result = []
+    for i, block in enumerate(blocks):
+        block_type = block["type"]
+        body = dict(block[block_type], color="default")
+        if block_type.startswith("heading_"):
+            body["is_toggleable"] = False
+        if "rich_text" in body:
+            items = []
+            for item in body["rich_text"]:
+                text = item["text"]
+                link = text.get("link")
+                annotations = {name: bool((item.get("annotations") or {}).get(name)) for name in ANNOTATIONS}
+                items.append({"type": "text", "text": {"content": text["content"], "link": link},
+                              "annotations": dict(annotations, color="default"),
+                              "plain_text": text["content"], "href": link["url"] if link else None})
+            body["rich_text"] = items
+        result.append({"object": "block", "id": f"block-{i}", "type": block_type, "has_children": False,
+                       "archived": False, "created_time": "2026-10-19T07:00:00.000Z", block_type: body})
+    return result
+
+def run_plan(plan, children):
+    """Drive a plan against a page holding `children`; returns (result, write requests made)."""
+    writes, response = [], None
+    while True:
+        try:
+            endpoint, kwargs = plan.send(response)
+        except StopIteration as done:
+            return done.value, writes
+        if endpoint == "blocks.children.list":
+            response = {"results": children, "has_more": False}
+        else:
+            writes.append(endpoint)
+            response = {"results": [{"id": f"new-{len(writes)}"}]}
+
+def test_api_blocks_match_compiled_blocks():
+    compiled = compile_lines(BRIEF_LINES)
+    assert [_block_signature(b) for b in api_shaped(compiled)] == [_block_signature(b) for b in compiled]
+
+def test_unchanged_page_needs_no_writes():
+    compiled = compile_lines(BRIEF_LINES)
+    stats, writes = run_plan(_sync_blocks_plan("page", compiled), api_shaped(compiled))
+    assert writes == []
+    assert stats["unchanged"] == len(compiled)
+
+def test_changed_text_updates_only_that_block():
+    compiled = compile_lines(BRIEF_LINES)
+    edited = compile_lines([line.replace("Score: 9", "Score: 10") for line in BRIEF_LINES])
+    stats, writes = run_plan(_sync_blocks_plan("page", edited), api_shaped(compiled))
+    assert writes == ["blocks.update"]
+    assert stats["updated"] == 1
+
+def test_code_language_is_compared():
+    python_block = compile_lines(["```python", "x = 1", "```"])
+    bash_block = compile_lines(["```bash", "x = 1", "```"])
+    assert _block_signature(api_shaped(python_block)[0]) != _block_signature(bash_block[0])
+
+def api_page(properties):
+    """A databases.query result row for a page with these row properties."""
+    name = properties["Name"]["title"][0]["text"]["content"]
+    return {"object": "page", "id": "page-1", "properties": {
+        "Name": {"id": "title", "type": "title",
+                 "title": api_shaped([{"type": "paragraph", "paragraph": {"rich_text": [
+                     {"type": "text", "text": {"content": name}}]}}])[0]["paragraph"]["rich_text"]},
+        "Date": {"id": "date", "type": "date",
+                 "date": {"start": properties["Date"]["date"]["start"], "end": None, "time_zone": None}}}}
+
+def run_upsert(plan, page, children):
+    """Drive an upsert plan against a database holding `page`; returns the requests made."""
+    requests, response = [], None
+    while True:
+        try:
+            endpoint, kwargs = plan.send(response)
+        except StopIteration:
+            return requests
+        requests.append((endpoint, kwargs))
+        response = {"results": [page] if endpoint == "databases.query" else children, "has_more": False}
+
+def properties_for(title):
+    return {"Name": {"title": [{"type": "text", "text": {"content": title}}]},
+            "Date": {"date": {"start": "2026-10-19"}}}
+
+def test_upsert_leaves_matching_properties_alone():
+    compiled = compile_lines(BRIEF_LINES)
+    page = api_page(properties_for("AI Brief – 2026-10-19"))
+    requests = run_upsert(_upsert_page_plan("db", "2026-10-19", properties_for("AI Brief – 2026-10-19"), compiled),
+                          page, api_shaped(compiled))
+    assert [endpoint for endpoint, _ in requests] == ["databases.query", "blocks.children.list"]
+
+def test_upsert_updates_changed_properties():
+    compiled = compile_lines(BRIEF_LINES)
+    page = api_page(properties_for("AI Brief – 2026-10-19"))
+    properties = properties_for("AI Brief – 2026-10-19 (regenerated)")
+    requests = run_upsert(_upsert_page_plan("db", "2026-10-19", properties, compiled), page, api_shaped(compiled))
+    updates = [kwargs for endpoint, kwargs in requests if endpoint == "pages.update"]
+    assert updates == [{"page_id": "page-1", "properties": {"Name": properties["Name"]}}]
@@ -0,0 +1,29 @@
+import os
+import time
+
+from parse_memo import MEMO_TTL, ParseMemo
+
+JOB = ("ai_blog", "Example blog", "https://example.com/feed.xml", 3, b"<rss></rss>")
+
+def _age(path, seconds):
+    then = time.time() - seconds
+    os.utime(path, (then, then))
+
+def test_expired_entry_is_deleted_on_read(tmp_path):
+    memo = ParseMemo(1, str(tmp_path))
+    key = memo.key(JOB)
+    memo.put(key, [{"title": "Agents"}])
+    path = memo._file(key)
+    _age(path, MEMO_TTL + 60)
+    assert ParseMemo(1, str(tmp_path)).get(key) is None
+    assert not os.path.exists(path)
+
+def test_sweep_removes_only_expired_entries(tmp_path):
+    memo = ParseMemo(1, str(tmp_path))
+    old_key, new_key = memo.key(JOB), memo.key(JOB[:4] + (b"<rss>new</rss>",))
+    memo.put(old_key, [{"title": "Old"}])
+    memo.put(new_key, [{"title": "New"}])
+    _age(memo._file(old_key), MEMO_TTL + 60)
+    assert memo.sweep() == 1
+    assert os.path.exists(memo._file(new_key))
+    assert not os.path.exists(memo._file(old_key))
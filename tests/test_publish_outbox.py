@@ -0,0 +1,30 @@
+from publish_outbox import Outbox, drain
+
+def test_reenqueue_while_publishing_waits_for_the_claim(tmp_path):
+    outbox = Outbox(str(tmp_path / "outbox.db"))
+    outbox.enqueue("default:2026-10-19", {"brief": 1})
+    item = outbox.claim()
+    outbox.enqueue("default:2026-10-19", {"brief": 2})
+    assert outbox.claim() is None  # Still held by the first worker
+    outbox.complete(item["id"])
+
+    published = []
+    assert drain(outbox, published.append) == {"published": 1, "retrying": 0, "dead": 0}
+    assert published == [{"brief": 2}]
+    assert outbox.status("default:2026-10-19") == "done"
+
+def test_reenqueue_of_published_item_needs_a_new_payload(tmp_path):
+    outbox = Outbox(str(tmp_path / "outbox.db"))
+    outbox.enqueue("default:2026-10-19", {"brief": 1})
+    drain(outbox, lambda payload: {})
+    outbox.enqueue("default:2026-10-19", {"brief": 1})
+    assert outbox.status("default:2026-10-19") == "done"
+    outbox.enqueue("default:2026-10-19", {"brief": 2})
+    assert outbox.status("default:2026-10-19") == "pending"
+
+def test_failures_count_attempts(tmp_path):
+    outbox = Outbox(str(tmp_path / "outbox.db"))
+    outbox.enqueue("default:2026-10-19", {"brief": 1})
+    item = outbox.claim()
+    assert outbox.fail(item["id"], "Notion is down") == "pending"
+    assert outbox.items()[0]["attempts"] == 1
@@ -0,0 +1,11 @@
+from trends import TrendEngine
+
+def _updates(title, count, day="2026-10-19"):
+    return [{"title": title, "link": f"https://example.com/{title.replace(' ', '-')}/{i}", "date": day}
+            for i in range(count)]
+
+def test_overlapping_phrases_report_one_topic():
+    engine = TrendEngine("2026-10-19")
+    engine.ingest(_updates("agent memory layer", 5) + _updates("vector search", 3))
+    terms = [topic["term"] for topic in engine.rising()]
+    assert terms == ["agent memory", "vector search"]
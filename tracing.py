@@ -0,0 +1,272 @@
+import os
+import json
+import time
+import secrets
+import threading
+import contextvars
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, List, Optional, Tuple
+
+# End-to-end tracing for pipeline runs (brief_cli.py --trace). Code marks its
+# units of work with `with tracing.span("http.fetch", url=url) as s:` and adds
+# results with s.set(status_code=200); spans nest through a context variable,
+# so one run becomes a tree: command -> collect -> source -> http.fetch,
+# analyze -> agent task -> llm.call -> llm.request, publish -> notion.request.
+# Like profiling.stage, a span costs nothing unless a tracer is active.
+#
+# Finished spans are appended to a local file, one JSON object per line: the
+# flat format read by `brief_cli.py trace` for critical-path analysis, or with
+# format="otlp" the OTLP/JSON export format (one ExportTraceServiceRequest per
+# line, as written by the OpenTelemetry collector's file exporter) for loading
+# into Jaeger, Tempo or the collector's otlpjsonfile receiver.
+
+SERVICE_NAME = "ai-strategy-brief"
+
+active: Optional["Tracer"] = None
+_current: ContextVar[Optional["Span"]] = ContextVar("tracing_span", default=None)
+
+class Span:
+    """One timed unit of work with attributes; ids follow the W3C/OTLP sizes."""
+
+    __slots__ = ("trace_id", "span_id", "parent_id", "name", "start_ns", "end_ns", "attributes", "error")
+
+    def __init__(self, name: str, trace_id: str, parent_id: Optional[str], attributes: Dict):
+        self.trace_id = trace_id
+        self.span_id = secrets.token_hex(8)
+        self.parent_id = parent_id
+        self.name = name
+        self.start_ns = time.time_ns()
+        self.end_ns = None
+        self.attributes = {key: value for key, value in attributes.items() if value is not None}
+        self.error = None
+
+    def set(self, **attributes):
+        """Add or overwrite attributes (None values are skipped)."""
+        self.attributes.update({key: value for key, value in attributes.items() if value is not None})
+
+    def to_dict(self) -> Dict:
+        return {
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "name": self.name,
+            "start_ns": self.start_ns,
+            "end_ns": self.end_ns,
+            "duration_ms": round((self.end_ns - self.start_ns) / 1e6, 3),
+            "status": "error" if self.error else "ok",
+            "error": self.error,
+            "thread": threading.current_thread().name,
+            "attributes": self.attributes
+        }
+
+class _NoSpan:
+    """Stands in for a span when tracing is off, so callers can always call .set()."""
+
+    def set(self, **attributes):
+        pass
+
+_NO_SPAN = _NoSpan()
+
+@contextmanager
+def span(name: str, **attributes):
+    """Trace a unit of work as a child of the current span, if tracing is on."""
+    tracer = active
+    if tracer is None:
+        yield _NO_SPAN
+        return
+    parent = _current.get()
+    current = Span(name, parent.trace_id if parent else tracer.trace_id,
+                   parent.span_id if parent else None, attributes)
+    token = _current.set(current)
+    try:
+        yield current
+    except BaseException as e:
+        current.error = f"{type(e).__name__}: {e}"[:500]
+        raise
+    finally:
+        _current.reset(token)
+        current.end_ns = time.time_ns()
+        tracer.export(current)
+
+def set_attributes(**attributes):
+    """Add attributes to the innermost open span."""
+    current = _current.get()
+    if current is not None and active is not None:
+        current.set(**attributes)
+
+def record(name: str, duration: float, error: Optional[str] = None, **attributes):
+    """Export an already finished unit of work (ending now, lasting `duration` seconds) as a child span."""
+    tracer = active
+    if tracer is None:
+        return
+    parent = _current.get()
+    finished = Span(name, parent.trace_id if parent else tracer.trace_id,
+                    parent.span_id if parent else None, attributes)
+    finished.end_ns = time.time_ns()
+    finished.start_ns = finished.end_ns - int(duration * 1e9)
+    finished.error = error
+    tracer.export(finished)
+
+def propagate(fn):
+    """Wrap fn so that, run on another thread, it sees the caller's context variables.
+
+    Its spans nest under the caller's current span and its profiling stages under
+    the caller's stage. Each call runs in its own copy, so pools can call it concurrently.
+    """
+    context = contextvars.copy_context()
+
+    def run(*args, **kwargs):
+        return context.copy().run(fn, *args, **kwargs)
+    return run
+
+def _otlp_value(value) -> Dict:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+def to_otlp(span_dict: Dict) -> Dict:
+    """A flat span record as an OTLP/JSON ExportTraceServiceRequest."""
+    attributes = dict(span_dict["attributes"], **{"thread.name": span_dict["thread"]})
+    otlp_span = {
+        "traceId": span_dict["trace_id"],
+        "spanId": span_dict["span_id"],
+        "name": span_dict["name"],
+        "kind": 1,  # SPAN_KIND_INTERNAL
+        "startTimeUnixNano": str(span_dict["start_ns"]),
+        "endTimeUnixNano": str(span_dict["end_ns"]),
+        "attributes": [{"key": key, "value": _otlp_value(value)} for key, value in attributes.items()],
+        "status": {"code": 2, "message": span_dict["error"]} if span_dict["error"] else {"code": 1}
+    }
+    if span_dict["parent_id"]:
+        otlp_span["parentSpanId"] = span_dict["parent_id"]
+    return {"resourceSpans": [{
+        "resource": {"attributes": [{"key": "service.name", "value": {"stringValue": SERVICE_NAME}}]},
+        "scopeSpans": [{"scope": {"name": "tracing"}, "spans": [otlp_span]}]
+    }]}
+
+def from_otlp(request: Dict) -> List[Dict]:
+    """Flat span records from one OTLP/JSON ExportTraceServiceRequest line."""
+    spans = []
+    for resource_spans in request.get("resourceSpans", []):
+        for scope_spans in resource_spans.get("scopeSpans", []):
+            for otlp_span in scope_spans.get("spans", []):
+                attributes = {item["key"]: next(iter(item["value"].values()), None)
+                              for item in otlp_span.get("attributes", [])}
+                start, end = int(otlp_span["startTimeUnixNano"]), int(otlp_span["endTimeUnixNano"])
+                status = otlp_span.get("status", {})
+                spans.append({
+                    "trace_id": otlp_span["traceId"],
+                    "span_id": otlp_span["spanId"],
+                    "parent_id": otlp_span.get("parentSpanId"),
+                    "name": otlp_span["name"],
+                    "start_ns": start,
+                    "end_ns": end,
+                    "duration_ms": round((end - start) / 1e6, 3),
+                    "status": "error" if status.get("code") == 2 else "ok",
+                    "error": status.get("message"),
+                    "thread": attributes.pop("thread.name", None),
+                    "attributes": attributes
+                })
+    return spans
+
+class Tracer:
+    """Collects the spans of one CLI run (one trace) and appends them to a JSONL file as they finish."""
+
+    def __init__(self, path: str, format: str = "json"):
+        self.path = path
+        self.format = format
+        self.trace_id = secrets.token_hex(16)
+        self.spans = 0
+        self._lock = threading.Lock()
+        self._file = None
+
+    def start(self):
+        global active
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        self._file = open(self.path, "a", encoding="utf-8")
+        active = self
+        return self
+
+    def stop(self):
+        global active
+        active = None
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+    def export(self, finished: Span):
+        record = finished.to_dict()
+        line = json.dumps(to_otlp(record) if self.format == "otlp" else record,
+                          ensure_ascii=False, separators=(",", ":"), default=str)
+        with self._lock:
+            if self._file is None:
+                return  # A straggler thread finishing after the run ended
+            self._file.write(line + "\n")
+            self._file.flush()
+            self.spans += 1
+
+# --- offline analysis ------------------------------------------------------------
+
+def load(path: str) -> List[Dict]:
+    """Every span in a trace file, in either export format."""
+    spans = []
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue  # A torn last line from an interrupted run
+            spans.extend(from_otlp(record) if "resourceSpans" in record else [record])
+    return spans
+
+def critical_path(spans: List[Dict]) -> List[Tuple[int, Dict]]:
+    """The spans that decided a trace's end-to-end latency, as (depth, span) in tree order.
+
+    Within each span on the path, walking back from its end: the child that
+    finished last (the one the parent was waiting on), then the last child to
+    finish before that one started, and so on; children running in parallel
+    with a path child are off the path. Starts at the longest root.
+    """
+    children: Dict[Optional[str], List[Dict]] = {}
+    ids = {s["span_id"] for s in spans}
+    for s in spans:
+        children.setdefault(s["parent_id"] if s["parent_id"] in ids else None, []).append(s)
+
+    def walk(current: Dict, depth: int):
+        yield depth, current
+        chain, cursor = [], current["end_ns"]
+        for child in sorted(children.get(current["span_id"], []), key=lambda s: s["end_ns"], reverse=True):
+            if child["end_ns"] <= cursor:
+                chain.append(child)
+                cursor = child["start_ns"]
+        for child in reversed(chain):
+            yield from walk(child, depth + 1)
+
+    roots = children.get(None, [])
+    if not roots:
+        return []
+    return list(walk(max(roots, key=lambda s: s["end_ns"] - s["start_ns"]), 0))
+
+def summarize(spans: List[Dict]) -> Dict[str, Dict]:
+    """Count, total and slowest duration and errors per span name, slowest total first."""
+    totals = {}
+    for s in spans:
+        t = totals.setdefault(s["name"], {"count": 0, "total_ms": 0.0, "max_ms": 0.0, "errors": 0})
+        t["count"] += 1
+        t["total_ms"] += s["duration_ms"]
+        t["max_ms"] = max(t["max_ms"], s["duration_ms"])
+        t["errors"] += s["status"] == "error"
+    return dict(sorted(totals.items(), key=lambda item: -item[1]["total_ms"]))
+
+def traces(spans: List[Dict]) -> Dict[str, List[Dict]]:
+    """Spans grouped by trace id, in the order the traces were started."""
+    grouped = {}
+    for s in sorted(spans, key=lambda s: s["start_ns"]):
+        grouped.setdefault(s["trace_id"], []).append(s)
+    return grouped
@@ -0,0 +1,201 @@
+import os
+import re
+import json
+import math
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional
+
+from dedupe import canonical_url
+
+# Incremental trending-topics engine. Each run's updates are tokenized into
+# terms (words and two-word phrases from the title and summary) and counted
+# into per-day buckets. Running totals for a recent window and a baseline
+# window are kept alongside the buckets and shifted a day at a time, so adding
+# an item and scoring the rising topics never rescans history: ingest is
+# constant work per item, and a day rolling over moves one bucket between
+# windows. Items are counted once, by canonical URL, however many runs see them.
+
+TRENDS_FILE = os.getenv("BRIEF_TRENDS_FILE", "data/trends.json")
+RECENT_DAYS = 7
+BASELINE_DAYS = 28
+MIN_RECENT = 3    # a topic needs this many recent mentions to be "rising"
+SMOOTHING = 1.0   # added to both windows so brand-new terms don't divide by zero
+
+STOPWORDS = frozenset("""
+a about after all also an and any are as at be been being but by can could did do does for from
+get gets got had has have how i if in into is it its just like make makes more most my new no not
+now of on one only or our out over own say says so some than that the their them then there these
+they this those through to too up us use used using via vs was way we were what when where which
+while who why will with without you your yet year years day days week weeks today show ask hn
+""".split())
+
+_WORD = re.compile(r"[a-z0-9][a-z0-9+#.\-]*[a-z0-9+#]|[a-z0-9]")
+
+def extract_terms(update: Dict) -> set:
+    """Distinct words and adjacent-word phrases in an update's title and summary."""
+    text = " ".join(str(update.get(field) or "") for field in ("title", "name", "summary", "description"))
+    words = [w for w in _WORD.findall(text.lower().replace("/", " ")) if len(w) > 1 and not w.isdigit()]
+    terms = set()
+    previous = None
+    for word in words:
+        if word in STOPWORDS:
+            previous = None
+            continue
+        terms.add(word)
+        if previous:
+            terms.add(f"{previous} {word}")
+        previous = word
+    return terms
+
+def _day(value: str) -> str:
+    return value[:10]
+
+def _shift(date: str, days: int) -> str:
+    return (datetime.strptime(date, "%Y-%m-%d") + timedelta(days=days)).strftime("%Y-%m-%d")
+
+class TrendEngine:
+    """Rolling per-day term counts with incrementally maintained window totals."""
+
+    def __init__(self, as_of: Optional[str] = None):
+        self.as_of = as_of or datetime.now().strftime("%Y-%m-%d")
+        self.buckets: Dict[str, Dict[str, int]] = {}  # day -> term -> items mentioning it
+        self.recent: Dict[str, int] = {}              # totals over the last RECENT_DAYS days
+        self.baseline: Dict[str, int] = {}            # totals over the BASELINE_DAYS before that
+        self.seen_by_day: Dict[str, List[str]] = {}  # day -> item keys, to count each item once
+        self.seen = set()
+
+    # --- windows ----------------------------------------------------------
+
+    def _window(self, day: str) -> Optional[Dict[str, int]]:
+        """Which running total a day's bucket belongs to (None once it has expired)."""
+        if day > self.as_of:
+            return None
+        if day > _shift(self.as_of, -RECENT_DAYS):
+            return self.recent
+        if day > _shift(self.as_of, -(RECENT_DAYS + BASELINE_DAYS)):
+            return self.baseline
+        return None
+
+    @staticmethod
+    def _add(totals: Dict[str, int], bucket: Dict[str, int], sign: int):
+        for term, n in bucket.items():
+            value = totals.get(term, 0) + sign * n
+            if value > 0:
+                totals[term] = value
+            else:
+                totals.pop(term, None)
+
+    def advance(self, as_of: str):
+        """Move the windows forward to `as_of`, touching only the buckets that change window."""
+        while self.as_of < as_of:
+            self.as_of = _shift(self.as_of, 1)
+            leaving_recent = _shift(self.as_of, -RECENT_DAYS)
+            expired = _shift(self.as_of, -(RECENT_DAYS + BASELINE_DAYS))
+            if leaving_recent in self.buckets:
+                self._add(self.recent, self.buckets[leaving_recent], -1)
+                self._add(self.baseline, self.buckets[leaving_recent], +1)
+            if expired in self.buckets:
+                self._add(self.baseline, self.buckets.pop(expired), -1)
+            self.seen.difference_update(self.seen_by_day.pop(expired, []))
+
+    # --- ingest / score -----------------------------------------------------
+
+    def ingest(self, updates: Iterable[Dict]) -> int:
+        """Count new items into their day's bucket; returns how many were new."""
+        added = 0
+        for update in updates:
+            key = canonical_url(update.get("link", "")) or (update.get("title") or update.get("name") or "")
+            if not key or key in self.seen:
+                continue
+            day = _day(update.get("date") or self.as_of)
+            window = self._window(day)
+            if window is None:
+                continue  # Too old to matter, or dated in the future
+            self.seen.add(key)
+            self.seen_by_day.setdefault(day, []).append(key)
+            bucket = self.buckets.setdefault(day, {})
+            for term in extract_terms(update):
+                bucket[term] = bucket.get(term, 0) + 1
+                window[term] = window.get(term, 0) + 1
+            added += 1
+        return added
+
+    def score(self, term: str) -> float:
+        """How much faster a term is being mentioned now than in the baseline window."""
+        recent_rate = self.recent.get(term, 0) / RECENT_DAYS
+        baseline_rate = self.baseline.get(term, 0) / BASELINE_DAYS
+        growth = (recent_rate + SMOOTHING / RECENT_DAYS) / (baseline_rate + SMOOTHING / RECENT_DAYS)
+        return growth * math.log1p(self.recent.get(term, 0))
+
+    def rising(self, limit: int = 10, min_recent: int = MIN_RECENT) -> List[Dict]:
+        """Top rising topics; a term sharing a word with a higher-ranked topic is left out.
+
+        So phrases win over the single words they contain, and of overlapping
+        phrases ("agent memory", "memory layer") only the higher-ranked one is kept.
+        """
+        candidates = [term for term, n in self.recent.items() if n >= min_recent]
+        ranked = sorted(candidates, key=lambda term: (-self.score(term), -term.count(" "), term))
+        topics, taken = [], set()
+        for term in ranked:
+            words = term.split(" ")
+            overlaps = not taken.isdisjoint(words)
+            # An overlapping phrase extends the span of the topic it overlaps ("agent memory layer"),
+            # so its other words aren't reported on their own either
+            taken.update(words)
+            if overlaps:
+                continue
+            baseline_weekly = self.baseline.get(term, 0) * RECENT_DAYS / BASELINE_DAYS
+            topics.append({
+                "term": term,
+                "recent": self.recent[term],
+                "baseline_weekly": round(baseline_weekly, 1),
+                "growth": round((self.recent[term] + SMOOTHING) / (baseline_weekly + SMOOTHING), 1),
+                "score": round(self.score(term), 2)
+            })
+            if len(topics) == limit:
+                break
+        return topics
+
+    # --- persistence --------------------------------------------------------
+
+    def to_dict(self) -> Dict:
+        return {"as_of": self.as_of, "buckets": self.buckets, "seen": self.seen_by_day}
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "TrendEngine":
+        engine = cls(data["as_of"])
+        engine.buckets = data.get("buckets", {})
+        engine.seen_by_day = data.get("seen", {})
+        engine.seen = {key for keys in engine.seen_by_day.values() for key in keys}
+        # Window totals are derived from the buckets once on load
+        for day, bucket in engine.buckets.items():
+            window = engine._window(day)
+            if window is not None:
+                engine._add(window, bucket, +1)
+        return engine
+
+def load_engine(path: Optional[str] = None) -> TrendEngine:
+    """Load the persisted engine, advanced to today."""
+    try:
+        with open(path or TRENDS_FILE, "r", encoding="utf-8") as f:
+            engine = TrendEngine.from_dict(json.load(f))
+    except (OSError, ValueError, KeyError):
+        engine = TrendEngine()
+    engine.advance(datetime.now().strftime("%Y-%m-%d"))
+    return engine
+
+def save_engine(engine: TrendEngine, path: Optional[str] = None):
+    path = path or TRENDS_FILE
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(engine.to_dict(), f, ensure_ascii=False)
+    os.replace(tmp_path, path)
+
+def update_trends(updates: List[Dict], path: Optional[str] = None) -> TrendEngine:
+    """Feed a run's updates into the persisted engine and save it."""
+    engine = load_engine(path)
+    added = engine.ingest(updates)
+    save_engine(engine, path)
+    print(f"📈 Trend engine: {added} new items counted ({len(engine.recent)} terms in the last {RECENT_DAYS} days)")
+    return engine
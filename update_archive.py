@@ -0,0 +1,205 @@
+import os
+import re
+import json
+import sqlite3
+import threading
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional
+
+from dedupe import canonical_url, title_key
+
+# Embedded archive of every collected update. Each run bulk-upserts its
+# normalized updates (one transaction per batch, keyed by canonical URL), and an
+# FTS5 index over title/summary/description plus indexes on date and source
+# answer historical searches like "what did we see about LangGraph last month"
+# in milliseconds over hundreds of thousands of items.
+
+ARCHIVE_DB = os.getenv("BRIEF_ARCHIVE_DB", "data/updates.db")
+BATCH_SIZE = 1000
+
+# Fields stored in their own columns; anything else an update carries goes to `extra`
+COLUMNS = ("link", "title", "summary", "description", "source", "type", "date")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS updates (
+    id INTEGER PRIMARY KEY,
+    canonical_url TEXT NOT NULL UNIQUE,
+    link TEXT,
+    title TEXT NOT NULL DEFAULT '',
+    summary TEXT NOT NULL DEFAULT '',
+    description TEXT NOT NULL DEFAULT '',
+    source TEXT,
+    type TEXT,
+    date TEXT,
+    extra TEXT,
+    first_seen TEXT NOT NULL,
+    last_seen TEXT NOT NULL,
+    seen_count INTEGER NOT NULL DEFAULT 1
+);
+CREATE INDEX IF NOT EXISTS updates_date ON updates (date);
+CREATE INDEX IF NOT EXISTS updates_source_date ON updates (source, date);
+"""
+
+FTS_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS updates_fts USING fts5(
+    title, summary, description, content='updates', content_rowid='id', tokenize='porter unicode61'
+);
+CREATE TRIGGER IF NOT EXISTS updates_ai AFTER INSERT ON updates BEGIN
+    INSERT INTO updates_fts(rowid, title, summary, description)
+    VALUES (new.id, new.title, new.summary, new.description);
+END;
+CREATE TRIGGER IF NOT EXISTS updates_ad AFTER DELETE ON updates BEGIN
+    INSERT INTO updates_fts(updates_fts, rowid, title, summary, description)
+    VALUES ('delete', old.id, old.title, old.summary, old.description);
+END;
+CREATE TRIGGER IF NOT EXISTS updates_au AFTER UPDATE OF title, summary, description ON updates BEGIN
+    INSERT INTO updates_fts(updates_fts, rowid, title, summary, description)
+    VALUES ('delete', old.id, old.title, old.summary, old.description);
+    INSERT INTO updates_fts(rowid, title, summary, description)
+    VALUES (new.id, new.title, new.summary, new.description);
+END;
+"""
+
+UPSERT = """
+INSERT INTO updates (canonical_url, link, title, summary, description, source, type, date, extra,
+                     first_seen, last_seen)
+VALUES (:canonical_url, :link, :title, :summary, :description, :source, :type, :date, :extra,
+        :seen, :seen)
+ON CONFLICT(canonical_url) DO UPDATE SET
+    title = CASE WHEN excluded.title != '' THEN excluded.title ELSE updates.title END,
+    summary = CASE WHEN excluded.summary != '' THEN excluded.summary ELSE updates.summary END,
+    description = CASE WHEN excluded.description != '' THEN excluded.description ELSE updates.description END,
+    date = COALESCE(updates.date, excluded.date),
+    extra = excluded.extra,
+    last_seen = excluded.last_seen,
+    seen_count = updates.seen_count + 1
+"""
+
+def archive_key(update: Dict) -> str:
+    """Canonical URL, or the normalized title for updates without a link."""
+    key = canonical_url(update.get("link", ""))
+    return key or f"title:{update.get('source', '')}:{title_key(update)}"
+
+def normalize(update: Dict, seen: str) -> Dict:
+    row = {column: update.get(column) for column in COLUMNS}
+    row["title"] = update.get("title") or update.get("name") or ""
+    row["summary"] = update.get("summary") or ""
+    row["description"] = update.get("description") or ""
+    extra = {k: v for k, v in update.items() if k not in COLUMNS and k != "name"}
+    if update.get("name"):
+        extra["name"] = update["name"]
+    row["extra"] = json.dumps(extra, ensure_ascii=False) if extra else None
+    row["canonical_url"] = archive_key(update)
+    row["seen"] = seen
+    return row
+
+def fts_query(text: str) -> str:
+    """Turn free text into a safe FTS5 query: every word must match, `word*` matches a prefix."""
+    terms = []
+    for word in re.findall(r'[\w.+#-]+\*?', text):
+        prefix = word.endswith("*")
+        word = word.rstrip("*").replace('"', '""')
+        if word:
+            terms.append(f'"{word}"' + ("*" if prefix else ""))
+    return " ".join(terms)
+
+class UpdateArchive:
+    """SQLite archive of collected updates with full-text search."""
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path or ARCHIVE_DB
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False, isolation_level=None)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+        try:
+            self._conn.executescript(FTS_SCHEMA)
+            self.fts = True
+        except sqlite3.OperationalError:
+            # SQLite built without FTS5: search falls back to LIKE scans
+            self.fts = False
+
+    def close(self):
+        self._conn.close()
+
+    def add_updates(self, updates: Iterable[Dict], batch_size: int = BATCH_SIZE) -> int:
+        """Upsert updates in batches, one transaction per batch; returns how many were written."""
+        seen = datetime.now().isoformat(timespec="seconds")
+        batch, written = [], 0
+        for update in updates:
+            batch.append(normalize(update, seen))
+            if len(batch) >= batch_size:
+                written += self._write(batch)
+                batch = []
+        if batch:
+            written += self._write(batch)
+        return written
+
+    def _write(self, rows: List[Dict]) -> int:
+        with self._lock:
+            self._conn.execute("BEGIN")
+            try:
+                self._conn.executemany(UPSERT, rows)
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("COMMIT")
+        return len(rows)
+
+    def search(self, query: Optional[str] = None, source: Optional[str] = None, since: Optional[str] = None,
+               until: Optional[str] = None, limit: int = 20) -> List[Dict]:
+        """Archived updates matching the text query and filters, best matches (or newest) first.
+
+        since/until are inclusive YYYY-MM-DD bounds on the update date.
+        """
+        where, params = [], []
+        match = fts_query(query) if query else ""
+        if match and self.fts:
+            where.append("u.id IN (SELECT rowid FROM updates_fts WHERE updates_fts MATCH ?)")
+            params.append(match)
+        elif query:
+            for word in query.split():
+                where.append("(u.title LIKE ? OR u.summary LIKE ? OR u.description LIKE ?)")
+                params += [f"%{word}%"] * 3
+        if source:
+            where.append("u.source = ?")
+            params.append(source)
+        if since:
+            where.append("u.date >= ?")
+            params.append(since)
+        if until:
+            where.append("u.date <= ?")
+            params.append(until)
+
+        if match and self.fts:
+            # bm25 ranking needs the FTS row, so join it instead of the IN filter
+            sql = ("SELECT u.* FROM updates_fts JOIN updates u ON u.id = updates_fts.rowid "
+                   "WHERE updates_fts MATCH ?" + "".join(f" AND {w}" for w in where[1:]) +
+                   " ORDER BY bm25(updates_fts, 10.0, 2.0, 1.0), u.date DESC LIMIT ?")
+        else:
+            sql = ("SELECT u.* FROM updates u" + (" WHERE " + " AND ".join(where) if where else "") +
+                   " ORDER BY u.date DESC, u.id DESC LIMIT ?")
+        with self._lock:
+            rows = self._conn.execute(sql, params + [limit]).fetchall()
+        return [self._to_update(row) for row in rows]
+
+    @staticmethod
+    def _to_update(row: sqlite3.Row) -> Dict:
+        update = json.loads(row["extra"]) if row["extra"] else {}
+        update.update({column: row[column] for column in COLUMNS if row[column] not in (None, "")})
+        update["first_seen"] = row["first_seen"]
+        update["seen_count"] = row["seen_count"]
+        return update
+
+    def count(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM updates").fetchone()[0]
+
+    def source_counts(self) -> Dict[str, int]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT source, COUNT(*) AS n FROM updates GROUP BY source ORDER BY n DESC").fetchall()
+        return {row["source"]: row["n"] for row in rows}